@@ -1,11 +1,41 @@
 from .api import CoinglassAPI
+from .archive import HistoryArchive
+from .circuit_breaker import CircuitBreaker
+from .daemon import RefreshDaemon
+from .disk_cache import DiskCache
 from .exceptions import (
+    CircuitOpenError,
     CoinglassAPIError,
     CoinglassParameterWarning,
+    CoinglassQuotaWarning,
     CoinglassRequestError,
+    CoinglassSchemaWarning,
+    CoinglassStaleDataWarning,
+    DeadlineExceededError,
+    NoActiveKeyError,
     NoDataReturnedError,
     RateLimitExceededError,
 )
+from .gaps import find_gaps, repair_gaps
+from .hedging import HedgingPolicy
+from .journal import JournalReplay, JournalWriter
+from .keys import KeyPool
+from .onchain import OnChainIndexes
+from .profiling import Profiler
+from .proxy import CachingProxy
+from .query import query
+from .range_cache import RangeCache
+from .rate_limit import RateLimiter, SharedRateLimiter
+from .rolling import RollingStats
+from .scheduler import (
+    PRIORITY_BACKFILL,
+    PRIORITY_LIVE,
+    PRIORITY_NORMAL,
+    RequestScheduler,
+)
+from .sessions import SessionPool, ThreadLocalSessions
+from .symbol_index import SymbolIndex
+from .timeouts import TimeoutPolicy
 
 __all__ = [
     "CoinglassAPI",
@@ -13,5 +43,37 @@ __all__ = [
     "CoinglassRequestError",
     "RateLimitExceededError",
     "NoDataReturnedError",
-    "CoinglassParameterWarning"
+    "CoinglassParameterWarning",
+    "CircuitOpenError",
+    "CoinglassStaleDataWarning",
+    "NoActiveKeyError",
+    "DeadlineExceededError",
+    "CoinglassSchemaWarning",
+    "CoinglassQuotaWarning",
+    "CircuitBreaker",
+    "DiskCache",
+    "HistoryArchive",
+    "HedgingPolicy",
+    "find_gaps",
+    "repair_gaps",
+    "RefreshDaemon",
+    "JournalReplay",
+    "JournalWriter",
+    "KeyPool",
+    "OnChainIndexes",
+    "Profiler",
+    "CachingProxy",
+    "query",
+    "RangeCache",
+    "RateLimiter",
+    "SharedRateLimiter",
+    "RollingStats",
+    "RequestScheduler",
+    "PRIORITY_LIVE",
+    "PRIORITY_NORMAL",
+    "PRIORITY_BACKFILL",
+    "SessionPool",
+    "ThreadLocalSessions",
+    "SymbolIndex",
+    "TimeoutPolicy"
 ]
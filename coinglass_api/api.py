@@ -1,56 +1,431 @@
-from typing import Optional
-
+import contextvars
+import queue
+import threading
+import time
+import warnings
+from contextlib import nullcontext, suppress
+from typing import Any, Optional
+
+import numpy as np
 import pandas as pd
 import requests
 
+from .cache import ResponseCache, parse_request_key, request_key
+from .circuit_breaker import OPEN, CircuitBreaker
+from .disk_cache import DiskCache
 from .exceptions import (
+    CircuitOpenError,
     CoinglassAPIError,
     CoinglassRequestError,
+    CoinglassStaleDataWarning,
+    NoActiveKeyError,
     NoDataReturnedError,
     RateLimitExceededError,
 )
+from .hedging import HedgingPolicy
+from .journal import JournalReplay, JournalWriter
+from .keys import KeyPool
+from .latency import LatencyTracker
 from .parameters import CoinglassParameterValidation
+from .profiling import Profiler, begin_call, phase, profiled
+from .rate_limit import RateLimiter
+from .scheduler import RequestScheduler
+from .schema import EndpointSchema, SchemaCache, monotonic, time_array, value_columns
+from .sessions import SessionPool, ThreadLocalSessions
+from .timeouts import TimeoutPolicy
 
 
 class CoinglassAPI(CoinglassParameterValidation):
     """ Unofficial Python client for Coinglass API """
 
-    def __init__(self, coinglass_secret: str):
+    def __init__(
+            self,
+            coinglass_secret: str | KeyPool,
+            rate_limiter: RateLimiter | None = None,
+            hedging: HedgingPolicy | None = None,
+            circuit_breaker: CircuitBreaker | None = None,
+            sessions: SessionPool | ThreadLocalSessions | None = None,
+            scheduler: RequestScheduler | None = None,
+            disk_cache: DiskCache | None = None,
+            cache_ttl: float | None = None,
+            snapshot: str | None = None,
+            journal: JournalWriter | JournalReplay | None = None,
+            timeouts: TimeoutPolicy | None = None,
+            base_url: str = "https://open-api.coinglass.com/public/v2/"
+    ):
         """
         Args:
             coinglass_secret: key from Coinglass, get one at
-            https://www.coinglass.com/pricing
+            https://www.coinglass.com/pricing, or a KeyPool of several keys
+            rate_limiter: shared rate budget to pace requests (default: None)
+            hedging: send duplicate requests for slow calls (default: None)
+            circuit_breaker: fail fast and serve stale data while an endpoint
+                is failing (default: None)
+            sessions: session pool or per-thread sessions so a single client can be
+                shared by many threads (default: None, one shared session)
+            scheduler: admit requests by priority under the scheduler's rate
+                budget instead of rate_limiter (default: None)
+            disk_cache: compressed on-disk cache of raw responses, shared
+                between processes (default: None)
+            cache_ttl: serve responses younger than this many seconds from
+                memory (default: None, only used by the circuit breaker)
+            snapshot: file the in-memory cache is loaded from on start and
+                saved to on close, see prefetch() (default: None)
+            journal: record every request and response to a JournalWriter, or
+                serve them from a JournalReplay instead of the API (default: None)
+            timeouts: learn per-endpoint timeouts from observed latency and
+                payload size (default: None, 30 seconds for every request)
+            base_url: API root, e.g. a local MockCoinglassServer url
         """
 
         super().__init__()
 
         self.__coinglass_secret = coinglass_secret
-        self._base_url = "https://open-api.coinglass.com/public/v2/"
+        self._base_url = base_url
         self._session = requests.Session()
+        self._sessions = sessions
+        self._scheduler = scheduler
+        if rate_limiter is None and scheduler is not None:
+            # Hedges are charged against the scheduler's budget
+            rate_limiter = scheduler.rate_limiter
+        self._rate_limiter = rate_limiter
+        self._hedging = hedging
+        # One latency sketch per endpoint feeds hedging and learned timeouts
+        self._latency = LatencyTracker() if timeouts is None else timeouts.latency
+        self._circuit_breaker = circuit_breaker
+        self._response_cache = ResponseCache()
+        self._schemas = SchemaCache()
+        self._disk_cache = disk_cache
+        self._cache_ttl = cache_ttl
+        self._snapshot = snapshot
+        self._journal = journal
+        self._timeouts = timeouts
+        if snapshot is not None:
+            self._response_cache.load(snapshot)
+
+    def profile(
+            self,
+            trace_memory: bool = False,
+            print_summary: bool = False
+    ) -> Profiler:
+        """
+        Profile the API calls made inside a with block, or in a function when
+        used as a decorator
+
+        Args:
+            trace_memory: record peak memory per call with tracemalloc (default: False)
+            print_summary: print a per-endpoint table on exit (default: False)
+
+        Returns:
+            Profiler, see Profiler.summary() for the per-endpoint table
+        """
+        return Profiler(trace_memory=trace_memory, print_summary=print_summary)
+
+    def close(self) -> None:
+        """ Close the HTTP session and the disk cache """
+        if self._snapshot is not None:
+            self._response_cache.save(self._snapshot)
+        if self._sessions is not None:
+            self._sessions.close()
+        if self._disk_cache is not None:
+            self._disk_cache.close()
+        self._session.close()
 
     def _get(self, endpoint: str, params: dict | None = None) -> dict:
+        begin_call(endpoint)
         if params:
             self.validate_params(params)
 
+        if self._journal is None:
+            return self._get_cached(endpoint, params)
+
+        key = request_key(endpoint, params)
+        if self._journal.replaying:
+            return self._journal.response(key)
+        response = self._get_cached(endpoint, params)
+        self._journal.record(key, response)
+        return response
+
+    def _get_cached(self, endpoint: str, params: dict | None = None) -> dict:
+        if self._disk_cache is None and self._cache_ttl is None:
+            return self._get_uncached(endpoint, params)
+
+        key = request_key(endpoint, params)
+        if self._cache_ttl is not None:
+            entry = self._response_cache.get(key, max_age=self._cache_ttl)
+            if entry is not None:
+                return entry[1]
+        if self._disk_cache is not None:
+            cached = self._disk_cache.get(key)
+            if cached is not None:
+                if self._cache_ttl is not None:
+                    self._response_cache.set(key, cached)
+                return cached
+        return self._fetch_and_store(endpoint, params, key)
+
+    def _fetch_and_store(self, endpoint: str, params: dict | None, key: str) -> dict:
+        response = self._get_uncached(endpoint, params)
+        if self._is_fresh(response):
+            if self._disk_cache is not None:
+                self._disk_cache.set(key, response)
+            if self._cache_ttl is not None:
+                self._response_cache.set(key, response)
+        return response
+
+    @staticmethod
+    def _is_fresh(response: dict) -> bool:
+        """ Whether a response holds data straight from the API """
+        return bool(response.get("success") and "data" in response
+                    and not response.get("stale"))
+
+    def prefetch(self, max_requests: int | None = None) -> int:
+        """
+        Refresh expired cached responses, most used first, e.g. right after
+        starting from a snapshot
+
+        Args:
+            max_requests: maximum number of responses to refresh (default: all)
+
+        Returns:
+            number of responses refreshed, failed refreshes are not counted
+        """
+        if self._cache_ttl is None:
+            raise ValueError("prefetch needs a client created with cache_ttl")
+
+        stored = self._response_cache.stored_times()
+        expired = [key for key in self._response_cache.hot_keys()
+                   if time.time() - stored[key] > self._cache_ttl]
+        refreshed = 0
+        for key in expired[:max_requests]:
+            endpoint, params = parse_request_key(key)
+            # Refreshes go through _get like any call, so they are journaled and
+            # profiled. A failed one leaves the old response for the circuit breaker
+            with suppress(requests.RequestException, CoinglassAPIError,
+                          CoinglassRequestError):
+                response = self._get(endpoint, params)
+                refreshed += self._is_fresh(response)
+        return refreshed
+
+    def _get_uncached(self, endpoint: str, params: dict | None = None) -> dict:
+        if self._circuit_breaker is None:
+            return self._send(endpoint, params)
+
+        key = request_key(endpoint, params)
+        if not self._circuit_breaker.allow(endpoint):
+            return self._serve_stale(endpoint, key)
+
+        try:
+            response = self._send(endpoint, params)
+            self._check_for_errors(response)
+        except NoDataReturnedError:
+            # Upstream is healthy, there is just nothing to return
+            self._circuit_breaker.record_success(endpoint)
+            raise
+        except (requests.RequestException, CoinglassAPIError, CoinglassRequestError):
+            self._circuit_breaker.record_failure(endpoint)
+            if (self._circuit_breaker.state(endpoint) == OPEN
+                    and key in self._response_cache):
+                return self._serve_stale(endpoint, key)
+            raise
+        except Exception:
+            # e.g. a malformed error payload, the endpoint is not healthy either
+            self._circuit_breaker.record_failure(endpoint)
+            raise
+        except BaseException:
+            # A half-open probe must not stay claimed, or the circuit never
+            # lets another request through
+            self._circuit_breaker.release(endpoint)
+            raise
+
+        self._circuit_breaker.record_success(endpoint)
+        self._response_cache.set(key, response)
+        return response
+
+    def _serve_stale(self, endpoint: str, key: str) -> dict:
+        """ Return the last good response for a request, marked as stale """
+        entry = self._response_cache.get(key)
+        if entry is None:
+            raise CircuitOpenError(endpoint)
+
+        stored, response = entry
+        warnings.warn(
+            f"Circuit open for '{endpoint}', serving cached response from "
+            f"{time.time() - stored:.0f}s ago",
+            CoinglassStaleDataWarning,
+            stacklevel=4
+        )
+        return {**response, "stale": True}
+
+    def _send(self, endpoint: str, params: dict | None = None) -> dict:
+        if not isinstance(self.__coinglass_secret, KeyPool):
+            return self._send_with_key(self.__coinglass_secret, endpoint, params)
+
+        pool = self.__coinglass_secret
+        for _ in range(len(pool)):
+            secret = pool.acquire()
+            response = self._send_with_key(secret, endpoint, params)
+            if not pool.report(secret, response):
+                break
+        return response
+
+    def _send_with_key(
+            self,
+            secret: str,
+            endpoint: str,
+            params: dict | None = None
+    ) -> dict:
         headers = {
             "accept": "application/json",
-            "coinglassSecret": self.__coinglass_secret
+            "coinglassSecret": secret
         }
         url = self._base_url + endpoint
-        return self._session.request(
-            method='GET',
-            url=url,
-            params=params,
-            headers=headers,
-            timeout=30
-        ).json()
+
+        self._admit()
+        if self._hedging is not None and self._hedging.applies_to(endpoint):
+            return self._hedged_request(endpoint, url, params, headers)
+        return self._request(endpoint, url, params, headers)
+
+    def _admit(self) -> None:
+        """ Wait for the scheduler or rate limiter to let a request through """
+        with phase("rate_limit"):
+            if self._scheduler is not None:
+                self._scheduler.admit()
+            elif self._rate_limiter is not None:
+                self._rate_limiter.acquire()
+
+    def _request(
+            self,
+            endpoint: str,
+            url: str,
+            params: dict | None,
+            headers: dict
+    ) -> dict:
+        start = time.perf_counter()
+        sessions = (nullcontext(self._session) if self._sessions is None
+                    else self._sessions.session())
+        with sessions as session:
+            with phase("network"):
+                http_response = self._send_http(session, endpoint, url, params,
+                                                 headers)
+            with phase("decode"):
+                response = http_response.json()
+        elapsed = time.perf_counter() - start
+        if self._timeouts is None:
+            self._latency.record(endpoint, elapsed)
+        else:
+            self._timeouts.record(endpoint, elapsed, len(http_response.content))
+        return response
+
+    def _send_http(
+            self,
+            session: requests.Session,
+            endpoint: str,
+            url: str,
+            params: dict | None,
+            headers: dict
+    ) -> requests.Response:
+        if self._timeouts is None:
+            return session.request(method='GET', url=url, params=params,
+                                   headers=headers, timeout=30)
+
+        policy = self._timeouts
+        connect, read = policy.timeout(endpoint)
+        for attempt in range(policy.retries + 1):
+            try:
+                return session.request(method='GET', url=url, params=params,
+                                       headers=headers, timeout=(connect, read))
+            except requests.Timeout:
+                policy.record_timeout(endpoint, read)
+                if attempt == policy.retries:
+                    raise
+                # Retries are admitted like any request, in the caller's priority
+                # class, and charged to the budget of the key they are sent with
+                self._admit()
+                if isinstance(self.__coinglass_secret, KeyPool):
+                    self.__coinglass_secret.charge(headers["coinglassSecret"])
+                connect = min(policy.max_timeout, connect * 2)
+                read = min(policy.max_timeout, read * 2)
+
+    def _hedged_request(
+            self,
+            endpoint: str,
+            url: str,
+            params: dict | None,
+            headers: dict
+    ) -> dict:
+        """
+        Race duplicate requests once the primary request passes the hedge delay,
+        the first successful response wins and the others are abandoned
+        """
+        policy = self._hedging
+        delay = policy.delay(
+            self._latency.percentile(endpoint, policy.percentile),
+            self._latency.count(endpoint)
+        )
+        results: queue.SimpleQueue[tuple[bool, Any]] = queue.SimpleQueue()
+
+        def attempt(attempt_headers: dict) -> None:
+            try:
+                results.put((True, self._request(endpoint, url, params,
+                                                 attempt_headers)))
+            except BaseException as e:
+                results.put((False, e))
+
+        def start(attempt_headers: dict) -> None:
+            # Every attempt gets its own thread, so concurrent callers never queue
+            # behind each other and a stalled attempt only holds its own thread.
+            # The attempts carry the caller's profiler context along
+            threading.Thread(target=contextvars.copy_context().run,
+                             args=(attempt, attempt_headers),
+                             name="coinglass-hedge", daemon=True).start()
+
+        start(headers)
+        running, hedges = 1, 0
+        error: BaseException | None = None
+        while running:
+            can_hedge = hedges < policy.max_hedges
+            try:
+                ok, value = results.get(timeout=delay if can_hedge else None)
+            except queue.Empty:
+                hedge_headers = self._hedge_headers(headers)
+                if hedge_headers is None:
+                    hedges = policy.max_hedges
+                else:
+                    hedges += 1
+                    running += 1
+                    start(hedge_headers)
+                continue
+
+            running -= 1
+            if ok:
+                return value
+            error = error or value
+
+        raise error
+
+    def _hedge_headers(self, headers: dict) -> dict | None:
+        """
+        Headers of a hedge, charged to the rate budget and to a key of the key
+        pool, None if either has no budget left right now
+        """
+        if self._rate_limiter is not None and not self._rate_limiter.try_acquire():
+            return None
+        if not isinstance(self.__coinglass_secret, KeyPool):
+            return headers
+        try:
+            secret = self.__coinglass_secret.acquire(timeout=0)
+        except (TimeoutError, NoActiveKeyError):
+            return None
+        return {**headers, "coinglassSecret": secret}
 
     @staticmethod
+    @profiled("build")
     def _create_dataframe(
             data: list[dict],
             time_col: str | None = None,
             unit: str | None = "ms",
-            cast_objects_to_numeric: bool = False
+            cast_objects_to_numeric: bool = False,
+            schema: EndpointSchema | None = None
     ) -> pd.DataFrame:
         """
         Create pandas DataFrame from a list of dicts
@@ -60,33 +435,62 @@ class CoinglassAPI(CoinglassParameterValidation):
             time_col: name of time column in dict
             unit: unit of time column, specify None to use auto-resolver (default: ms)
             cast_objects_to_numeric: cast all object columns to numeric (default: False)
+            schema: learned schema of the endpoint, builds the frame from typed
+                columns once learned (default: None)
 
         Returns:
             pandas DataFrame
         """
-        df = pd.DataFrame(data)
+        if schema is not None and isinstance(data, list):
+            df = schema.build(data, time_col, unit)
+            if df is not None:
+                return df
+
+        if not time_col:
+            df = pd.DataFrame(data)
+        else:
+            # Select the value columns and parse the index straight from the
+            # response, so the frame is built once instead of being copied by
+            # rename, drop and set_index
+            if isinstance(data, dict):
+                columns = list(data)
+                times = data[time_col]
+            else:
+                columns = list(dict.fromkeys(key for row in data for key in row))
+                times = [row.get(time_col) for row in data]
 
-        if time_col:
-            if time_col == "time":
-                # Handle edge case of time column being named "time"
-                df.rename(columns={"time": "t"}, inplace=True)
-                time_col = "t"
+            times = time_array(times)
+            if schema is not None:
+                index = schema.parse_times(times, unit)
+            else:
+                index = pd.to_datetime(times, unit=unit)
+            del times
 
-            df["time"] = pd.to_datetime(df[time_col], unit=unit)
-            df.drop(columns=[time_col], inplace=True)
-            df.set_index("time", inplace=True, drop=True)
+            if isinstance(data, dict):
+                df = pd.DataFrame(data, columns=value_columns(columns, time_col))
+            else:
+                # pd.Series infers the same dtype as pd.DataFrame does for a
+                # column of records, without the intermediate object matrix
+                df = pd.DataFrame({col: pd.Series([row.get(col) for row in data])
+                                   for col in value_columns(columns, time_col)},
+                                  copy=False)
+            df.index = pd.DatetimeIndex(index, name="time")
 
-            if "t" in df.columns:
-                # Drop additional "t" column if it exists
-                df.drop(columns=["t"], inplace=True)
+            # Only the unit=None index endpoints are reordered, see schema.build
+            if schema is not None and unit is None:
+                df = monotonic(df)
 
         if cast_objects_to_numeric:
-            cols = df.columns[df.dtypes.eq('object')]
-            df[cols] = df[cols].apply(pd.to_numeric)
+            for col in df.columns[df.dtypes.eq('object')]:
+                df[col] = pd.to_numeric(df[col])
+
+        if schema is not None and isinstance(data, list):
+            schema.learn(data, df, time_col)
 
         return df
 
     @staticmethod
+    @profiled("build")
     def _create_multiindex_dataframe(
             data: list[dict],
             list_key: str
@@ -132,6 +536,38 @@ class CoinglassAPI(CoinglassParameterValidation):
         return pd.concat(flattened_data, axis=1)
 
     @staticmethod
+    @profiled("build")
+    def _create_date_list_dataframe(flattened_dict: dict) -> pd.DataFrame:
+        """
+        Create pandas DataFrame indexed by the dateList of a flattened response
+
+        Args:
+            flattened_dict: (outer key, inner key) -> list, including
+                ("dateList", 0) with the times in milliseconds
+
+        Returns:
+            pandas DataFrame
+        """
+        columns = dict(flattened_dict)
+        times = columns.pop(("dateList", 0))
+        index = pd.DatetimeIndex(pd.to_datetime(np.asarray(times), unit="ms"),
+                                 name="time")
+
+        # All-float responses are written column by column into one block, which
+        # the frame then wraps, instead of pandas consolidating separate arrays
+        block = np.empty((len(columns), len(index)))
+        for i, values in enumerate(columns.values()):
+            if not isinstance(values, list) or len(values) != len(index):
+                return pd.DataFrame(columns, index=index)
+            array = np.asarray(values)
+            if array.dtype.kind != "f" or array.ndim != 1:
+                return pd.DataFrame(columns, index=index)
+            block[i] = array
+        return pd.DataFrame(block.T, index=index, columns=pd.Index(list(columns)),
+                            copy=False)
+
+    @staticmethod
+    @profiled("build")
     def _flatten_dictionary(data: dict) -> dict:
         flattened_dict = {}
 
@@ -178,7 +614,7 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"][symbol]
-        return self._create_dataframe(data)
+        return self._create_dataframe(data, schema=self._schemas["perpetual_market"])
 
     def futures_market(self, symbol: str) -> pd.DataFrame:
         response = self._get(
@@ -187,7 +623,7 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"][symbol]
-        return self._create_dataframe(data)
+        return self._create_dataframe(data, schema=self._schemas["futures_market"])
 
     def funding_rate(self) -> pd.DataFrame:
         response = self._get(
@@ -242,7 +678,7 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        return self._create_dataframe(data)
+        return self._create_dataframe(data, schema=self._schemas["open_interest"])
 
     def open_interest_history(
             self,
@@ -280,11 +716,7 @@ class CoinglassAPI(CoinglassParameterValidation):
             else:
                 flattened_dict[(k, 0)] = v
 
-        df = pd.DataFrame(flattened_dict)
-        df["time"] = pd.to_datetime(df["dateList"][0], unit="ms")
-        df.drop(columns=["dateList"], inplace=True)
-        df.set_index("time", inplace=True, drop=True)
-        return df
+        return self._create_date_list_dataframe(flattened_dict)
 
     def option(self, symbol: str) -> pd.DataFrame:
         response = self._get(
@@ -293,7 +725,7 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        return self._create_dataframe(data)
+        return self._create_dataframe(data, schema=self._schemas["option"])
 
     def option_history(self, symbol: str, currency: str) -> pd.DataFrame:
         """
@@ -312,11 +744,7 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        df = pd.DataFrame(self._flatten_dictionary(data[0]))
-        df["time"] = pd.to_datetime(df["dateList"][0], unit="ms")
-        df.drop(columns=["dateList"], inplace=True, level=0)
-        df.set_index("time", inplace=True, drop=True)
-        return df
+        return self._create_date_list_dataframe(self._flatten_dictionary(data[0]))
 
     def option_vol_history(self, symbol: str, currency: str) -> pd.DataFrame:
         response = self._get(
@@ -325,11 +753,7 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        df = pd.DataFrame(self._flatten_dictionary(data))
-        df["time"] = pd.to_datetime(df["dateList"][0], unit="ms")
-        df.drop(columns=["dateList"], inplace=True, level=0)
-        df.set_index("time", inplace=True, drop=True)
-        return df
+        return self._create_date_list_dataframe(self._flatten_dictionary(data))
 
     def top_liquidations(self, time_type: str) -> pd.DataFrame:
         """
@@ -347,7 +771,7 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        return self._create_dataframe(data)
+        return self._create_dataframe(data, schema=self._schemas["liquidation_top"])
 
     def liquidation_map(self, symbol: str, interval: str) -> dict:
         response = self._get(
@@ -391,7 +815,7 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        return self._create_dataframe(data)
+        return self._create_dataframe(data, schema=self._schemas["liquidation_ex"])
 
     def liquidations_history(self, symbol: str, time_type: str) -> pd.DataFrame:
         response = self._get(
@@ -420,7 +844,11 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        return self._create_dataframe(data, time_col="dateList")
+        return self._create_dataframe(
+            data,
+            time_col="dateList",
+            schema=self._schemas["long_short_history"]
+        )
 
     def futures_coins_markets(self) -> pd.DataFrame:
         response = self._get(
@@ -429,7 +857,10 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        return self._create_dataframe(data)
+        return self._create_dataframe(
+            data,
+            schema=self._schemas["futures_coins_markets"]
+        )
 
     def futures_coins_price_change(self) -> pd.DataFrame:
         response = self._get(
@@ -438,7 +869,10 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        return self._create_dataframe(data)
+        return self._create_dataframe(
+            data,
+            schema=self._schemas["futures_coins_price_change"]
+        )
 
     def futures_basis_chart(self, symbol: str) -> pd.DataFrame:
         response = self._get(
@@ -493,11 +927,7 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        df = pd.DataFrame(self._flatten_dictionary(data))
-        df["time"] = pd.to_datetime(df["dateList"][0], unit="ms")
-        df.drop(columns=["dateList"], inplace=True, level=0)
-        df.set_index("time", inplace=True, drop=True)
-        return df
+        return self._create_date_list_dataframe(self._flatten_dictionary(data))
 
     def funding(
             self,
@@ -529,7 +959,11 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        return self._create_dataframe(data, time_col="createTime")
+        return self._create_dataframe(
+            data,
+            time_col="createTime",
+            schema=self._schemas["indicator/funding"]
+        )
 
     def funding_ohlc(
             self,
@@ -561,7 +995,11 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        return self._create_dataframe(data, time_col="t")
+        return self._create_dataframe(
+            data,
+            time_col="t",
+            schema=self._schemas["indicator/funding_ohlc"]
+        )
 
     def funding_average(
             self,
@@ -591,7 +1029,11 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        return self._create_dataframe(data, time_col="createTime")
+        return self._create_dataframe(
+            data,
+            time_col="createTime",
+            schema=self._schemas["indicator/funding_avg"]
+        )
 
     def open_interest_ohlc(
             self,
@@ -623,7 +1065,11 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        return self._create_dataframe(data, time_col="t")
+        return self._create_dataframe(
+            data,
+            time_col="t",
+            schema=self._schemas["indicator/open_interest_ohlc"]
+        )
 
     def open_interest_aggregated_ohlc(
             self,
@@ -653,7 +1099,11 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        return self._create_dataframe(data, time_col="t")
+        return self._create_dataframe(
+            data,
+            time_col="t",
+            schema=self._schemas["indicator/open_interest_aggregated_ohlc"]
+        )
 
     def liquidation_symbol(
             self,
@@ -683,7 +1133,11 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        return self._create_dataframe(data, time_col="createTime")
+        return self._create_dataframe(
+            data,
+            time_col="createTime",
+            schema=self._schemas["indicator/liquidation_symbol"]
+        )
 
     def liquidation_pair(
             self,
@@ -715,7 +1169,11 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        return self._create_dataframe(data, time_col="t")
+        return self._create_dataframe(
+            data,
+            time_col="t",
+            schema=self._schemas["indicator/liquidation_pair"]
+        )
 
     def long_short_accounts(
             self,
@@ -747,7 +1205,11 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        return self._create_dataframe(data, time_col="createTime")
+        return self._create_dataframe(
+            data,
+            time_col="createTime",
+            schema=self._schemas["indicator/long_short_accounts"]
+        )
 
     def long_short_symbol(
             self,
@@ -777,7 +1239,11 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        return self._create_dataframe(data, time_col="t")
+        return self._create_dataframe(
+            data,
+            time_col="t",
+            schema=self._schemas["indicator/long_short_symbol"]
+        )
 
     def top_long_short_account_ratio(
             self,
@@ -809,7 +1275,11 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        return self._create_dataframe(data, time_col="createTime")
+        return self._create_dataframe(
+            data,
+            time_col="createTime",
+            schema=self._schemas["indicator/top_long_short_account_ratio"]
+        )
 
     def top_long_short_position_ratio(
             self,
@@ -841,7 +1311,11 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        return self._create_dataframe(data, time_col="createTime")
+        return self._create_dataframe(
+            data,
+            time_col="createTime",
+            schema=self._schemas["indicator/top_long_short_position_ratio"]
+        )
 
     def bitcoin_bubble_index(self) -> pd.DataFrame:
         response = self._get(
@@ -849,7 +1323,12 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        return self._create_dataframe(data, time_col="time", unit=None)
+        return self._create_dataframe(
+            data,
+            time_col="time",
+            unit=None,
+            schema=self._schemas["index/bitcoin_bubble_index"]
+        )
 
     def ahr999(self) -> pd.DataFrame:
         response = self._get(
@@ -857,7 +1336,12 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        return self._create_dataframe(data, time_col="date", unit=None)
+        return self._create_dataframe(
+            data,
+            time_col="date",
+            unit=None,
+            schema=self._schemas["index/ahr999"]
+        )
 
     def tow_year_ma_multiplier(self) -> pd.DataFrame:
         response = self._get(
@@ -865,7 +1349,11 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        return self._create_dataframe(data, time_col="createTime")
+        return self._create_dataframe(
+            data,
+            time_col="createTime",
+            schema=self._schemas["index/tow_year_MA_multiplier"]
+        )
 
     def tow_hundred_week_moving_avg_heatmap(self) -> pd.DataFrame:
         response = self._get(
@@ -873,7 +1361,11 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        return self._create_dataframe(data, time_col="createTime")
+        return self._create_dataframe(
+            data,
+            time_col="createTime",
+            schema=self._schemas["index/tow_hundred_week_moving_avg_heatmap"]
+        )
 
     def puell_multiple(self) -> pd.DataFrame:
         response = self._get(
@@ -881,7 +1373,11 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        return self._create_dataframe(data, time_col="createTime")
+        return self._create_dataframe(
+            data,
+            time_col="createTime",
+            schema=self._schemas["index/puell_multiple"]
+        )
 
     def stock_flow(self) -> pd.DataFrame:
         response = self._get(
@@ -889,7 +1385,12 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        return self._create_dataframe(data, time_col="createTime", unit=None)
+        return self._create_dataframe(
+            data,
+            time_col="createTime",
+            unit=None,
+            schema=self._schemas["index/stock_flow"]
+        )
 
     def pi(self) -> pd.DataFrame:
         response = self._get(
@@ -898,7 +1399,8 @@ class CoinglassAPI(CoinglassParameterValidation):
         self._check_for_errors(response)
         data = response["data"]
         return self._create_dataframe(data, time_col="createTime",
-                                      cast_objects_to_numeric=True)
+                                      cast_objects_to_numeric=True,
+                                      schema=self._schemas["index/pi"])
 
     def golden_ratio_multiplier(self) -> pd.DataFrame:
         response = self._get(
@@ -906,8 +1408,12 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        return self._create_dataframe(data, time_col="createTime",
-                                      cast_objects_to_numeric=True)
+        return self._create_dataframe(
+            data,
+            time_col="createTime",
+            cast_objects_to_numeric=True,
+            schema=self._schemas["index/golden_ratio_multiplier"]
+        )
 
     def bitcoin_profitable_days(self) -> pd.DataFrame:
         response = self._get(
@@ -915,7 +1421,11 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        return self._create_dataframe(data, time_col="createTime")
+        return self._create_dataframe(
+            data,
+            time_col="createTime",
+            schema=self._schemas["index/bitcoin_profitable_days"]
+        )
 
     def log_log_regression(self) -> pd.DataFrame:
         response = self._get(
@@ -923,7 +1433,10 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        return self._create_dataframe(data)
+        return self._create_dataframe(
+            data,
+            schema=self._schemas["index/log_log_regression"]
+        )
 
     def grayscale_market_history(self) -> pd.DataFrame:
         response = self._get(
@@ -931,4 +1444,8 @@ class CoinglassAPI(CoinglassParameterValidation):
         )
         self._check_for_errors(response)
         data = response["data"]
-        return self._create_dataframe(data, time_col="dateList")
+        return self._create_dataframe(
+            data,
+            time_col="dateList",
+            schema=self._schemas["index/grayscale_market_history"]
+        )
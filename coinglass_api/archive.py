@@ -0,0 +1,207 @@
+import json
+import os
+from collections.abc import Iterator, Sequence
+
+import numpy as np
+import pandas as pd
+
+SeriesKey = tuple[str, str | None, str, str]
+
+
+def _escape(part: str | None) -> str:
+    """ Directory name of a key part, a lone "%" is reserved for None """
+    if part is None:
+        return "%"
+    if part in ("", ".", "..") or any(c in part for c in "/\\\0"):
+        raise ValueError(f"'{part}' can not be used in an archive series key")
+    return part.replace("%", "%25")
+
+
+class HistoryArchive:
+    """
+    Append-only columnar archive of time series, read zero-copy through
+    numpy.memmap with a sorted int64 time index
+
+    Series are addressed by (endpoint, ex, pair, interval), the arguments of
+    the client method that produced them, e.g.
+    ("funding_ohlc", "Binance", "BTCUSDT", "m1"). Use ex=None and the symbol as
+    pair for symbol based endpoints such as liquidation_symbol. Key parts may
+    not contain path separators or be "." or "..".
+    """
+
+    def __init__(self, root: str):
+        """
+        Args:
+            root: directory of the archive, created if missing
+        """
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key: SeriesKey) -> str:
+        endpoint, ex, pair, interval = key
+        return os.path.join(self.root, _escape(endpoint), _escape(ex), _escape(pair),
+                            _escape(interval))
+
+    @staticmethod
+    def _read_meta(path: str) -> dict | None:
+        try:
+            with open(os.path.join(path, "meta.json")) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _write_meta(path: str, meta: dict) -> None:
+        tmp = os.path.join(path, "meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(path, "meta.json"))
+
+    def series(self) -> Iterator[SeriesKey]:
+        """ Keys of all series in the archive """
+        for dirpath, _, filenames in os.walk(self.root):
+            if "meta.json" in filenames:
+                meta = self._read_meta(dirpath)
+                yield tuple(meta["key"])
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.series())
+
+    def rows(self, key: SeriesKey) -> int:
+        meta = self._read_meta(self._path(key))
+        return 0 if meta is None else meta["rows"]
+
+    def append(self, key: SeriesKey, df: pd.DataFrame) -> int:
+        """
+        Append the rows of a frame newer than the last archived row
+
+        Args:
+            key: (endpoint, ex, pair, interval)
+            df: frame with a DatetimeIndex, only numeric columns are archived
+
+        Returns:
+            number of rows appended
+        """
+        if not isinstance(df.index, pd.DatetimeIndex):
+            raise TypeError("Only frames with a DatetimeIndex can be archived")
+
+        path = self._path(key)
+        os.makedirs(path, exist_ok=True)
+        meta = self._read_meta(path)
+        if meta is None:
+            numeric = df.select_dtypes(include=["number", "bool"])
+            meta = {"key": list(key), "rows": 0,
+                    "columns": [[str(col), str(dtype)]
+                                for col, dtype in numeric.dtypes.items()]}
+
+        times = df.index.as_unit("ns").asi8
+        order = None
+        if len(times) > 1 and not np.all(times[1:] > times[:-1]):
+            order = np.argsort(times, kind="stable")
+            times = times[order]
+            keep = np.concatenate([times[1:] != times[:-1], [True]])
+            order, times = order[keep], times[keep]
+
+        if meta["rows"]:
+            last = self._times(path, meta)[-1]
+            new = times > last
+            times = times[new]
+            order = np.flatnonzero(new) if order is None else order[new]
+        if not len(times):
+            return 0
+
+        rows = meta["rows"]
+        for i, (col, dtype) in enumerate([["time", "int64"], *meta["columns"]]):
+            if col == "time" and i == 0:
+                data = times
+            else:
+                if col not in df.columns:
+                    raise ValueError(f"Column '{col}' missing from frame for {key}")
+                data = df[col].to_numpy(dtype=dtype)
+                if order is not None:
+                    data = data[order]
+            filename = os.path.join(path, f"{i}.bin")
+            # Drop bytes of an interrupted append before writing
+            with open(filename, "ab") as f:
+                f.truncate(rows * np.dtype(dtype).itemsize)
+                f.write(np.ascontiguousarray(data, dtype=dtype).tobytes())
+
+        meta["rows"] = rows + len(times)
+        self._write_meta(path, meta)
+        return len(times)
+
+    @staticmethod
+    def _times(path: str, meta: dict) -> np.ndarray:
+        return np.memmap(os.path.join(path, "0.bin"), dtype="int64", mode="r",
+                         shape=(meta["rows"],))
+
+    def _bounds(self, path: str, meta: dict, start, end) -> tuple[np.ndarray, int, int]:
+        times = self._times(path, meta)
+        lo = 0 if start is None else int(np.searchsorted(
+            times, pd.Timestamp(start).as_unit("ns").value, side="left"))
+        hi = len(times) if end is None else int(np.searchsorted(
+            times, pd.Timestamp(end).as_unit("ns").value, side="right"))
+        return times, lo, hi
+
+    def read_arrays(
+            self,
+            key: SeriesKey,
+            start: pd.Timestamp | str | None = None,
+            end: pd.Timestamp | str | None = None,
+            columns: Sequence[str] | None = None
+    ) -> dict[str, np.ndarray]:
+        """
+        Zero-copy views of a time range
+
+        Args:
+            key: (endpoint, ex, pair, interval)
+            start: first time to include (default: beginning of the series)
+            end: last time to include (default: end of the series)
+            columns: columns to read (default: all)
+
+        Returns:
+            dict of memory-mapped arrays, time is datetime64[ns]
+        """
+        path = self._path(key)
+        meta = self._read_meta(path)
+        if meta is None:
+            raise KeyError(key)
+
+        names = [col for col, _ in meta["columns"]]
+        wanted = names if columns is None else list(columns)
+        if meta["rows"] == 0:
+            return {"time": np.empty(0, "datetime64[ns]"),
+                    **{col: np.empty(0) for col in wanted}}
+
+        times, lo, hi = self._bounds(path, meta, start, end)
+        arrays = {"time": times[lo:hi].view("datetime64[ns]")}
+        for col in wanted:
+            i = names.index(col)
+            arrays[col] = np.memmap(
+                os.path.join(path, f"{i + 1}.bin"), dtype=meta["columns"][i][1],
+                mode="r", shape=(meta["rows"],)
+            )[lo:hi]
+        return arrays
+
+    def read(
+            self,
+            key: SeriesKey,
+            start: pd.Timestamp | str | None = None,
+            end: pd.Timestamp | str | None = None,
+            columns: Sequence[str] | None = None
+    ) -> pd.DataFrame:
+        """
+        Read a time range as a DataFrame backed by the memory-mapped columns
+
+        Args:
+            key: (endpoint, ex, pair, interval)
+            start: first time to include (default: beginning of the series)
+            end: last time to include (default: end of the series)
+            columns: columns to read (default: all)
+
+        Returns:
+            pandas DataFrame with a DatetimeIndex
+        """
+        arrays = self.read_arrays(key, start, end, columns)
+        index = pd.DatetimeIndex(arrays.pop("time"), name="time")
+        return pd.DataFrame(arrays, index=index, copy=False)
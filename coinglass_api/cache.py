@@ -0,0 +1,193 @@
+import json
+import mmap
+import os
+import pickle
+import struct
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlencode
+
+_SNAPSHOT_MAGIC = b"CGSNAP01"
+# stored time, hits, key length, body length
+_ENTRY = struct.Struct("<dIII")
+
+
+def request_key(endpoint: str, params: dict | None = None) -> str:
+    """ Canonical cache key for an endpoint and its parameters """
+    if not params:
+        return endpoint
+    items = sorted((k, v) for k, v in params.items() if v is not None)
+    return f"{endpoint}?{urlencode(items)}"
+
+
+def parse_request_key(key: str) -> tuple[str, dict | None]:
+    """ Endpoint and parameters of a request key, parameter values are strings """
+    endpoint, _, query = key.partition("?")
+    return endpoint, dict(parse_qsl(query)) or None
+
+
+def _copy(response: dict) -> dict:
+    """ Deep copy of a decoded JSON response, faster than copy.deepcopy """
+    return pickle.loads(pickle.dumps(response, pickle.HIGHEST_PROTOCOL))
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU store of the last good response per request, responses are
+    copied in and out so callers may modify what they get
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        Args:
+            maxsize: maximum number of responses kept (default: 1024)
+        """
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, tuple[float, dict | None]] = OrderedDict()
+        self._hits: dict[str, int] = {}
+        # Entries loaded from a snapshot stay encoded in the memory-mapped file
+        # until first used, as (map, body offset, body length)
+        self._pending: dict[str, tuple[mmap.mmap, int, int]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str, max_age: float | None = None) -> tuple[float, dict] | None:
+        """
+        Look up a response
+
+        Args:
+            key: request key
+            max_age: only return responses younger than this many seconds
+
+        Returns:
+            tuple of (unix time stored, response) or None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if max_age is not None and time.time() - entry[0] > max_age:
+                return None
+            self._entries.move_to_end(key)
+            self._hits[key] = self._hits.get(key, 0) + 1
+            stored, response = entry
+            if response is None:
+                response = self._decode(key)
+                self._entries[key] = (stored, response)
+            return stored, _copy(response)
+
+    def set(self, key: str, response: dict, stored: float | None = None) -> None:
+        response = _copy(response)
+        with self._lock:
+            self._entries[key] = (time.time() if stored is None else stored, response)
+            self._entries.move_to_end(key)
+            self._pending.pop(key, None)
+            self._evict()
+
+    def stored_times(self) -> dict[str, float]:
+        """ Unix time each response was stored, without decoding any """
+        with self._lock:
+            return {key: stored for key, (stored, _) in self._entries.items()}
+
+    def items(self) -> list[tuple[str, tuple[float, dict]]]:
+        with self._lock:
+            for key in list(self._pending):
+                self._entries[key] = (self._entries[key][0], self._decode(key))
+            return [(key, (stored, _copy(response)))
+                    for key, (stored, response) in self._entries.items()]
+
+    def hot_keys(self) -> list[str]:
+        """ Keys ordered by number of hits, most recently used first on ties """
+        with self._lock:
+            recent = list(reversed(self._entries))
+            return sorted(recent, key=lambda key: -self._hits.get(key, 0))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits.clear()
+            self._pending.clear()
+
+    def _decode(self, key: str) -> dict:
+        """ Decode a response still encoded in a snapshot, call with the lock held """
+        snapshot, offset, length = self._pending.pop(key)
+        return json.loads(snapshot[offset:offset + length])
+
+    def _evict(self) -> None:
+        """ Drop least recently used responses over maxsize, call with the lock held """
+        while len(self._entries) > self.maxsize:
+            evicted, _ = self._entries.popitem(last=False)
+            self._hits.pop(evicted, None)
+            self._pending.pop(evicted, None)
+
+    def save(self, path: str) -> int:
+        """
+        Write all responses and their hit counts to a binary snapshot file
+
+        Returns:
+            number of responses written
+        """
+        with self._lock:
+            # Entries never used since loading are written back as they are
+            entries = []
+            for key, (stored, response) in self._entries.items():
+                if response is None:
+                    snapshot, offset, length = self._pending[key]
+                    response = snapshot[offset:offset + length]
+                entries.append((key, stored, self._hits.get(key, 0), response))
+
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(_SNAPSHOT_MAGIC)
+            for key, stored, hits, response in entries:
+                key_bytes = key.encode()
+                body = response if isinstance(response, bytes) else \
+                    json.dumps(response, separators=(",", ":")).encode()
+                f.write(_ENTRY.pack(stored, hits, len(key_bytes), len(body)))
+                f.write(key_bytes)
+                f.write(body)
+        os.replace(tmp, path)
+        return len(entries)
+
+    def load(self, path: str) -> int:
+        """
+        Load a snapshot written by save, entries already held are only
+        replaced by newer ones. The file is memory-mapped and responses are
+        only decoded when first used
+
+        Returns:
+            number of responses loaded, 0 if the file does not exist
+        """
+        try:
+            with open(path, "rb") as f:
+                if f.read(len(_SNAPSHOT_MAGIC)) != _SNAPSHOT_MAGIC:
+                    raise ValueError(f"'{path}' is not a response cache snapshot")
+                # The map holds its own handle on the file, which save()
+                # replaces rather than overwrites
+                snapshot = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return 0
+
+        loaded = 0
+        offset = len(_SNAPSHOT_MAGIC)
+        with self._lock:
+            while offset + _ENTRY.size <= len(snapshot):
+                stored, hits, key_len, body_len = _ENTRY.unpack_from(snapshot, offset)
+                offset += _ENTRY.size
+                key = snapshot[offset:offset + key_len].decode()
+                offset += key_len
+                current = self._entries.get(key)
+                if current is None or current[0] < stored:
+                    self._entries[key] = (stored, None)
+                    self._pending[key] = (snapshot, offset, body_len)
+                    self._hits[key] = self._hits.get(key, 0) + hits
+                    loaded += 1
+                offset += body_len
+            self._evict()
+        return loaded
@@ -0,0 +1,82 @@
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class _Circuit:
+    __slots__ = ("failures", "opened_at", "probing", "state")
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+
+
+class CircuitBreaker:
+    """ Per-endpoint circuit breaker that fails fast while the API is degraded """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        """
+        Args:
+            failure_threshold: consecutive failures that open the circuit (default: 5)
+            recovery_timeout: seconds to wait before probing an open circuit
+                (default: 30)
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._circuits: dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def _circuit(self, endpoint: str) -> _Circuit:
+        circuit = self._circuits.get(endpoint)
+        if circuit is None:
+            circuit = self._circuits[endpoint] = _Circuit()
+        return circuit
+
+    def state(self, endpoint: str) -> str:
+        """ Current state of an endpoint: closed, open or half_open """
+        with self._lock:
+            return self._circuit(endpoint).state
+
+    def allow(self, endpoint: str) -> bool:
+        """ Whether a request to the endpoint may go upstream """
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            if circuit.state == CLOSED:
+                return True
+            if circuit.state == OPEN:
+                if time.monotonic() - circuit.opened_at < self.recovery_timeout:
+                    return False
+                circuit.state = HALF_OPEN
+                circuit.probing = False
+            # Half-open: let a single probe through
+            if circuit.probing:
+                return False
+            circuit.probing = True
+            return True
+
+    def record_success(self, endpoint: str) -> None:
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            circuit.state = CLOSED
+            circuit.failures = 0
+            circuit.probing = False
+
+    def release(self, endpoint: str) -> None:
+        """ Give up a probe that ended without a result, e.g. on KeyboardInterrupt """
+        with self._lock:
+            self._circuit(endpoint).probing = False
+
+    def record_failure(self, endpoint: str) -> None:
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            circuit.failures += 1
+            circuit.probing = False
+            if (circuit.state == HALF_OPEN
+                    or circuit.failures >= self.failure_threshold):
+                circuit.state = OPEN
+                circuit.opened_at = time.monotonic()
@@ -0,0 +1,330 @@
+import argparse
+import importlib.util
+import inspect
+import itertools
+import json
+import os
+import sys
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import BinaryIO
+
+import pandas as pd
+
+from .api import CoinglassAPI
+from .endpoints import FRAME_METHODS
+from .keys import KeyPool
+from .rate_limit import RateLimiter
+from .symbol_index import FUTURES, PERPETUAL, SymbolIndex
+
+# Arguments expanded into one job per value, and arguments passed to every job
+DIMENSIONS = ("symbol", "ex", "pair", "interval", "time_type", "currency")
+SCALARS = ("limit", "start_time", "end_time")
+FORMATS = {"parquet": ".parquet", "csv": ".csv", "arrow": ".arrow"}
+
+DONE, FAILED = "done", "failed"
+
+_FRAME_METHODS = frozenset(FRAME_METHODS.values())
+
+
+def job_id(method: str, kwargs: dict) -> str:
+    """ Stable name of a job, also used as its file name """
+    parts = [method, *(f"{key}={kwargs[key]}" for key in sorted(kwargs))]
+    return "__".join(parts).replace("/", "-")
+
+
+def _listed_pairs(index: SymbolIndex, options: dict) -> list[dict[str, str]]:
+    """ (ex, pair) combinations of the symbols that the exchanges list """
+    listed = []
+    for symbol in options["symbol"]:
+        for kind in (PERPETUAL, FUTURES):
+            for kwargs in index.expand(symbol, kind, options.get("ex") or None):
+                if (not options.get("pair") or kwargs["pair"] in options["pair"]) \
+                        and kwargs not in listed:
+                    listed.append(kwargs)
+    return listed
+
+
+def plan_jobs(
+        methods: list[str],
+        options: dict,
+        index: SymbolIndex | None = None
+) -> Iterator[tuple[str, dict]]:
+    """
+    Expand methods and options into (method, kwargs) jobs, options a method
+    does not accept are ignored for it
+
+    Args:
+        methods: CoinglassAPI endpoint methods returning a DataFrame
+        options: values per argument, lists for DIMENSIONS, scalars for SCALARS
+        index: match ex and pair to the pairs each exchange lists for the
+            symbol options, instead of taking every combination (default: None)
+    """
+    listed = None
+    for method in methods:
+        if method not in _FRAME_METHODS:
+            choices = ", ".join(sorted(_FRAME_METHODS))
+            raise ValueError(f"'{method}' is not an endpoint method returning a "
+                             f"DataFrame, choose from: {choices}")
+        accepted = inspect.signature(getattr(CoinglassAPI, method)).parameters
+
+        names = [name for name in DIMENSIONS if name in accepted and options.get(name)]
+        scalars = {name: options[name] for name in SCALARS
+                   if name in accepted and options.get(name) is not None}
+
+        pairs: list[dict] = [{}]
+        if index is not None and "ex" in accepted and "pair" in accepted:
+            if options.get("symbol"):
+                listed = _listed_pairs(index, options) if listed is None else listed
+                names = [name for name in names if name not in ("ex", "pair")]
+                pairs = listed
+            elif len(options.get("ex") or ()) > 1 and options.get("pair"):
+                raise ValueError(f"'{method}' takes pairs of several exchanges, "
+                                 "pass --symbol so each exchange gets its own pairs")
+
+        for values in itertools.product(*(options[name] for name in names)):
+            for pair in pairs:
+                yield method, {**pair, **dict(zip(names, values, strict=True)),
+                               **scalars}
+
+
+class Manifest:
+    """ Resumable record of export jobs, rewritten atomically after every job """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path) as f:
+                self.jobs: dict[str, dict] = json.load(f)["jobs"]
+        except FileNotFoundError:
+            self.jobs = {}
+
+    def add(self, method: str, kwargs: dict) -> str:
+        name = job_id(method, kwargs)
+        with self._lock:
+            self.jobs.setdefault(name, {"method": method, "kwargs": kwargs,
+                                        "status": None})
+        return name
+
+    def pending(self) -> list[str]:
+        return [name for name, job in self.jobs.items() if job["status"] != DONE]
+
+    def update(self, name: str, **entry) -> None:
+        with self._lock:
+            self.jobs[name].update(entry)
+            self.save()
+
+    def save(self) -> None:
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"jobs": self.jobs}, f, indent=1, default=str)
+        os.replace(tmp, self.path)
+
+
+def dump_frame(df: pd.DataFrame, target: str | BinaryIO, fmt: str) -> None:
+    """ Write a frame to a path or binary file as parquet, csv or arrow (feather) """
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.set_axis(["/".join(map(str, col)) for col in df.columns], axis=1)
+
+    if fmt == "csv":
+        df.to_csv(target)
+    elif fmt == "parquet":
+        df.to_parquet(target)
+    elif fmt == "arrow":
+        df.reset_index().to_feather(target)
+    else:
+        raise ValueError(f"Unknown format '{fmt}'")
+
+
+def write_frame(df: pd.DataFrame, path: str, fmt: str) -> None:
+    """ Write a frame atomically as parquet, csv or arrow (feather) """
+    tmp = f"{path}.tmp"
+    dump_frame(df, tmp, fmt)
+    os.replace(tmp, path)
+
+
+def export(
+        cg: CoinglassAPI,
+        manifest: Manifest,
+        out: str,
+        fmt: str = "parquet",
+        workers: int = 4
+) -> dict[str, int]:
+    """
+    Run all jobs of a manifest that are not done yet
+
+    Args:
+        cg: client, its rate limiter or key pool bounds the request rate
+        manifest: jobs to run, updated as they finish
+        out: output directory
+        fmt: parquet, csv or arrow (default: parquet)
+        workers: number of concurrent requests (default: 4)
+
+    Returns:
+        number of done and failed jobs of this run
+    """
+    os.makedirs(out, exist_ok=True)
+    pending = manifest.pending()
+    counts = {DONE: 0, FAILED: 0}
+
+    def run(name: str) -> int:
+        job = manifest.jobs[name]
+        df = getattr(cg, job["method"])(**job["kwargs"])
+        filename = name + FORMATS[fmt]
+        write_frame(df, os.path.join(out, filename), fmt)
+        manifest.update(name, status=DONE, file=filename, rows=len(df), error=None)
+        return len(df)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run, name): name for name in pending}
+        try:
+            for i, future in enumerate(as_completed(futures), start=1):
+                name = futures[future]
+                try:
+                    rows = future.result()
+                except Exception as e:
+                    manifest.update(name, status=FAILED,
+                                    error=f"{type(e).__name__}: {e}")
+                    counts[FAILED] += 1
+                    print(f"[{i}/{len(pending)}] {name}: failed ({e})", file=sys.stderr)
+                else:
+                    counts[DONE] += 1
+                    print(f"[{i}/{len(pending)}] {name}: {rows} rows", file=sys.stderr)
+        except KeyboardInterrupt:
+            # Finished jobs are already in the manifest, drop the queued ones
+            for future in futures:
+                future.cancel()
+            raise
+    return counts
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="coinglass",
+                                     description="Coinglass API command line tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser(
+        "export",
+        help="Export endpoints to parquet, csv or arrow files",
+        description="Export every combination of the given methods and options. "
+                    "Run again with the same --out to resume an interrupted export."
+    )
+    export_parser.add_argument("--method", nargs="+", default=[],
+                               help="client methods, e.g. funding_ohlc (default: "
+                                    "rerun the unfinished jobs of the manifest)")
+    for name in DIMENSIONS:
+        export_parser.add_argument(f"--{name.replace('_', '-')}", dest=name,
+                                   nargs="+", default=[])
+    export_parser.add_argument("--limit", type=int)
+    export_parser.add_argument("--start-time", type=int, help="epoch milliseconds")
+    export_parser.add_argument("--end-time", type=int, help="epoch milliseconds")
+    export_parser.add_argument("--out", default="coinglass_export")
+    export_parser.add_argument("--format", choices=list(FORMATS), default="parquet")
+    export_parser.add_argument("--manifest",
+                               help="job manifest (default: OUT/manifest.json)")
+    export_parser.add_argument("--workers", type=int, default=4)
+    export_parser.add_argument("--requests-per-minute", type=float, default=30,
+                               help="quota of each API key (default: 30)")
+    export_parser.add_argument("--secret", action="append",
+                               help="API key, repeat to spread requests over "
+                                    "several keys (default: $COINGLASS_SECRET)")
+    export_parser.add_argument("--base-url", default=None)
+
+    proxy_parser = commands.add_parser(
+        "proxy",
+        help="Serve the API to local consumers from one shared cache",
+        description="Mirror the /public/v2/ paths of the API. Concurrent requests "
+                    "for the same data are fetched upstream once and cached. Add "
+                    "format=csv, arrow or parquet to get the parsed frame."
+    )
+    proxy_parser.add_argument("--host", default="127.0.0.1")
+    proxy_parser.add_argument("--port", type=int, default=8080)
+    proxy_parser.add_argument("--ttl", type=float, default=60,
+                              help="seconds responses are cached (default: 60)")
+    proxy_parser.add_argument("--requests-per-minute", type=float, default=30,
+                              help="quota of each API key (default: 30)")
+    proxy_parser.add_argument("--secret", action="append",
+                              help="API key, repeat to spread requests over "
+                                   "several keys (default: $COINGLASS_SECRET)")
+    proxy_parser.add_argument("--base-url", default=None)
+    return parser
+
+
+def missing_engine(fmt: str) -> bool:
+    """ Whether the optional dependency writing a format is not installed """
+    if fmt == "parquet":
+        return not any(importlib.util.find_spec(engine)
+                       for engine in ("pyarrow", "fastparquet"))
+    if fmt == "arrow":
+        return importlib.util.find_spec("pyarrow") is None
+    return False
+
+
+def _serve(args: argparse.Namespace, cg: CoinglassAPI) -> int:
+    # Imported here, the proxy builds on this module's frame writers
+    from .proxy import CachingProxy
+
+    proxy = CachingProxy(cg, ttl=args.ttl, host=args.host, port=args.port).start()
+    print(f"Serving {proxy.url}", file=sys.stderr)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        proxy.stop()
+        cg.close()
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = _parser()
+    args = parser.parse_args(argv)
+
+    secrets = args.secret or ([os.environ["COINGLASS_SECRET"]]
+                              if os.environ.get("COINGLASS_SECRET") else [])
+    if not secrets:
+        parser.error("an API key is required, pass --secret or set COINGLASS_SECRET")
+
+    if len(secrets) > 1:
+        client_kwargs = {"coinglass_secret": KeyPool(secrets, args.requests_per_minute)}
+    else:
+        client_kwargs = {"coinglass_secret": secrets[0],
+                         "rate_limiter": RateLimiter(args.requests_per_minute)}
+    if args.base_url:
+        client_kwargs["base_url"] = args.base_url
+
+    if args.command == "proxy":
+        return _serve(args, CoinglassAPI(**client_kwargs))
+
+    if missing_engine(args.format):
+        parser.error(f"{args.format} output needs pyarrow, "
+                     'pip install "coinglass-api[arrow]"')
+
+    os.makedirs(args.out, exist_ok=True)
+    manifest = Manifest(args.manifest or os.path.join(args.out, "manifest.json"))
+    cg = CoinglassAPI(**client_kwargs)
+    try:
+        try:
+            # Exchanges only get the pairs they list for the given symbols
+            for method, kwargs in plan_jobs(args.method, vars(args), SymbolIndex(cg)):
+                manifest.add(method, kwargs)
+        except ValueError as e:
+            parser.error(str(e))
+        manifest.save()
+
+        counts = export(cg, manifest, args.out, args.format, args.workers)
+    except KeyboardInterrupt:
+        print("Interrupted, run the same command again to resume", file=sys.stderr)
+        return 130
+    finally:
+        cg.close()
+
+    print(f"{counts[DONE]} done, {counts[FAILED]} failed, "
+          f"{len(manifest.pending())} left", file=sys.stderr)
+    return 1 if counts[FAILED] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
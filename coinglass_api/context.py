@@ -0,0 +1,14 @@
+import contextvars
+from collections.abc import Callable
+from concurrent.futures import Executor, Future
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+def submit_in_context(pool: Executor, fn: Callable[..., T], *args) -> Future[T]:
+    """
+    Submit a call that runs in a copy of the caller's context, so the scheduler
+    priority and the active profiler apply inside the worker
+    """
+    return pool.submit(contextvars.copy_context().run, fn, *args)
@@ -0,0 +1,308 @@
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+import warnings
+from collections.abc import Callable
+
+import pandas as pd
+import requests
+
+from .api import CoinglassAPI
+from .endpoints import FRAME_METHODS
+from .exceptions import CoinglassAPIError, CoinglassQuotaWarning, CoinglassRequestError
+from .intervals import interval_to_ms
+
+logger = logging.getLogger(__name__)
+
+_FRAME_METHODS = frozenset(FRAME_METHODS.values())
+
+# Weekly bars close on Monday 00:00 UTC, four days after the epoch
+_WEEK_MS = 604_800_000
+_WEEK_ORIGIN_MS = 4 * 86_400_000
+
+
+class RefreshJob:
+    """ One client call refreshed by a RefreshDaemon """
+
+    __slots__ = (
+        "callback",
+        "errors",
+        "kwargs",
+        "last_error",
+        "last_refresh",
+        "method",
+        "name",
+        "next_run",
+        "offset",
+        "period",
+        "result",
+        "runs",
+    )
+
+    def __init__(
+            self,
+            name: str,
+            method: str,
+            kwargs: dict,
+            period: float,
+            callback: Callable[[str, pd.DataFrame], None] | None
+    ):
+        self.name = name
+        self.method = method
+        self.kwargs = kwargs
+        self.period = period
+        self.callback = callback
+        self.offset = 0.0
+        self.next_run = 0.0
+        self.runs = 0
+        self.errors = 0
+        self.last_error: Exception | None = None
+        self.last_refresh: float | None = None
+        self.result: pd.DataFrame | None = None
+
+    @property
+    def requests_per_minute(self) -> float:
+        return 60 / self.period
+
+    def next_close(self, now: float) -> float:
+        """ Time of the first bar close after now, in epoch seconds """
+        period_ms = round(self.period * 1000)
+        origin = _WEEK_ORIGIN_MS if period_ms % _WEEK_MS == 0 else 0
+        now_ms = now * 1000 - origin
+        return ((now_ms // period_ms + 1) * period_ms + origin) / 1000
+
+
+class QuotaPlan:
+    """ Request budget of a set of refresh jobs against a quota """
+
+    def __init__(self, jobs: list[RefreshJob], quota: float | None, spacing: float):
+        self.quota = quota
+        self.jobs = len(jobs)
+        self.requests_per_minute = sum(job.requests_per_minute for job in jobs)
+        # At midnight UTC every bar closes at once, the last refresh of that
+        # burst starts (jobs - 1) slots after the first
+        self.burst_span = max(0, len(jobs) - 1) * spacing
+        self.shortest_period = min((job.period for job in jobs), default=None)
+
+    @property
+    def fits(self) -> bool:
+        if self.quota is None:
+            return True
+        if self.requests_per_minute > self.quota:
+            return False
+        return self.shortest_period is None or self.burst_span < self.shortest_period
+
+    def __str__(self) -> str:
+        quota = "unlimited" if self.quota is None else f"{self.quota:g}"
+        text = (f"{self.jobs} jobs, {self.requests_per_minute:.2f} requests/min "
+                f"of {quota}, burst spread over {self.burst_span:.1f}s")
+        return text if self.fits else f"{text}: does not fit the quota"
+
+
+class RefreshDaemon:
+    """
+    Refresh a set of client calls in a background thread, each just after a
+    bar of its interval closes
+    """
+
+    def __init__(
+            self,
+            cg: CoinglassAPI,
+            requests_per_minute: float | None = None,
+            delay: float = 2.0,
+            jitter: float = 3.0,
+            seed: int | None = None
+    ):
+        """
+        Args:
+            cg: client used for the refreshes
+            requests_per_minute: quota to plan for (default: the client's
+                rate limiter, unlimited without one)
+            delay: seconds after a bar close before refreshing, gives the API
+                time to publish the bar (default: 2)
+            jitter: random extra delay in seconds, so refreshes of unrelated
+                clients do not land at once (default: 3)
+            seed: seed of the jitter (default: random)
+        """
+        if requests_per_minute is None and cg._rate_limiter is not None:
+            requests_per_minute = cg._rate_limiter.rate * 60
+        self.cg = cg
+        self.quota = requests_per_minute
+        self.delay = delay
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._jobs: dict[str, RefreshJob] = {}
+        self._heap: list[tuple[float, int, RefreshJob]] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def add(
+            self,
+            method: str,
+            callback: Callable[[str, pd.DataFrame], None] | None = None,
+            name: str | None = None,
+            every: str | float | None = None,
+            **kwargs
+    ) -> RefreshJob:
+        """
+        Declare a call to keep fresh
+
+        Args:
+            method: client method, e.g. funding_ohlc
+            callback: called with (name, frame) after every refresh
+            name: job name (default: method and arguments)
+            every: refresh period as an interval (e.g. h1) or seconds
+                (default: the interval or time_type argument)
+            **kwargs: arguments of the method
+
+        Returns:
+            RefreshJob
+        """
+        if method not in _FRAME_METHODS:
+            raise ValueError(f"'{method}' is not an endpoint method returning a "
+                             f"DataFrame")
+        if every is None:
+            every = kwargs.get("interval", kwargs.get("time_type"))
+        if every is None:
+            raise ValueError(f"'{method}' has no interval, pass every=")
+        period = interval_to_ms(every) / 1000 if isinstance(every, str) else every
+        if period <= 0:
+            raise ValueError("Refresh period must be positive")
+
+        if name is None:
+            name = ",".join([method, *(f"{k}={v}" for k, v in sorted(kwargs.items()))])
+        job = RefreshJob(name, method, kwargs, float(period), callback)
+        with self._lock:
+            if name in self._jobs:
+                raise ValueError(f"Job '{name}' already exists")
+            self._jobs[name] = job
+            self._replan()
+        return job
+
+    def remove(self, name: str) -> None:
+        with self._lock:
+            del self._jobs[name]
+            self._heap = [entry for entry in self._heap if entry[2].name != name]
+            heapq.heapify(self._heap)
+            self._replan()
+
+    @property
+    def jobs(self) -> list[RefreshJob]:
+        return list(self._jobs.values())
+
+    def _spacing(self) -> float:
+        # Jobs sharing a bar close are staggered one request apart at the quota
+        return 0.0 if self.quota is None else 60 / self.quota
+
+    def _replan(self) -> None:
+        # Shortest periods first, their data goes stale the fastest
+        spacing = self._spacing()
+        ordered = sorted(self._jobs.values(), key=lambda job: (job.period, job.name))
+        for slot, job in enumerate(ordered):
+            jitter = self._random.uniform(0, self.jitter)
+            job.offset = self.delay + slot * spacing + jitter
+
+        now = time.time()
+        self._heap = []
+        for job in ordered:
+            job.next_run = job.next_close(now - job.offset) + job.offset
+            heapq.heappush(self._heap, (job.next_run, next(self._seq), job))
+        self._wakeup.set()
+
+    def plan(self) -> QuotaPlan:
+        """ Request budget of the declared jobs against the quota """
+        with self._lock:
+            return QuotaPlan(list(self._jobs.values()), self.quota, self._spacing())
+
+    def refresh(self, job: RefreshJob) -> None:
+        """ Run one refresh now, fetch and callback errors are recorded on the job """
+        try:
+            result = getattr(self.cg, job.method)(**job.kwargs)
+        except (requests.RequestException, CoinglassAPIError,
+                CoinglassRequestError) as e:
+            job.errors += 1
+            job.last_error = e
+        except Exception as e:
+            # Anything else is a bug or a malformed response, keep refreshing the
+            # other jobs but leave the traceback in the log
+            logger.exception("Refresh of '%s' failed", job.name)
+            job.errors += 1
+            job.last_error = e
+        else:
+            job.result = result
+            job.last_refresh = time.time()
+            job.last_error = None
+            if job.callback is not None:
+                # A failing callback must not stop the refresh thread
+                try:
+                    job.callback(job.name, result)
+                except Exception as e:
+                    logger.exception("Callback of '%s' failed", job.name)
+                    job.errors += 1
+                    job.last_error = e
+        finally:
+            job.runs += 1
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            with self._lock:
+                due = self._heap[0][0] if self._heap else None
+            wait = None if due is None else due - time.time()
+            if wait is None or wait > 0:
+                self._wakeup.wait(wait)
+                self._wakeup.clear()
+                continue
+
+            with self._lock:
+                if not self._heap or self._heap[0][0] > time.time():
+                    continue
+                _, _, job = heapq.heappop(self._heap)
+            self.refresh(job)
+
+            with self._lock:
+                # A replan during the refresh may have queued the job already
+                queued = any(entry[2] is job for entry in self._heap)
+                if self._jobs.get(job.name) is job and not queued:
+                    # Skip closes missed while this or earlier refreshes ran
+                    now = time.time()
+                    job.next_run = job.next_close(now - job.offset) + job.offset
+                    heapq.heappush(self._heap, (job.next_run, next(self._seq), job))
+
+    def start(self) -> None:
+        """ Start refreshing in a daemon thread, warns if the jobs do not fit """
+        plan = self.plan()
+        if not plan.fits:
+            warnings.warn(str(plan), CoinglassQuotaWarning, stacklevel=2)
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True,
+                                            name="coinglass-refresh")
+            self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self) -> list[dict]:
+        """ Per-job counters and the time of the next refresh """
+        with self._lock:
+            return [{"name": job.name, "period": job.period, "runs": job.runs,
+                     "errors": job.errors, "next_run": job.next_run,
+                     "last_refresh": job.last_refresh}
+                    for job in self._jobs.values()]
+
+    def __enter__(self) -> "RefreshDaemon":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
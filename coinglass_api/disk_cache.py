@@ -0,0 +1,197 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections.abc import Callable
+
+_Codec = tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]
+
+# Codecs by preference, zstandard and lz4 come with the compression extra,
+# without them responses are stored with zlib at level 1
+CODECS: dict[str, _Codec] = {}
+try:
+    import zstandard
+
+    CODECS["zstd"] = (zstandard.ZstdCompressor(level=3).compress,
+                      zstandard.ZstdDecompressor().decompress)
+except ImportError:
+    pass
+try:
+    import lz4.frame
+
+    CODECS["lz4"] = (lz4.frame.compress, lz4.frame.decompress)
+except ImportError:
+    pass
+CODECS["zlib"] = (lambda body: zlib.compress(body, 1), zlib.decompress)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    stored REAL NOT NULL,
+    accessed REAL NOT NULL,
+    codec TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    body BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+"""
+
+# Writes after which the stored size is summed again, to notice other processes
+RESYNC_EVERY = 256
+
+
+class DiskCache:
+    """
+    Compressed response cache in a SQLite file, shared by all threads and
+    processes that open the same path
+    """
+
+    def __init__(
+            self,
+            path: str,
+            max_bytes: int = 256 * 1024 ** 2,
+            ttl: float | None = 60.0,
+            codec: str | None = None
+    ):
+        """
+        Args:
+            path: SQLite database file, created if missing
+            max_bytes: compressed size above which the least recently read
+                responses are evicted (default: 256 MiB)
+            ttl: seconds a response is served for, None keeps them until
+                evicted (default: 60)
+            codec: zstd, lz4 or zlib (default: the fastest one installed)
+        """
+        codec = next(iter(CODECS)) if codec is None else codec
+        if codec not in CODECS:
+            raise ValueError(f"Codec '{codec}' is not installed, "
+                             f"available: {', '.join(CODECS)}")
+        self.path = os.path.expanduser(path)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.codec = codec
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        # Connections of every thread, so close() reaches all of them
+        self._connections: dict[sqlite3.Connection, int] = {}
+        # Running total of compressed bytes, overcounts replaced rows so the
+        # exact sum is only taken once it may exceed max_bytes
+        self._estimate: int | None = None
+        self._writes = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        # Each thread and process uses its own connection, close() may close
+        # them from any thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid() \
+                or conn not in self._connections:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+            with self._lock:
+                self._connections[conn] = os.getpid()
+        return conn
+
+    def get(self, key: str, max_age: float | None = None) -> dict | None:
+        """
+        Look up a response
+
+        Args:
+            key: request key
+            max_age: only return responses younger than this many seconds
+                (default: ttl)
+
+        Returns:
+            response or None
+        """
+        max_age = self.ttl if max_age is None else max_age
+        conn = self._connection()
+        row = conn.execute("SELECT stored, codec, body FROM responses WHERE key = ?",
+                           (key,)).fetchone()
+        now = time.time()
+        if row is None or (max_age is not None and now - row[0] > max_age) \
+                or row[1] not in CODECS:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        with self._lock:
+            self.hits += 1
+        return json.loads(CODECS[row[1]][1](row[2]))
+
+    def set(self, key: str, response: dict) -> None:
+        body = CODECS[self.codec][0](json.dumps(response, separators=(",", ":"))
+                                     .encode())
+        now = time.time()
+        conn = self._connection()
+        conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                     (key, now, now, self.codec, len(body), body))
+        with self._lock:
+            self._writes += 1
+            if self._estimate is not None:
+                self._estimate += len(body)
+            resync = self._estimate is None or self._estimate > self.max_bytes \
+                or self._writes % RESYNC_EVERY == 0
+        if resync:
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = self.size
+        if total <= self.max_bytes:
+            with self._lock:
+                self._estimate = total
+            return
+        # Delete the least recently read rows until enough bytes are freed
+        conn.execute("""
+            DELETE FROM responses WHERE key IN (
+                SELECT key FROM (
+                    SELECT key, SUM(size) OVER (ORDER BY accessed, key) - size AS before
+                    FROM responses
+                ) WHERE before < ?
+            )
+        """, (total - self.max_bytes,))
+        total = self.size
+        with self._lock:
+            self._estimate = total
+
+    def __contains__(self, key: str) -> bool:
+        row = self._connection().execute(
+            "SELECT 1 FROM responses WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    @property
+    def size(self) -> int:
+        """ Compressed bytes stored """
+        return self._connection().execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM responses")
+        with self._lock:
+            self._estimate = 0
+
+    def close(self) -> None:
+        """ Close the connections of all threads, a later call opens a new one """
+        with self._lock:
+            # Connections inherited from a parent process belong to the parent
+            connections = [conn for conn, pid in self._connections.items()
+                           if pid == os.getpid()]
+            self._connections.clear()
+        for conn in connections:
+            conn.close()
+        self._local.conn = None
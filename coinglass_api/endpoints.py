@@ -0,0 +1,44 @@
+# Endpoint -> CoinglassAPI method returning its response as a DataFrame.
+# Methods returning lists or dicts (funding_usd_history, funding_coin_history,
+# liquidation_info, liquidation_map, liquidation_order) are not listed.
+FRAME_METHODS: dict[str, str] = {
+    "perpetual_market": "perpetual_market",
+    "futures_market": "futures_market",
+    "funding": "funding_rate",
+    "open_interest": "open_interest",
+    "open_interest_history": "open_interest_history",
+    "option": "option",
+    "option_history": "option_history",
+    "option/vol/history": "option_vol_history",
+    "liquidation_top": "top_liquidations",
+    "liquidation_ex": "exchange_liquidations",
+    "liquidation_history": "liquidations_history",
+    "long_short": "exchange_long_short_ratio",
+    "long_short_history": "long_short_ratio_history",
+    "futures_coins_markets": "futures_coins_markets",
+    "futures_coins_price_change": "futures_coins_price_change",
+    "futures_basis_chart": "futures_basis_chart",
+    "futures_vol": "futures_vol",
+    "indicator/funding": "funding",
+    "indicator/funding_ohlc": "funding_ohlc",
+    "indicator/funding_avg": "funding_average",
+    "indicator/open_interest_ohlc": "open_interest_ohlc",
+    "indicator/open_interest_aggregated_ohlc": "open_interest_aggregated_ohlc",
+    "indicator/liquidation_symbol": "liquidation_symbol",
+    "indicator/liquidation_pair": "liquidation_pair",
+    "indicator/long_short_accounts": "long_short_accounts",
+    "indicator/long_short_symbol": "long_short_symbol",
+    "indicator/top_long_short_account_ratio": "top_long_short_account_ratio",
+    "indicator/top_long_short_position_ratio": "top_long_short_position_ratio",
+    "index/bitcoin_bubble_index": "bitcoin_bubble_index",
+    "index/ahr999": "ahr999",
+    "index/tow_year_MA_multiplier": "tow_year_ma_multiplier",
+    "index/tow_hundred_week_moving_avg_heatmap": "tow_hundred_week_moving_avg_heatmap",
+    "index/puell_multiple": "puell_multiple",
+    "index/stock_flow": "stock_flow",
+    "index/pi": "pi",
+    "index/golden_ratio_multiplier": "golden_ratio_multiplier",
+    "index/bitcoin_profitable_days": "bitcoin_profitable_days",
+    "index/log_log_regression": "log_log_regression",
+    "index/grayscale_market_history": "grayscale_market_history",
+}
@@ -34,5 +34,38 @@ class NoDataReturnedError(CoinglassRequestError):
         super().__init__(code=0, msg="API request returned no data")
 
 
+class CircuitOpenError(CoinglassRequestError):
+    """ Raised when an endpoint's circuit is open and no cached result exists """
+
+    def __init__(self, endpoint: str):
+        super().__init__(code=0, msg=f"Circuit open for endpoint '{endpoint}'")
+
+
+class NoActiveKeyError(CoinglassRequestError):
+    """ Raised when every key in a KeyPool was rejected by the API """
+
+    def __init__(self):
+        super().__init__(code=30001, msg="No active API keys left in pool")
+
+
+class DeadlineExceededError(CoinglassRequestError):
+    """ Raised when a scheduled request expires before it could be sent """
+
+    def __init__(self):
+        super().__init__(code=0, msg="Request deadline expired before dispatch")
+
+
 class CoinglassParameterWarning(Warning):
     """ Warning for (potentially) invalid parameters """
+
+
+class CoinglassStaleDataWarning(Warning):
+    """ Warning for cached data served while the API is unavailable """
+
+
+class CoinglassSchemaWarning(Warning):
+    """ Warning for a response that no longer matches its learned schema """
+
+
+class CoinglassQuotaWarning(Warning):
+    """ Warning for scheduled work that does not fit the API quota """
@@ -0,0 +1,109 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .api import CoinglassAPI
+from .context import submit_in_context
+from .intervals import interval_to_ms
+
+
+def _to_ms(time: pd.Timestamp | str | int) -> int:
+    # Integral numpy scalars, e.g. from Index.asi8, are milliseconds too
+    if isinstance(time, (int, np.integer)):
+        return int(time)
+    return int(pd.Timestamp(time).as_unit("ms").value)
+
+
+def find_gaps(
+        index: pd.DatetimeIndex,
+        interval: str,
+        start: pd.Timestamp | str | int | None = None,
+        end: pd.Timestamp | str | int | None = None
+) -> list[tuple[int, int]]:
+    """
+    Missing bars of a series on its interval grid
+
+    Args:
+        index: bar open times of the series
+        interval: bar interval, e.g. h1
+        start: expected first bar, also reports a gap before the series
+        end: expected last bar, also reports a gap after the series
+            (times in milliseconds, or anything pd.Timestamp accepts)
+
+    Returns:
+        list of (first missing bar, last missing bar) in milliseconds
+    """
+    step = interval_to_ms(interval)
+    times = np.unique(index.as_unit("ms").asi8)
+
+    start = None if start is None else _to_ms(start)
+    end = None if end is None else _to_ms(end)
+    if not len(times):
+        return [] if start is None or end is None else [(start, end)]
+
+    gaps = []
+    if start is not None and times[0] - start >= step:
+        gaps.append((start, int(times[0]) - step))
+    if len(times) > 1:
+        holes = np.flatnonzero(np.diff(times) > step)
+        gaps.extend(zip((times[holes] + step).tolist(),
+                        (times[holes + 1] - step).tolist(), strict=True))
+    if end is not None and end - times[-1] >= step:
+        gaps.append((int(times[-1]) + step, end))
+    return gaps
+
+
+def _pages(gaps: list[tuple[int, int]], step: int, page_size: int) -> list[tuple]:
+    pages = []
+    for gap_start, gap_end in gaps:
+        for page_start in range(gap_start, gap_end + 1, page_size * step):
+            page_end = min(gap_end, page_start + (page_size - 1) * step)
+            pages.append((page_start, page_end, (page_end - page_start) // step + 1))
+    return pages
+
+
+def repair_gaps(
+        cg: CoinglassAPI,
+        method: str,
+        df: pd.DataFrame,
+        workers: int = 4,
+        page_size: int = 500,
+        start: pd.Timestamp | str | int | None = None,
+        end: pd.Timestamp | str | int | None = None,
+        **kwargs
+) -> pd.DataFrame:
+    """
+    Fetch only the missing bars of a series, in parallel, and merge them in
+
+    Args:
+        cg: client, its rate limiter bounds the parallel requests
+        method: client method that produced the series, e.g. funding_ohlc
+        df: series with a DatetimeIndex of bar open times
+        workers: number of concurrent requests (default: 4)
+        page_size: maximum bars per request (default: 500)
+        start: expected first bar (default: first bar of df)
+        end: expected last bar (default: last bar of df)
+        **kwargs: series arguments of the method, must include interval
+
+    Returns:
+        pandas DataFrame with the gaps filled where the API has data
+    """
+    step = interval_to_ms(kwargs["interval"])
+    pages = _pages(find_gaps(df.index, kwargs["interval"], start, end), step, page_size)
+    if not pages:
+        return df
+
+    def fetch(page: tuple[int, int, int]) -> pd.DataFrame:
+        page_start, page_end, limit = page
+        return getattr(cg, method)(**kwargs, limit=limit, start_time=page_start,
+                                   end_time=page_end)
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(pages))) as pool:
+        futures = [submit_in_context(pool, fetch, page) for page in pages]
+        frames = [frame for frame in (future.result() for future in futures)
+                  if len(frame)]
+
+    repaired = pd.concat([df, *frames])
+    repaired = repaired[~repaired.index.duplicated(keep="first")]
+    return repaired.sort_index()
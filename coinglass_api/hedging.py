@@ -0,0 +1,41 @@
+from collections.abc import Iterable
+
+
+class HedgingPolicy:
+    """ Send a duplicate request once a call outlives a learned latency percentile """
+
+    def __init__(
+            self,
+            endpoints: Iterable[str] | None = None,
+            percentile: float = 95.0,
+            min_samples: int = 20,
+            initial_delay: float = 1.0,
+            min_delay: float = 0.05,
+            max_hedges: int = 1
+    ):
+        """
+        Args:
+            endpoints: endpoints to hedge (e.g. perpetual_market), None hedges all
+            percentile: latency percentile after which a hedge is sent (default: 95)
+            min_samples: samples needed before the learned percentile is used
+                (default: 20)
+            initial_delay: hedge delay in seconds until enough samples exist
+                (default: 1.0)
+            min_delay: lower bound on the hedge delay in seconds (default: 0.05)
+            max_hedges: maximum number of duplicate requests per call (default: 1)
+        """
+        self.endpoints = set(endpoints) if endpoints is not None else None
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_hedges = max_hedges
+
+    def applies_to(self, endpoint: str) -> bool:
+        return self.endpoints is None or endpoint in self.endpoints
+
+    def delay(self, learned: float | None, samples: int) -> float:
+        """ Time to wait on outstanding requests before sending a hedge """
+        if learned is None or samples < self.min_samples:
+            return self.initial_delay
+        return max(self.min_delay, learned)
@@ -0,0 +1,28 @@
+_UNIT_MS = {
+    "m": 60_000,
+    "h": 3_600_000,
+    "d": 86_400_000,
+    "w": 604_800_000,
+}
+
+
+def interval_to_ms(interval: str) -> int:
+    """
+    Convert a Coinglass interval or time type to milliseconds
+
+    Args:
+        interval: interval (e.g. m1, m5, h1, h8, 1d, 7d)
+
+    Returns:
+        length of one bar in milliseconds
+    """
+    interval = interval.strip()
+    if interval[0].isalpha():
+        unit, count = interval[0], interval[1:]
+    else:
+        unit, count = interval[-1], interval[:-1]
+
+    try:
+        return int(count) * _UNIT_MS[unit.lower()]
+    except (KeyError, ValueError):
+        raise ValueError(f"Unknown interval '{interval}'") from None
@@ -0,0 +1,140 @@
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from array import array
+
+_MAGIC = b"CGJRNL01"
+# recorded time, key length, compressed body length
+_RECORD = struct.Struct("<dII")
+
+
+class JournalWriter:
+    """ Append every request and response of a client to a journal file """
+
+    replaying = False
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: journal file, appended to if it exists
+        """
+        self.path = path
+        self.records = 0
+        self._lock = threading.Lock()
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            with open(path, "rb") as f:
+                if f.read(len(_MAGIC)) != _MAGIC:
+                    raise ValueError(f"'{path}' is not a journal file")
+        self._file = open(path, "ab")  # noqa: SIM115
+        if not exists:
+            self._file.write(_MAGIC)
+
+    def record(self, key: str, response: dict, recorded: float | None = None) -> None:
+        key_bytes = key.encode()
+        body = zlib.compress(json.dumps(response, separators=(",", ":")).encode(), 1)
+        header = _RECORD.pack(time.time() if recorded is None else recorded,
+                              len(key_bytes), len(body))
+        with self._lock:
+            self._file.write(header + key_bytes + body)
+            self._file.flush()
+            self.records += 1
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class JournalReplay:
+    """
+    Serve the responses of a journal instead of calling the API, in recorded
+    order per request, either as fast as possible or paced like the recording
+    """
+
+    replaying = True
+
+    def __init__(self, path: str, speed: float | None = None):
+        """
+        Args:
+            path: journal file written by JournalWriter
+            speed: 1 replays in real time, 60 a minute per second, None as
+                fast as possible (default: None)
+        """
+        # The file is memory-mapped and only an offset per record is kept,
+        # bodies are read, decompressed and decoded when served
+        self._file = open(path, "rb")  # noqa: SIM115
+        size = os.fstat(self._file.fileno()).st_size
+        if size < len(_MAGIC):
+            self._file.close()
+            raise ValueError(f"'{path}' is not a journal file")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(_MAGIC)] != _MAGIC:
+            self._map.close()
+            self._file.close()
+            raise ValueError(f"'{path}' is not a journal file")
+
+        # key -> header offsets of its records, and the next one to serve
+        self._offsets: dict[bytes, array] = {}
+        self._next: dict[bytes, int] = {}
+        offset = len(_MAGIC)
+        first = None
+        while offset + _RECORD.size <= size:
+            recorded, key_len, body_len = _RECORD.unpack_from(self._map, offset)
+            end = offset + _RECORD.size + key_len + body_len
+            if end > size:
+                break  # record cut short by a crash while writing
+            key = self._map[offset + _RECORD.size:offset + _RECORD.size + key_len]
+            offsets = self._offsets.get(key)
+            if offsets is None:
+                offsets = self._offsets[key] = array("Q")
+                self._next[key] = 0
+            offsets.append(offset)
+            offset = end
+            first = recorded if first is None else first
+
+        self.speed = speed
+        self.start = first
+        self.time = first
+        self.served = 0
+        self._wall_start: float | None = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """ Number of responses left """
+        with self._lock:
+            return sum(len(offsets) - self._next[key]
+                       for key, offsets in self._offsets.items())
+
+    def response(self, key: str) -> dict:
+        """ Next recorded response of a request, waits when paced """
+        key_bytes = key.encode()
+        with self._lock:
+            offsets = self._offsets.get(key_bytes)
+            if offsets is None or self._next[key_bytes] >= len(offsets):
+                raise KeyError(f"No recorded response left for '{key}'")
+            offset = offsets[self._next[key_bytes]]
+            self._next[key_bytes] += 1
+            recorded, key_len, body_len = _RECORD.unpack_from(self._map, offset)
+            start = offset + _RECORD.size + key_len
+            body = self._map[start:start + body_len]
+            self.time = recorded
+            self.served += 1
+            if self._wall_start is None:
+                self._wall_start = time.monotonic()
+
+        if self.speed is not None:
+            due = self._wall_start + (recorded - self.start) / self.speed
+            wait = due - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+        return json.loads(zlib.decompress(body))
+
+    def close(self) -> None:
+        """ Unmap the journal file """
+        with self._lock:
+            self._map.close()
+            self._file.close()
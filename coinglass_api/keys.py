@@ -0,0 +1,155 @@
+import threading
+import time
+from collections.abc import Iterable
+
+from .exceptions import NoActiveKeyError
+from .rate_limit import RateLimiter, SharedRateLimiter
+
+# Error codes Coinglass returns for a missing, invalid or expired secret
+AUTH_ERROR_CODES = frozenset({30001})
+
+
+class _KeyState:
+    __slots__ = (
+        "active",
+        "auth_errors",
+        "cooldown_until",
+        "limiter",
+        "rate_limited",
+        "requests",
+        "secret",
+    )
+
+    def __init__(self, secret: str, limiter: RateLimiter):
+        self.secret = secret
+        self.limiter = limiter
+        self.active = True
+        self.cooldown_until = 0.0
+        self.requests = 0
+        self.rate_limited = 0
+        self.auth_errors = 0
+
+
+class KeyPool:
+    """ Spread requests over several API keys, each with its own quota """
+
+    def __init__(
+            self,
+            secrets: Iterable[str],
+            requests_per_minute: float = 30,
+            cooldown: float = 60.0,
+            auth_error_codes: Iterable[int] = AUTH_ERROR_CODES,
+            shared: bool = False
+    ):
+        """
+        Args:
+            secrets: Coinglass API keys
+            requests_per_minute: quota of each key (default: 30)
+            cooldown: seconds a key is skipped after a 50001 response (default: 60)
+            auth_error_codes: response codes that take a key out of rotation
+            shared: share each key's budget with other processes on this host
+                (default: False)
+        """
+        self._keys = [
+            _KeyState(secret, SharedRateLimiter(requests_per_minute, key=secret)
+                      if shared else RateLimiter(requests_per_minute))
+            for secret in dict.fromkeys(secrets)
+        ]
+        if not self._keys:
+            raise ValueError("KeyPool needs at least one secret")
+
+        self.cooldown = cooldown
+        self.auth_error_codes = frozenset(auth_error_codes)
+        self._by_secret = {key.secret: key for key in self._keys}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def active(self) -> int:
+        """ Number of keys still in rotation """
+        return sum(key.active for key in self._keys)
+
+    def acquire(self, timeout: float | None = None) -> str:
+        """
+        Take one request from the key with the most remaining budget,
+        blocking until any key has budget
+
+        Args:
+            timeout: maximum time to wait in seconds, None waits forever
+
+        Returns:
+            API key to send the request with
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                usable = [key for key in self._keys
+                          if key.active and key.cooldown_until <= now]
+                if not usable and not any(key.active for key in self._keys):
+                    raise NoActiveKeyError()
+
+                # Highest remaining budget first, ties go to the least used key
+                for key in sorted(usable, key=lambda k: (-k.limiter.available,
+                                                         k.requests)):
+                    if key.limiter.try_acquire():
+                        key.requests += 1
+                        return key.secret
+
+                waits = [1 / key.limiter.rate for key in usable]
+                waits += [key.cooldown_until - now for key in self._keys
+                          if key.active and key.cooldown_until > now]
+                wait = max(0.001, min(waits))
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("No API key budget available")
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    def charge(self, secret: str) -> None:
+        """ Take one request from a given key's budget, e.g. for a retry """
+        key = self._by_secret[secret]
+        key.limiter.acquire()
+        with self._lock:
+            key.requests += 1
+
+    def report(self, secret: str, response: dict) -> bool:
+        """
+        Update key state from an API response
+
+        Returns:
+            True if the request should be retried with another key
+        """
+        if response.get("success", True):
+            return False
+
+        try:
+            code = int(response.get("code", 0))
+        except (TypeError, ValueError):
+            return False
+
+        with self._lock:
+            key = self._by_secret[secret]
+            if code == 50001:
+                key.rate_limited += 1
+                key.cooldown_until = time.monotonic() + self.cooldown
+            elif code in self.auth_error_codes:
+                key.auth_errors += 1
+                key.active = False
+            else:
+                return False
+            return any(other.active for other in self._keys if other is not key)
+
+    def stats(self) -> list[dict]:
+        """ Per-key counters, keys are masked to their last four characters """
+        now = time.monotonic()
+        with self._lock:
+            return [{"key": f"...{key.secret[-4:]}", "active": key.active,
+                     "cooling_down": key.cooldown_until > now,
+                     "available": key.limiter.available, "requests": key.requests,
+                     "rate_limited": key.rate_limited, "auth_errors": key.auth_errors}
+                    for key in self._keys]
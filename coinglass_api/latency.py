@@ -0,0 +1,110 @@
+import math
+import threading
+
+
+class LogHistogram:
+    """
+    Fixed-size histogram with logarithmic buckets, percentiles are within the
+    relative accuracy and recording is O(1) without storing samples
+    """
+
+    def __init__(
+            self,
+            min_value: float,
+            max_value: float,
+            relative_accuracy: float = 0.02,
+            half_life: int = 1000
+    ):
+        """
+        Args:
+            min_value: smallest value told apart, smaller ones share a bucket
+            max_value: largest value told apart, larger ones share a bucket
+            relative_accuracy: relative error of percentiles (default: 2%)
+            half_life: samples after which older samples count half, so the
+                histogram follows changes (default: 1000)
+        """
+        gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._min = min_value
+        self._log_gamma = math.log(gamma)
+        self._gamma = gamma
+        buckets = int(math.log(max_value / min_value) / self._log_gamma) + 2
+        self._counts = [0.0] * buckets
+        self._half_life = half_life
+        self._since_decay = 0
+        self.count = 0.0
+
+    def add(self, value: float) -> None:
+        index = 0 if value <= self._min else \
+            int(math.log(value / self._min) / self._log_gamma) + 1
+        self._counts[min(index, len(self._counts) - 1)] += 1
+        self.count += 1
+        self._since_decay += 1
+        if self._since_decay >= self._half_life:
+            self._counts = [count / 2 for count in self._counts]
+            self.count /= 2
+            self._since_decay = 0
+
+    def percentile(self, q: float) -> float | None:
+        """ Approximate percentile between 0 and 100, None when empty """
+        if not self.count:
+            return None
+        rank = q / 100 * self.count
+        cumulative = 0.0
+        found = len(self._counts) - 1
+        for index, count in enumerate(self._counts):
+            cumulative += count
+            if cumulative >= rank and count:
+                found = index
+                break
+        if found == 0:
+            return self._min
+        # Geometric middle of the bucket
+        return self._min * self._gamma ** (found - 0.5)
+
+
+class LatencyTracker:
+    """
+    Latency sketch per endpoint and over all endpoints, one recording feeds
+    both hedge delays and learned timeouts
+    """
+
+    def __init__(self, half_life: int = 1000):
+        """
+        Args:
+            half_life: samples after which older samples count half
+                (default: 1000)
+        """
+        self._half_life = half_life
+        self._endpoints: dict[str, LogHistogram] = {}
+        self._all = LogHistogram(1e-4, 600.0, half_life=half_life)
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._endpoints.get(endpoint)
+            if histogram is None:
+                histogram = self._endpoints[endpoint] = LogHistogram(
+                    1e-4, 600.0, half_life=self._half_life)
+            histogram.add(seconds)
+            self._all.add(seconds)
+
+    def count(self, endpoint: str | None = None) -> int:
+        """ Weight of the samples of an endpoint, or of all endpoints """
+        with self._lock:
+            histogram = self._all if endpoint is None else self._endpoints.get(endpoint)
+            return 0 if histogram is None else int(histogram.count)
+
+    def percentile(self, endpoint: str | None, q: float) -> float | None:
+        """
+        Latency percentile for an endpoint
+
+        Args:
+            endpoint: API endpoint, None for all endpoints
+            q: percentile between 0 and 100
+
+        Returns:
+            latency in seconds, None if no samples were recorded
+        """
+        with self._lock:
+            histogram = self._all if endpoint is None else self._endpoints.get(endpoint)
+            return None if histogram is None else histogram.percentile(q)
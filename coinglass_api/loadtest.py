@@ -0,0 +1,177 @@
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .api import CoinglassAPI
+from .mock_server import MockCoinglassServer
+
+
+class LoadTestResult:
+    """ Throughput and latency percentiles of a load test run """
+
+    def __init__(
+            self,
+            mode: str,
+            concurrency: int,
+            latencies: list[float],
+            errors: int,
+            elapsed: float
+    ):
+        self.mode = mode
+        self.concurrency = concurrency
+        self.requests = len(latencies) + errors
+        self.errors = errors
+        self.elapsed = elapsed
+        self.throughput = self.requests / elapsed if elapsed else 0.0
+        if latencies:
+            self.p50, self.p99 = np.percentile(latencies, [50, 99]).tolist()
+        else:
+            self.p50 = self.p99 = float("nan")
+
+    def as_dict(self) -> dict:
+        return {"mode": self.mode, "concurrency": self.concurrency,
+                "requests": self.requests, "errors": self.errors,
+                "elapsed": self.elapsed, "throughput": self.throughput,
+                "p50": self.p50, "p99": self.p99}
+
+    def __str__(self) -> str:
+        return (f"{self.mode} x{self.concurrency}: {self.throughput:.1f} req/s, "
+                f"p50={self.p50 * 1000:.1f}ms p99={self.p99 * 1000:.1f}ms, "
+                f"errors={self.errors}/{self.requests}")
+
+
+def _timed_calls(
+        cg: CoinglassAPI,
+        method: str,
+        kwargs: dict,
+        count: int
+) -> tuple[list[float], int]:
+    latencies, errors = [], 0
+    call = getattr(cg, method)
+    for _ in range(count):
+        start = time.perf_counter()
+        try:
+            call(**kwargs)
+        except Exception:
+            errors += 1
+        else:
+            latencies.append(time.perf_counter() - start)
+    return latencies, errors
+
+
+def _process_worker(
+        base_url: str,
+        secret: str,
+        method: str,
+        kwargs: dict,
+        count: int
+) -> tuple[list[float], int]:
+    cg = CoinglassAPI(coinglass_secret=secret, base_url=base_url)
+    try:
+        return _timed_calls(cg, method, kwargs, count)
+    finally:
+        cg.close()
+
+
+def _split(total: int, parts: int) -> list[int]:
+    return [total // parts + (i < total % parts) for i in range(parts)]
+
+
+def run_load(
+        base_url: str,
+        method: str = "perpetual_market",
+        kwargs: dict | None = None,
+        requests: int = 1000,
+        concurrency: int = 8,
+        mode: str = "thread",
+        secret: str = "mock",
+        client_kwargs: dict | None = None
+) -> LoadTestResult:
+    """
+    Drive a CoinglassAPI method concurrently and measure throughput and latency
+
+    Args:
+        base_url: API root, usually MockCoinglassServer.url
+        method: client method to call (default: perpetual_market)
+        kwargs: keyword arguments for the method (default: symbol=BTC)
+        requests: total number of calls (default: 1000)
+        concurrency: number of threads or processes (default: 8)
+        mode: thread or process (default: thread)
+        secret: API key sent to the server (default: mock)
+        client_kwargs: extra CoinglassAPI arguments for thread mode
+
+    Returns:
+        LoadTestResult
+    """
+    kwargs = {"symbol": "BTC"} if kwargs is None else kwargs
+    counts = _split(requests, concurrency)
+
+    start = time.perf_counter()
+    if mode == "process":
+        with ProcessPoolExecutor(max_workers=concurrency) as pool:
+            futures = [pool.submit(_process_worker, base_url, secret, method, kwargs, n)
+                       for n in counts]
+            results = [future.result() for future in futures]
+    else:
+        cg = CoinglassAPI(coinglass_secret=secret, base_url=base_url,
+                          **(client_kwargs or {}))
+        try:
+            if mode == "thread":
+                with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                    results = list(pool.map(
+                        lambda n: _timed_calls(cg, method, kwargs, n), counts
+                    ))
+            else:
+                raise ValueError(f"Unknown mode '{mode}'")
+        finally:
+            cg.close()
+    elapsed = time.perf_counter() - start
+
+    latencies = [lat for lats, _ in results for lat in lats]
+    errors = sum(err for _, err in results)
+    return LoadTestResult(mode, concurrency, latencies, errors, elapsed)
+
+
+def sweep(
+        base_url: str,
+        concurrencies: list[int],
+        modes: tuple[str, ...] = ("thread", "process"),
+        **kwargs
+) -> pd.DataFrame:
+    """ Run run_load for every mode and concurrency, one row per run """
+    rows = [run_load(base_url, concurrency=c, mode=mode, **kwargs).as_dict()
+            for mode in modes for c in concurrencies]
+    return pd.DataFrame(rows).set_index(["mode", "concurrency"])
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Load test CoinglassAPI against a local mock server"
+    )
+    parser.add_argument("--method", default="perpetual_market")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--modes", nargs="+", default=["thread", "process"])
+    parser.add_argument("--latency", type=float, default=0.01)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--requests-per-minute", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    with MockCoinglassServer(
+            latency=args.latency,
+            latency_jitter=args.jitter,
+            rows=args.rows,
+            error_rate=args.error_rate,
+            requests_per_minute=args.requests_per_minute
+    ) as server:
+        print(sweep(server.url, args.concurrency, tuple(args.modes),
+                    method=args.method, requests=args.requests).to_string())
+
+
+if __name__ == "__main__":
+    main()
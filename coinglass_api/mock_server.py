@@ -0,0 +1,394 @@
+import json
+import math
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from .intervals import interval_to_ms
+
+_EXCHANGES = [
+    "Binance", "OKX", "dYdX", "Bitget", "Bybit", "BingX", "Bitmex", "Bitfinex",
+    "Deribit", "CoinEx", "Kraken", "Huobi"
+]
+_DAY_MS = 86_400_000
+
+
+def _value(t: int, scale: float = 1.0, phase: int = 0) -> float:
+    """ Deterministic pseudo market value for a timestamp """
+    return round(scale * (1.5 + math.sin(t / 3.6e7 + phase)), 6)
+
+
+def _pair(exchange: str, symbol: str) -> str:
+    return f"{symbol}-USD" if exchange == "dYdX" else f"{symbol}USDT"
+
+
+def _bar_times(params: dict, rows: int, default_interval: str = "h1") -> list[int]:
+    """ Bar open times on the interval grid, honouring limit/start/end """
+    step = interval_to_ms(params.get("interval", default_interval))
+    limit = int(params.get("limit", rows))
+    if "start_time" in params:
+        start = -(-int(params["start_time"]) // step) * step
+        end = int(params.get("end_time", time.time() * 1000))
+        count = max(0, min(limit, (end - start) // step + 1))
+        return [start + i * step for i in range(count)]
+
+    end = int(params.get("end_time", time.time() * 1000)) // step * step
+    return [end - (limit - 1 - i) * step for i in range(limit)]
+
+
+def _day_times(rows: int) -> list[int]:
+    today = int(time.time() * 1000) // _DAY_MS * _DAY_MS
+    return [today - (rows - 1 - i) * _DAY_MS for i in range(rows)]
+
+
+def _date(t: int, fmt: str = "%Y-%m-%d") -> str:
+    return datetime.fromtimestamp(t / 1000, tz=timezone.utc).strftime(fmt)
+
+
+def _market(params: dict, rows: int) -> dict:
+    symbol = params.get("symbol", "BTC")
+    return {symbol: [
+        {"exchangeName": ex, "symbol": symbol, "originalSymbol": _pair(ex, symbol),
+         "price": 30000.0 + i, "openInterest": 1e9 / (i + 1),
+         "openInterestAmount": 3e4 / (i + 1), "fundingRate": 0.0001 * (i + 1),
+         "totalVolUsd": 5e9 / (i + 1), "longRate": 50.0 + i, "shortRate": 50.0 - i}
+        for i, ex in enumerate(_EXCHANGES)
+    ]}
+
+
+def _funding_snapshot(params: dict, rows: int) -> list[dict]:
+    return [
+        {"symbol": symbol,
+         "uMarginList": [{"exchangeName": ex, "rate": 0.0001 * (i + 1)}
+                         for i, ex in enumerate(_EXCHANGES)],
+         "cMarginList": [{"exchangeName": ex, "rate": 0.0002 * (i + 1)}
+                         for i, ex in enumerate(_EXCHANGES)]}
+        for symbol in ("BTC", "ETH", "SOL")
+    ]
+
+
+def _date_list_history(params: dict, rows: int) -> dict:
+    times = _day_times(rows)
+    return {
+        "dateList": times,
+        "priceList": [_value(t, 30000) for t in times],
+        "dataMap": {ex: [_value(t, 1e6, i) for t in times]
+                    for i, ex in enumerate(_EXCHANGES)},
+    }
+
+
+def _exchange_rows(**columns: Callable[[int], float]) -> Callable[[dict, int], list]:
+    def build(params: dict, rows: int) -> list[dict]:
+        return [{"exchangeName": ex, "symbol": params.get("symbol", "BTC"),
+                 **{name: fn(i) for name, fn in columns.items()}}
+                for i, ex in enumerate(_EXCHANGES)]
+    return build
+
+
+def _nested_exchange_list(list_key: str) -> Callable[[dict, int], list]:
+    def build(params: dict, rows: int) -> list[dict]:
+        keys = _day_times(3) if list_key == "createTime" else ["BTC", "ETH", "SOL"]
+        return [
+            {list_key: key,
+             "list": [{"exchangeName": ex, "longRate": 50.0 + i, "shortRate": 50.0 - i,
+                       "longVolUsd": 1e6 * i, "shortVolUsd": 1e6 * (i + 1),
+                       "buyQty": 1e3 * i, "sellQty": 1e3 * (i + 1)}
+                      for i, ex in enumerate(_EXCHANGES)]}
+            for key in keys
+        ]
+    return build
+
+
+def _bars(time_col: str, **columns: Callable[[int], float]) -> Callable:
+    def build(params: dict, rows: int) -> list[dict]:
+        return [{time_col: t, **{name: fn(t) for name, fn in columns.items()}}
+                for t in _bar_times(params, rows)]
+    return build
+
+
+def _ohlc(params: dict, rows: int) -> list[dict]:
+    return [{"t": t, "o": _value(t), "h": _value(t) + 0.1, "l": _value(t) - 0.1,
+             "c": _value(t, phase=1)} for t in _bar_times(params, rows)]
+
+
+def _ratio_bars(time_col: str) -> Callable:
+    return _bars(time_col, longRatio=lambda t: _value(t, 50),
+                 shortRatio=lambda t: 100 - _value(t, 50),
+                 longShortRatio=lambda t: _value(t))
+
+
+def _liquidation_bars(time_col: str) -> Callable:
+    return _bars(time_col, volUsd=lambda t: _value(t, 2e6),
+                 buyVolUsd=lambda t: _value(t, 1e6),
+                 sellVolUsd=lambda t: _value(t, 1e6, 1))
+
+
+def _daily(time_col: str, time_fmt: str | None = None, as_str: bool = False,
+           **columns: Callable[[int], float]) -> Callable:
+    def build(params: dict, rows: int) -> list[dict]:
+        out = []
+        for t in _day_times(rows):
+            row = {time_col: _date(t, time_fmt) if time_fmt else t}
+            for name, fn in columns.items():
+                row[name] = str(fn(t)) if as_str else fn(t)
+            out.append(row)
+        return out
+    return build
+
+
+def _long_short_history(params: dict, rows: int) -> dict:
+    times = _bar_times(params, rows, default_interval=params.get("time_type", "h1"))
+    return {"dateList": times,
+            "longRateList": [_value(t, 50) for t in times],
+            "shortRateList": [100 - _value(t, 50) for t in times],
+            "priceList": [_value(t, 30000) for t in times],
+            "buyQty": [_value(t, 1e3) for t in times],
+            "sellQty": [_value(t, 1e3, 1) for t in times]}
+
+
+def _basis_chart(params: dict, rows: int) -> list[dict]:
+    return [{"exName": ex,
+             "PERPETUAL": {"name": f"{ex} perpetual", "basis": 0.01 * i},
+             "QUARTER": {"name": f"{ex} quarter", "basis": 0.02 * i}}
+            for i, ex in enumerate(_EXCHANGES[:5])]
+
+
+def _option_history(params: dict, rows: int) -> dict:
+    data = _date_list_history(params, rows)
+    data["dataMap"] = {ex: data["dataMap"][ex] for ex in ("Deribit", "OKX", "Binance")}
+    data["dataMap"]["CME"] = [_value(t, 1e5) for t in data["dateList"]]
+    return data
+
+
+def _log_log_regression(params: dict, rows: int) -> list[list]:
+    return [[t, _value(t, 30000), _value(t, 20000, 1)] for t in _day_times(rows)]
+
+
+def _grayscale(params: dict, rows: int) -> dict:
+    times = _day_times(rows)
+    return {"dateList": times,
+            "markerPriceList": [_value(t, 20) for t in times],
+            "premiumRateList": [_value(t, 0.1) for t in times],
+            "priceList": [_value(t, 30000) for t in times]}
+
+
+FIXTURES: dict[str, Callable[[dict, int], object]] = {
+    "perpetual_market": _market,
+    "futures_market": _market,
+    "funding": _funding_snapshot,
+    "funding_usd_history": _date_list_history,
+    "funding_coin_history": _date_list_history,
+    "open_interest": _exchange_rows(
+        openInterest=lambda i: 1e9 / (i + 1),
+        openInterestAmountByStableCoinMargin=lambda i: 1e4 * i,
+        h4OIChangePercent=lambda i: 0.1 * i),
+    "open_interest_history": _date_list_history,
+    "option": _exchange_rows(openInterest=lambda i: 1e8 / (i + 1),
+                             rate=lambda i: 0.1 * i, h24Change=lambda i: 0.01 * i),
+    "option_history": lambda params, rows: [_option_history(params, rows)],
+    "option/vol/history": _option_history,
+    "liquidation_top": _exchange_rows(number=lambda i: 10 * i, amount=lambda i: 1e4 * i,
+                                      longVolUsd=lambda i: 1e5 * i,
+                                      shortVolUsd=lambda i: 2e5 * i),
+    "liqMap": lambda params, rows: {"prices": [30000 + i for i in range(rows)]},
+    "liquidation_info": lambda params, rows: {
+        "h1TotalVolUsd": 1e6, "h1Amount": 100,
+        "h24TotalVolUsd": 2e7, "h24Amount": 2000},
+    "liquidation_ex": _exchange_rows(longRate=lambda i: 50.0 + i,
+                                     shortRate=lambda i: 50.0 - i,
+                                     totalVolUsd=lambda i: 1e6 * i),
+    "liquidation_history": _nested_exchange_list("createTime"),
+    "long_short": _nested_exchange_list("symbol"),
+    "long_short_history": _long_short_history,
+    "futures_coins_markets": lambda params, rows: [
+        {"symbol": symbol, "exchangeName": "Binance", "price": 1.0 + i,
+         "avgFundingRate": 0.0001 * i, "avgFundingRateByVol": 0.0002 * i}
+        for i, symbol in enumerate(("BTC", "ETH", "SOL"))],
+    "futures_coins_price_change": _exchange_rows(priceChangePercent=lambda i: 0.1 * i),
+    "futures_basis_chart": _basis_chart,
+    "futures_vol": _date_list_history,
+    "indicator/funding": _bars(
+        "createTime", exchangeName=lambda t: "Binance", symbol=lambda t: "BTC",
+        quoteCurrency=lambda t: "USDT", fundingRate=lambda t: _value(t, 1e-4)),
+    "indicator/funding_ohlc": _ohlc,
+    "indicator/funding_avg": _bars("createTime", fundingRate=lambda t: _value(t, 1e-4)),
+    "indicator/open_interest_ohlc": _ohlc,
+    "indicator/open_interest_aggregated_ohlc": _ohlc,
+    "indicator/liquidation_symbol": _liquidation_bars("createTime"),
+    "indicator/liquidation_pair": _liquidation_bars("t"),
+    "indicator/long_short_accounts": _ratio_bars("createTime"),
+    "indicator/long_short_symbol": _ratio_bars("t"),
+    "indicator/top_long_short_account_ratio": _ratio_bars("createTime"),
+    "indicator/top_long_short_position_ratio": _ratio_bars("createTime"),
+    "index/bitcoin_bubble_index": _daily("time", "%Y-%m-%d", index=lambda t: _value(t),
+                                         price=lambda t: _value(t, 30000)),
+    "index/ahr999": _daily("date", "%Y/%m/%d", ahr999=lambda t: _value(t),
+                           avg=lambda t: _value(t, 25000),
+                           value=lambda t: _value(t, 2)),
+    "index/tow_year_MA_multiplier": _daily(
+        "createTime", price=lambda t: _value(t, 30000),
+        mA730=lambda t: _value(t, 20000), mA730Mu5=lambda t: _value(t, 100000)),
+    "index/tow_hundred_week_moving_avg_heatmap": _daily(
+        "createTime", price=lambda t: _value(t, 30000),
+        mA1440=lambda t: _value(t, 15000)),
+    "index/puell_multiple": _daily("createTime", price=lambda t: _value(t, 30000),
+                                   puellMultiple=lambda t: _value(t)),
+    "index/stock_flow": _daily("createTime", "%Y-%m-%d",
+                               price=lambda t: _value(t, 30000),
+                               stockFlow365dAverage=lambda t: _value(t, 50),
+                               nextHalving=lambda t: 200),
+    "index/pi": _daily("createTime", as_str=True, price=lambda t: _value(t, 30000),
+                       ma110=lambda t: _value(t, 28000),
+                       ma350Mu2=lambda t: _value(t, 40000)),
+    "index/golden_ratio_multiplier": _daily(
+        "createTime", as_str=True, price=lambda t: _value(t, 30000),
+        **{"3LowBullHigh": lambda t: _value(t, 60000)},
+        x8=lambda t: _value(t, 90000), x21=lambda t: _value(t, 200000)),
+    "index/bitcoin_profitable_days": _daily("createTime", side=lambda t: 1,
+                                            price=lambda t: _value(t, 30000)),
+    "index/log_log_regression": _log_log_regression,
+    "index/grayscale_market_history": _grayscale,
+}
+
+
+class MockCoinglassServer:
+    """ Local HTTP stand-in for the Coinglass v2 public API """
+
+    def __init__(
+            self,
+            latency: float = 0.0,
+            latency_jitter: float = 0.0,
+            rows: int = 500,
+            error_rate: float = 0.0,
+            requests_per_minute: int | None = None,
+            valid_keys: Iterable[str] | None = None,
+            host: str = "127.0.0.1",
+            port: int = 0,
+            seed: int | None = None
+    ):
+        """
+        Args:
+            latency: base response latency in seconds (default: 0)
+            latency_jitter: uniform random latency added on top in seconds (default: 0)
+            rows: number of rows returned by history endpoints without a limit
+                (default: 500)
+            error_rate: fraction of requests answered with an API error (default: 0)
+            requests_per_minute: answer with code 50001 above this request rate
+                per API key, None disables rate limiting (default: None)
+            valid_keys: reject other keys with code 30001, None accepts any key
+            host: interface to bind (default: 127.0.0.1)
+            port: port to bind, 0 picks a free port (default: 0)
+            seed: seed for latency jitter and error injection
+        """
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.rows = rows
+        self.error_rate = error_rate
+        self.requests_per_minute = requests_per_minute
+        self.valid_keys = set(valid_keys) if valid_keys is not None else None
+        self.requests = 0
+        self.rate_limited = 0
+        self.errors = 0
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._recent: dict[str, deque[float]] = {}
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """ Base URL to pass to CoinglassAPI(base_url=...) """
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/public/v2/"
+
+    def start(self) -> "MockCoinglassServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="coinglass-mock", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "MockCoinglassServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def respond(
+            self,
+            endpoint: str,
+            params: dict,
+            secret: str = ""
+    ) -> tuple[int, dict]:
+        """ Build the (HTTP status, JSON body) answer for a request """
+        if self.valid_keys is not None and secret not in self.valid_keys:
+            return 200, {"code": "30001", "msg": "API key invalid", "success": False}
+
+        with self._lock:
+            self.requests += 1
+            now = time.monotonic()
+            limited = False
+            if self.requests_per_minute is not None:
+                recent = self._recent.setdefault(secret, deque())
+                while recent and now - recent[0] > 60:
+                    recent.popleft()
+                limited = len(recent) >= self.requests_per_minute
+                if not limited:
+                    recent.append(now)
+            failed = not limited and self._random.random() < self.error_rate
+            delay = self.latency + self._random.random() * self.latency_jitter
+            self.rate_limited += limited
+            self.errors += failed
+
+        if delay:
+            time.sleep(delay)
+        if limited:
+            return 200, {"code": "50001", "msg": "Too Many Requests", "success": False}
+        if failed:
+            return 500, {"status": 500, "error": "Internal Server Error"}
+
+        fixture = FIXTURES.get(endpoint)
+        if fixture is None:
+            return 404, {"status": 404, "error": "Not Found"}
+        return 200, {"code": "0", "msg": "success",
+                     "data": fixture(params, self.rows), "success": True}
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                parts = urlsplit(self.path)
+                endpoint = parts.path.removeprefix("/public/v2/")
+                status, body = server.respond(
+                    endpoint,
+                    dict(parse_qsl(parts.query)),
+                    self.headers.get("coinglassSecret", "")
+                )
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        return Handler
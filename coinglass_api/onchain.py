@@ -0,0 +1,125 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from .api import CoinglassAPI
+from .context import submit_in_context
+from .schema import detect_time_format
+
+DAY_MS = 86_400_000
+
+INDEX_METHODS = (
+    "bitcoin_bubble_index",
+    "ahr999",
+    "tow_year_ma_multiplier",
+    "tow_hundred_week_moving_avg_heatmap",
+    "puell_multiple",
+    "stock_flow",
+    "pi",
+    "golden_ratio_multiplier",
+    "bitcoin_profitable_days",
+    "log_log_regression",
+)
+
+
+def to_daily(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Index a frame by calendar day, keeping the last row of each day
+
+    Frames without a DatetimeIndex, e.g. log_log_regression, are indexed by
+    their first column when it holds epoch timestamps
+    """
+    if not isinstance(df.index, pd.DatetimeIndex):
+        first = df.columns[0] if len(df.columns) else None
+        detected = None if first is None else detect_time_format(
+            df[first].to_numpy(), None)
+        if detected is None or detected[0] != "unit":
+            raise ValueError("Frame has no time index to align on")
+        df = df.set_index(pd.to_datetime(df[first], unit=detected[1])).drop(
+            columns=[first])
+        df.index.name = "time"
+
+    if df.index.tz is not None:
+        df = df.tz_convert("UTC").tz_localize(None)
+    days = df.index.normalize()
+    df = df.set_axis(days)
+    df = df[~days.duplicated(keep="last")]
+    return df.sort_index()
+
+
+class OnChainIndexes:
+    """
+    Fetch the on-chain index endpoints concurrently and align them on one daily
+    index, cached until the next daily close
+    """
+
+    def __init__(
+            self,
+            cg: CoinglassAPI,
+            methods: tuple[str, ...] = INDEX_METHODS,
+            close_hour: int = 0,
+            max_workers: int | None = None
+    ):
+        """
+        Args:
+            cg: client, its rate limiter or scheduler still paces the calls
+            methods: index methods to fetch (default: INDEX_METHODS)
+            close_hour: UTC hour of the daily close the data updates at
+                (default: 0)
+            max_workers: number of concurrent calls (default: one per method)
+        """
+        for method in methods:
+            if method not in INDEX_METHODS:
+                raise ValueError(f"Unknown index method '{method}'")
+        self.cg = cg
+        self.methods = tuple(methods)
+        self.close_hour = close_hour
+        self.max_workers = max_workers
+        self.expires = 0.0
+        self._frame: pd.DataFrame | None = None
+        self._lock = threading.Lock()
+
+    def next_close(self, now: float | None = None) -> float:
+        """ Epoch seconds of the next daily close after now """
+        now_ms = int((time.time() if now is None else now) * 1000)
+        offset = self.close_hour * 3_600_000
+        return ((now_ms - offset) // DAY_MS + 1) * DAY_MS / 1000 + offset / 1000
+
+    def get(self, refresh: bool = False) -> pd.DataFrame:
+        """
+        All index frames on one daily DatetimeIndex
+
+        Args:
+            refresh: fetch again even if the cached frame is still valid
+                (default: False)
+
+        Returns:
+            pandas DataFrame with (method, column) MultiIndex columns
+        """
+        # Concurrent callers wait for one fetch instead of each fetching
+        with self._lock:
+            if not refresh and self._frame is not None and time.time() < self.expires:
+                return self._frame.copy()
+
+            def fetch(method: str) -> pd.DataFrame:
+                return to_daily(getattr(self.cg, method)())
+
+            with ThreadPoolExecutor(
+                    max_workers=self.max_workers or len(self.methods)) as pool:
+                futures = [submit_in_context(pool, fetch, method)
+                           for method in self.methods]
+                frames = [future.result() for future in futures]
+
+            # concat aligns all indexes in one pass instead of chaining joins
+            self._frame = pd.concat(frames, axis=1, keys=list(self.methods),
+                                    join="outer").sort_index()
+            self.expires = self.next_close()
+            return self._frame.copy()
+
+    def clear(self) -> None:
+        """ Drop the cached frame """
+        with self._lock:
+            self._frame = None
+            self.expires = 0.0
@@ -0,0 +1,150 @@
+import contextvars
+import functools
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import ContextDecorator, contextmanager, nullcontext
+
+import pandas as pd
+
+PHASES = ("rate_limit", "network", "decode", "build")
+
+_profiler: contextvars.ContextVar["Profiler | None"] = \
+    contextvars.ContextVar("coinglass_profiler", default=None)
+_call: contextvars.ContextVar["CallProfile | None"] = \
+    contextvars.ContextVar("coinglass_profiled_call", default=None)
+
+
+class CallProfile:
+    """ Time spent per phase by one API call """
+
+    __slots__ = ("base_memory", "end", "endpoint", "in_phase", "peak_memory",
+                 "phases", "start")
+
+    def __init__(self, endpoint: str, trace_memory: bool):
+        self.endpoint = endpoint
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.in_phase = False
+        self.peak_memory: int | None = None
+        self.base_memory = 0
+        if trace_memory:
+            tracemalloc.reset_peak()
+            self.base_memory = tracemalloc.get_traced_memory()[0]
+            self.peak_memory = 0
+        self.start = self.end = time.perf_counter()
+
+    @property
+    def total(self) -> float:
+        return self.end - self.start
+
+    def as_dict(self) -> dict:
+        return {"endpoint": self.endpoint, "total": self.total, **self.phases,
+                "other": max(0.0, self.total - sum(self.phases.values())),
+                "peak_memory": self.peak_memory}
+
+
+class Profiler(ContextDecorator):
+    """
+    Record every API call made inside a with block or decorated function,
+    split into rate limit wait, network, JSON decode and DataFrame build time
+    """
+
+    def __init__(self, trace_memory: bool = False, print_summary: bool = False):
+        """
+        Args:
+            trace_memory: record the peak traced memory of each call with
+                tracemalloc, slows calls down noticeably (default: False)
+            print_summary: print the summary table on exit (default: False)
+        """
+        self.trace_memory = trace_memory
+        self.print_summary = print_summary
+        self.calls: list[CallProfile] = []
+        self._tokens: list[tuple[contextvars.Token, contextvars.Token]] = []
+        self._started_tracing = False
+
+    def __enter__(self) -> "Profiler":
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._tokens.append((_profiler.set(self), _call.set(None)))
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        profiler_token, call_token = self._tokens.pop()
+        _call.reset(call_token)
+        _profiler.reset(profiler_token)
+        if not self._tokens:
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+            if self.print_summary:
+                print(self, file=sys.stderr)
+
+    def begin(self, endpoint: str) -> None:
+        call = CallProfile(endpoint, self.trace_memory and tracemalloc.is_tracing())
+        self.calls.append(call)
+        _call.set(call)
+
+    def frame(self) -> pd.DataFrame:
+        """ One row per recorded call, times in seconds, memory in bytes """
+        columns = ["endpoint", "total", *PHASES, "other", "peak_memory"]
+        return pd.DataFrame([call.as_dict() for call in self.calls], columns=columns)
+
+    def summary(self) -> pd.DataFrame:
+        """ Per-endpoint call count, mean time per phase and max peak memory """
+        df = self.frame()
+        grouped = df.groupby("endpoint")
+        summary = grouped[["total", *PHASES, "other"]].mean()
+        summary.insert(0, "calls", grouped.size())
+        summary["peak_memory"] = grouped["peak_memory"].max()
+        return summary.sort_values("total", ascending=False)
+
+    def __str__(self) -> str:
+        if not self.calls:
+            return "No API calls recorded"
+        summary = self.summary()
+        times = summary.columns.drop(["calls", "peak_memory"])
+        summary[times] = summary[times] * 1000
+        return "Mean time per call in ms\n" + summary.to_string(float_format="%.2f")
+
+
+def begin_call(endpoint: str) -> None:
+    """ Start recording a call if a profiler is active """
+    profiler = _profiler.get()
+    if profiler is not None:
+        profiler.begin(endpoint)
+
+
+@contextmanager
+def _timed(call: CallProfile, name: str) -> Iterator[None]:
+    call.in_phase = True
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        call.end = time.perf_counter()
+        call.phases[name] += call.end - start
+        call.in_phase = False
+        if call.peak_memory is not None and tracemalloc.is_tracing():
+            peak = tracemalloc.get_traced_memory()[1] - call.base_memory
+            call.peak_memory = max(call.peak_memory, peak)
+
+
+def phase(name: str):
+    """ Attribute the time of a with block to a phase of the current call """
+    call = _call.get()
+    if call is None or call.in_phase:
+        return nullcontext()
+    return _timed(call, name)
+
+
+def profiled(name: str) -> Callable[[Callable], Callable]:
+    """ Attribute the time of a function to a phase of the current call """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,252 @@
+import io
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+from .api import CoinglassAPI
+from .cache import parse_request_key, request_key
+from .cli import dump_frame, missing_engine
+from .endpoints import FRAME_METHODS
+from .exceptions import CoinglassAPIError, CoinglassRequestError
+
+PREFIX = "/public/v2/"
+CONTENT_TYPES = {
+    "json": "application/json",
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.file",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class _ProxyResponses:
+    """ Journal stand-in that serves a client's requests through the proxy """
+
+    replaying = True
+
+    def __init__(self, proxy: "CachingProxy"):
+        self._proxy = proxy
+
+    def response(self, key: str) -> dict:
+        return self._proxy.response(key)
+
+
+class CachingProxy:
+    """
+    Local HTTP server mirroring the /public/v2/ paths of the Coinglass API,
+    so any number of consumers share one client's cache and rate budget
+    """
+
+    def __init__(
+            self,
+            cg: CoinglassAPI,
+            ttl: float = 60.0,
+            maxsize: int = 1024,
+            host: str = "127.0.0.1",
+            port: int = 0
+    ):
+        """
+        Args:
+            cg: client making the upstream requests, its rate limiter, key pool
+                and disk cache apply to every consumer
+            ttl: seconds a response is served from the cache (default: 60)
+            maxsize: maximum number of cached requests (default: 1024)
+            host: interface to bind (default: 127.0.0.1)
+            port: port to bind, 0 picks a free port (default: 0)
+        """
+        self.cg = cg
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.requests = 0
+        self.upstream = 0
+
+        # (kind, request key) -> (time stored, response or encoded body)
+        self._entries: OrderedDict[tuple[str, str], tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+        # Builds frames from cached responses, never calls the API itself
+        self._parser = CoinglassAPI(coinglass_secret="",
+                                    journal=_ProxyResponses(self))
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """ Base URL for consumers, e.g. CoinglassAPI(base_url=...) """
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{PREFIX}"
+
+    def start(self) -> "CachingProxy":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="coinglass-proxy", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+        self._parser.close()
+
+    def __enter__(self) -> "CachingProxy":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _single_flight(
+            self,
+            key: tuple[str, str],
+            load: Callable[[], tuple[Any, bool]]
+    ) -> Any:
+        """
+        Cached value of a key, loaded by one thread however many threads ask
+
+        Args:
+            key: (kind, request key), kind is "response" or a body format
+            load: returns the value and whether it may be cached
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[0] <= self.ttl:
+                self._entries.move_to_end(key)
+                return entry[1]
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+
+        if not leader:
+            return future.result()
+
+        try:
+            value, keep = load()
+            with self._lock:
+                if keep:
+                    self._entries[key] = (time.time(), value)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.maxsize:
+                        self._entries.popitem(last=False)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def response(self, key: str) -> dict:
+        """ Decoded JSON response of a request key """
+
+        def load() -> tuple[dict, bool]:
+            endpoint, params = parse_request_key(key)
+            response = self.cg._get(endpoint, params)
+            with self._lock:
+                self.upstream += 1
+            return response, CoinglassAPI._is_fresh(response)
+
+        return self._single_flight(("response", key), load)
+
+    def body(self, endpoint: str, params: dict, fmt: str = "json") -> bytes:
+        """
+        Encoded response of a request
+
+        Args:
+            endpoint: API path below /public/v2/, e.g. indicator/funding_ohlc
+            params: query parameters
+            fmt: json, or csv, arrow or parquet for the frame the client
+                method of the endpoint returns (default: json)
+
+        Returns:
+            response body in the requested format
+        """
+        key = request_key(endpoint, params)
+
+        def load_json() -> tuple[bytes, bool]:
+            response = self.response(key)
+            # Cached only if the response is, failed responses are not
+            with self._lock:
+                keep = ("response", key) in self._entries
+            return json.dumps(response, separators=(",", ":")).encode(), keep
+
+        def load_frame() -> tuple[bytes, bool]:
+            method = FRAME_METHODS.get(endpoint)
+            if method is None:
+                raise ValueError(f"'{endpoint}' has no frame, only json is served")
+            # The method fetches its response through response() and raises
+            # for failed responses, so a frame that was built can be cached
+            df = getattr(self._parser, method)(**params)
+            buffer = io.BytesIO()
+            dump_frame(df, buffer, fmt)
+            return buffer.getvalue(), True
+
+        return self._single_flight((fmt, key),
+                                   load_json if fmt == "json" else load_frame)
+
+    def handle(self, path: str, accept: str = "") -> tuple[int, str, bytes]:
+        """ Build the (HTTP status, content type, body) answer for a request """
+        parts = urlsplit(path)
+        if not parts.path.startswith(PREFIX):
+            return _error(404, "Not Found")
+        endpoint = parts.path.removeprefix(PREFIX)
+        params = dict(parse_qsl(parts.query))
+
+        fmt = params.pop("format", None) or next(
+            (fmt for fmt, content_type in CONTENT_TYPES.items()
+             if content_type in accept), "json")
+        if fmt not in CONTENT_TYPES:
+            return _error(406, f"Unknown format '{fmt}'")
+        if missing_engine(fmt):
+            return _error(406, f"{fmt} output needs pyarrow, "
+                               'pip install "coinglass-api[arrow]"')
+
+        with self._lock:
+            self.requests += 1
+        try:
+            return 200, CONTENT_TYPES[fmt], self.body(endpoint, params, fmt)
+        except (TypeError, ValueError) as e:
+            return _error(400, str(e))
+        except (requests.RequestException, CoinglassAPIError,
+                CoinglassRequestError) as e:
+            return _error(502, f"{type(e).__name__}: {e}")
+        except Exception as e:
+            # e.g. a broken pyarrow or an unexpected payload, the consumer
+            # still gets an answer instead of a dropped connection
+            return _error(500, f"{type(e).__name__}: {e}")
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        proxy = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                status, content_type, body = proxy.handle(
+                    self.path, self.headers.get("Accept", ""))
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        return Handler
+
+
+def _error(status: int, message: str) -> tuple[int, str, bytes]:
+    body = {"code": str(status), "msg": message, "success": False}
+    return status, CONTENT_TYPES["json"], json.dumps(body).encode()
@@ -0,0 +1,79 @@
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from .api import CoinglassAPI
+from .context import submit_in_context
+from .endpoints import FRAME_METHODS
+
+QuerySpec = str | tuple[str, dict]
+
+_FRAME_METHODS = frozenset(FRAME_METHODS.values())
+
+
+def _plan(
+        cg: CoinglassAPI,
+        specs: dict[str, QuerySpec],
+        shared: dict
+) -> dict[str, tuple[str, dict]]:
+    """ Resolve each spec to a method and its arguments """
+    plan = {}
+    for name, spec in specs.items():
+        method, kwargs = (spec, {}) if isinstance(spec, str) else spec
+        if method not in _FRAME_METHODS:
+            raise ValueError(f"'{method}' is not an endpoint method returning a "
+                             "DataFrame")
+        func = getattr(cg, method)
+        # Shared arguments only go to the methods that take them, e.g. symbol
+        # to long_short_symbol and ex/pair to long_short_accounts
+        accepted = inspect.signature(func).parameters
+        plan[name] = (method, {**{k: v for k, v in shared.items() if k in accepted},
+                               **kwargs})
+    return plan
+
+
+def query(
+        cg: CoinglassAPI,
+        specs: dict[str, QuerySpec],
+        how: str = "outer",
+        max_workers: int | None = None,
+        **shared
+) -> pd.DataFrame:
+    """
+    Fetch several endpoints concurrently and join them on their time index
+
+    Args:
+        cg: client, its rate limiter or scheduler still paces the calls
+        specs: column prefix -> method name, or (method name, arguments)
+        how: outer or inner join of the time indexes (default: outer)
+        max_workers: number of concurrent calls (default: one per spec)
+        **shared: arguments passed to every method that accepts them
+
+    Returns:
+        pandas DataFrame with (prefix, column) MultiIndex columns
+
+    Example:
+        query(cg, {"accounts": "long_short_accounts",
+                   "symbol": "long_short_symbol",
+                   "top_accounts": "top_long_short_account_ratio",
+                   "top_positions": "top_long_short_position_ratio"},
+              ex="Binance", pair="BTCUSDT", symbol="BTC", interval="h1")
+    """
+    if how not in ("outer", "inner"):
+        raise ValueError("how must be 'outer' or 'inner'")
+    plan = _plan(cg, specs, shared)
+    if not plan:
+        return pd.DataFrame()
+
+    def fetch(item: tuple[str, tuple[str, dict]]) -> pd.DataFrame:
+        _, (method, kwargs) = item
+        return getattr(cg, method)(**kwargs)
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(plan)) as pool:
+        futures = [submit_in_context(pool, fetch, item) for item in plan.items()]
+        frames = [future.result() for future in futures]
+
+    # concat aligns all indexes in one pass instead of chaining joins
+    joined = pd.concat(frames, axis=1, keys=list(plan), join=how, sort=False)
+    return joined.sort_index()
@@ -0,0 +1,169 @@
+import bisect
+import threading
+import time
+
+import pandas as pd
+
+from .api import CoinglassAPI
+from .intervals import interval_to_ms
+
+# Arguments that select a window rather than a series
+_WINDOW_ARGS = ("limit", "start_time", "end_time")
+
+
+class IntervalSet:
+    """ Sorted set of disjoint closed integer intervals """
+
+    def __init__(self):
+        self._starts: list[int] = []
+        self._ends: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __iter__(self):
+        return iter(zip(self._starts, self._ends, strict=True))
+
+    def add(self, start: int, end: int) -> None:
+        """ Add [start, end], merging overlapping and adjacent intervals """
+        if end < start:
+            return
+        # First interval that ends at or after start - 1 and last one that
+        # starts at or before end + 1 are merged with the new one
+        lo = bisect.bisect_left(self._ends, start - 1)
+        hi = bisect.bisect_right(self._starts, end + 1)
+        if lo < hi:
+            start = min(start, self._starts[lo])
+            end = max(end, self._ends[hi - 1])
+        self._starts[lo:hi] = [start]
+        self._ends[lo:hi] = [end]
+
+    def missing(self, start: int, end: int) -> list[tuple[int, int]]:
+        """ Sub-ranges of [start, end] not covered by the set """
+        gaps = []
+        i = bisect.bisect_left(self._ends, start)
+        while start <= end:
+            if i == len(self._starts) or self._starts[i] > end:
+                gaps.append((start, end))
+                break
+            if self._starts[i] > start:
+                gaps.append((start, self._starts[i] - 1))
+            start = self._ends[i] + 1
+            i += 1
+        return gaps
+
+    def covers(self, start: int, end: int) -> bool:
+        return not self.missing(start, end)
+
+
+class _Series:
+    __slots__ = ("coverage", "frame", "lock")
+
+    def __init__(self):
+        self.coverage = IntervalSet()
+        self.frame: pd.DataFrame | None = None
+        self.lock = threading.Lock()
+
+
+class RangeCache:
+    """
+    Serve start_time/end_time windows of bar endpoints (funding, funding_ohlc,
+    open_interest_ohlc, liquidation_symbol, ...) from previously fetched bars,
+    requesting only the sub-ranges that are missing
+    """
+
+    def __init__(self, cg: CoinglassAPI, page_size: int = 500):
+        """
+        Args:
+            cg: client used to fetch missing ranges
+            page_size: bars requested per call (default: 500)
+        """
+        self.cg = cg
+        self.page_size = page_size
+        self.requests = 0
+        self.fetched_rows = 0
+        self._series: dict[tuple, _Series] = {}
+        self._lock = threading.Lock()
+
+    def _get_series(self, key: tuple) -> _Series:
+        with self._lock:
+            return self._series.setdefault(key, _Series())
+
+    def _fetch(self, method: str, kwargs: dict, start: int, end: int, step: int,
+               last_closed: int) -> tuple[list[pd.DataFrame], int]:
+        """
+        Pages of [start, end] and the last bar open time they cover: end if
+        every page was full or the last closed bar was received, else the last
+        bar received, so bars the API has not returned yet are asked again
+        """
+        frames = []
+        covered = start - 1
+        while start <= end:
+            limit = min(self.page_size, (end - start) // step + 1)
+            df = getattr(self.cg, method)(**kwargs, limit=limit, start_time=start,
+                                          end_time=end)
+            with self._lock:
+                self.requests += 1
+                self.fetched_rows += len(df)
+            if len(df):
+                frames.append(df)
+                covered = int(df.index[-1].value // 1_000_000)
+            if len(df) < limit:
+                return frames, end if covered + step > last_closed else covered
+            start = covered + step
+        return frames, end
+
+    def get(
+            self,
+            method: str,
+            start_time: int,
+            end_time: int | None = None,
+            **kwargs
+    ) -> pd.DataFrame:
+        """
+        Bars of a window, fetching only what is not cached yet
+
+        Args:
+            method: client method, e.g. funding_ohlc
+            start_time: first bar open time in milliseconds
+            end_time: last bar open time in milliseconds (default: now)
+            **kwargs: series arguments of the method, must include interval
+
+        Returns:
+            pandas DataFrame of the bars opened within [start_time, end_time]
+        """
+        if any(arg in kwargs for arg in _WINDOW_ARGS):
+            raise ValueError("Pass the window as start_time and end_time only")
+        step = interval_to_ms(kwargs["interval"])
+        now = int(time.time() * 1000)
+        end_time = now if end_time is None else end_time
+        # The bar that is still open keeps changing, never mark it as cached
+        last_closed = now // step * step - 1
+
+        series = self._get_series((method, *sorted(kwargs.items())))
+        with series.lock:
+            for gap_start, gap_end in series.coverage.missing(start_time, end_time):
+                frames, covered = self._fetch(method, kwargs, gap_start, gap_end,
+                                              step, last_closed)
+                if frames:
+                    parts = [series.frame, *frames] if series.frame is not None \
+                        else frames
+                    frame = pd.concat(parts)
+                    frame = frame[~frame.index.duplicated(keep="last")]
+                    series.frame = frame.sort_index()
+                series.coverage.add(gap_start, min(covered, last_closed))
+
+            if series.frame is None:
+                return pd.DataFrame()
+            start, end = pd.to_datetime([start_time, end_time], unit="ms")
+            # A copy, the cached frame is replaced and read by other threads
+            return series.frame.loc[start:end].copy()
+
+    def coverage(self, method: str, **kwargs) -> list[tuple[int, int]]:
+        """ Cached [start, end] ranges of a series in milliseconds """
+        series = self._series.get((method, *sorted(kwargs.items())))
+        return [] if series is None else list(series.coverage)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
@@ -0,0 +1,165 @@
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+
+_MAGIC = 0x434752415445  # "CGRATE"
+_HEADER = struct.Struct("<Q")
+_STATE = struct.Struct("<dd")
+
+
+class RateLimiter:
+    """ Thread-safe token bucket to pace requests against the API quota """
+
+    def __init__(self, requests_per_minute: float, burst: float | None = None):
+        """
+        Args:
+            requests_per_minute: sustained request rate allowed by the API key
+            burst: maximum number of requests that can be made back-to-back
+                (default: requests_per_minute)
+        """
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive")
+
+        self.rate = requests_per_minute / 60
+        self.capacity = float(burst if burst is not None else requests_per_minute)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    @property
+    def available(self) -> float:
+        """ Number of tokens currently available """
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def wait_time(self, tokens: float = 1) -> float:
+        """ Seconds until the given number of tokens will be available """
+        with self._lock:
+            self._refill()
+            return max(0.0, (tokens - self._tokens) / self.rate)
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """ Take tokens if they are available right now, never blocks """
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1, timeout: float | None = None) -> bool:
+        """
+        Block until tokens are available
+
+        Args:
+            tokens: number of tokens to take (default: 1)
+            timeout: maximum time to wait in seconds, None waits forever
+
+        Returns:
+            True if tokens were taken, False if the timeout expired
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+class _SharedBucketLock:
+    """ Thread and process lock that loads and stores the shared bucket state """
+
+    def __init__(self, limiter: "SharedRateLimiter"):
+        self._limiter = limiter
+        self._thread_lock = threading.Lock()
+
+    def __enter__(self) -> None:
+        self._thread_lock.acquire()
+        fcntl.flock(self._limiter._fd, fcntl.LOCK_EX)
+        tokens, last = _STATE.unpack_from(self._limiter._map, _HEADER.size)
+        # Clamp in case the writer was ahead of this process' clock reading
+        self._limiter._tokens = tokens
+        self._limiter._last = min(last, time.monotonic())
+
+    def __exit__(self, *exc) -> None:
+        _STATE.pack_into(
+            self._limiter._map, _HEADER.size, self._limiter._tokens, self._limiter._last
+        )
+        fcntl.flock(self._limiter._fd, fcntl.LOCK_UN)
+        self._thread_lock.release()
+
+
+class SharedRateLimiter(RateLimiter):
+    """
+    Token bucket shared by every process on the host that uses the same key,
+    stored in a small memory-mapped file
+    """
+
+    def __init__(
+            self,
+            requests_per_minute: float,
+            burst: float | None = None,
+            key: str = "default",
+            directory: str | None = None
+    ):
+        """
+        Args:
+            requests_per_minute: sustained request rate allowed by the API key
+            burst: maximum number of requests that can be made back-to-back
+                (default: requests_per_minute)
+            key: processes passing the same key share one bucket, usually the
+                Coinglass secret (it is hashed, never written to disk)
+            directory: where the bucket file lives (default: /dev/shm if present,
+                else the temp directory)
+        """
+        super().__init__(requests_per_minute, burst)
+
+        if directory is None:
+            directory = ("/dev/shm" if os.path.isdir("/dev/shm")
+                         else tempfile.gettempdir())
+        digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+        self.path = os.path.join(directory, f"coinglass-ratelimit-{digest}")
+
+        size = _HEADER.size + _STATE.size
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size < size:
+                os.ftruncate(self._fd, size)
+                os.pwrite(
+                    self._fd,
+                    _HEADER.pack(_MAGIC) + _STATE.pack(self.capacity, time.monotonic()),
+                    0
+                )
+            self._map = mmap.mmap(self._fd, size)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+        if _HEADER.unpack_from(self._map)[0] != _MAGIC:
+            raise ValueError(f"{self.path} is not a rate limiter bucket file")
+
+        self._lock = _SharedBucketLock(self)
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
@@ -0,0 +1,175 @@
+from collections.abc import Sequence
+
+import numpy as np
+import pandas as pd
+
+STATS = ("mean", "std", "zscore", "ema", "delta")
+
+
+class RollingStats:
+    """
+    Incremental rolling mean, standard deviation, z-score, EMA and delta for
+    many series at once, updated in O(1) per new bar
+    """
+
+    def __init__(
+            self,
+            columns: Sequence[str],
+            window: int,
+            ema_span: int | None = None
+    ):
+        """
+        Args:
+            columns: names of the tracked series
+            window: number of bars in the rolling window
+            ema_span: span of the exponential moving average (default: window)
+        """
+        self.columns = list(columns)
+        self.window = window
+        self.alpha = 2 / ((ema_span or window) + 1)
+        self.last_time: pd.Timestamp | None = None
+
+        n = len(self.columns)
+        self._buffer = np.full((window, n), np.nan)
+        self._pos = 0
+        self._updates = 0
+        self._count = np.zeros(n)
+        self._sum = np.zeros(n)
+        self._sumsq = np.zeros(n)
+        self._ema = np.full(n, np.nan)
+        self._prev_ema = np.full(n, np.nan)
+        self._last = np.full(n, np.nan)
+        self._prev = np.full(n, np.nan)
+
+    @classmethod
+    def from_history(
+            cls,
+            df: pd.DataFrame,
+            window: int,
+            columns: Sequence[str] | None = None,
+            ema_span: int | None = None
+    ) -> "RollingStats":
+        """
+        Seed an engine from a history frame returned by the client
+        (e.g. funding_ohlc or long_short_accounts)
+
+        Args:
+            df: frame with a DatetimeIndex
+            window: number of bars in the rolling window
+            columns: numeric columns to track (default: all numeric columns)
+            ema_span: span of the exponential moving average (default: window)
+        """
+        if columns is None:
+            columns = df.select_dtypes("number").columns
+        engine = cls(columns, window, ema_span)
+        engine.update_frame(df)
+        return engine
+
+    def _replace(self, slot: int, values: np.ndarray) -> None:
+        old = self._buffer[slot]
+        valid_old, valid_new = ~np.isnan(old), ~np.isnan(values)
+        self._sum += np.where(valid_new, values, 0) - np.where(valid_old, old, 0)
+        self._sumsq += (np.where(valid_new, values ** 2, 0)
+                        - np.where(valid_old, old ** 2, 0))
+        self._count += valid_new.astype(float) - valid_old
+        self._buffer[slot] = values
+
+    def _next_ema(self, ema: np.ndarray, values: np.ndarray) -> np.ndarray:
+        return np.where(
+            np.isnan(ema), values,
+            np.where(np.isnan(values), ema,
+                     self.alpha * values + (1 - self.alpha) * ema)
+        )
+
+    def _push(self, values: np.ndarray) -> None:
+        self._replace(self._pos, values)
+        self._pos = (self._pos + 1) % self.window
+
+        self._prev_ema, self._ema = self._ema, self._next_ema(self._ema, values)
+        self._prev, self._last = self._last, values
+
+        # Resum from the buffer once per window to stop floating point drift
+        self._updates += 1
+        if self._updates % self.window == 0:
+            self._resum()
+
+    def _amend(self, values: np.ndarray) -> None:
+        """ Replace the newest bar, e.g. when an unfinished bar is polled again """
+        self._replace((self._pos - 1) % self.window, values)
+        self._ema = self._next_ema(self._prev_ema, values)
+        self._last = values
+
+    def _resum(self) -> None:
+        valid = ~np.isnan(self._buffer)
+        self._count = valid.sum(axis=0).astype(float)
+        self._sum = np.where(valid, self._buffer, 0).sum(axis=0)
+        self._sumsq = np.where(valid, self._buffer ** 2, 0).sum(axis=0)
+
+    def update(self, values: Sequence[float], time: pd.Timestamp | None = None) -> None:
+        """
+        Add one bar for every series
+
+        Args:
+            values: one value per column, NaN for a missing value
+            time: bar time, a bar with the same time as the last one replaces it
+        """
+        values = np.asarray(values, dtype=float)
+        if time is not None and self.last_time is not None and time == self.last_time:
+            self._amend(values)
+        else:
+            self._push(values)
+        if time is not None:
+            self.last_time = time
+
+    def update_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Apply the bars of a frame that were not seen yet
+
+        Args:
+            df: frame with a DatetimeIndex and the tracked columns
+
+        Returns:
+            statistics after each applied bar, columns are (column, statistic)
+        """
+        if self.last_time is not None:
+            df = df[df.index >= self.last_time]
+
+        values = df[self.columns].to_numpy(dtype=float)
+        rows = np.empty((len(df), len(self.columns) * len(STATS)))
+        for i, time in enumerate(df.index):
+            self.update(values[i], time)
+            rows[i] = np.column_stack([getattr(self, stat) for stat in STATS]).ravel()
+
+        columns = pd.MultiIndex.from_product([self.columns, STATS])
+        return pd.DataFrame(rows, index=df.index, columns=columns)
+
+    @property
+    def mean(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self._sum / self._count
+
+    @property
+    def std(self) -> np.ndarray:
+        """ Sample standard deviation over the window """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            var = (self._sumsq - self._sum ** 2 / self._count) / (self._count - 1)
+        return np.sqrt(np.maximum(var, 0))
+
+    @property
+    def zscore(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (self._last - self.mean) / self.std
+
+    @property
+    def ema(self) -> np.ndarray:
+        return self._ema.copy()
+
+    @property
+    def delta(self) -> np.ndarray:
+        """ Change of the newest bar against the bar before it """
+        return self._last - self._prev
+
+    def snapshot(self) -> pd.DataFrame:
+        """ Current statistics, one row per column """
+        return pd.DataFrame({stat: getattr(self, stat) for stat in STATS},
+                            index=self.columns)
@@ -0,0 +1,181 @@
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from .exceptions import DeadlineExceededError
+from .rate_limit import RateLimiter
+
+PRIORITY_LIVE = 0
+PRIORITY_NORMAL = 1
+PRIORITY_BACKFILL = 2
+
+_request_class: contextvars.ContextVar[tuple[int, str, float | None]] = \
+    contextvars.ContextVar("coinglass_request_class",
+                           default=(PRIORITY_NORMAL, "default", None))
+
+
+class _Ticket:
+    __slots__ = ("closed", "deadline", "event", "expired", "finish", "priority", "seq")
+
+    def __init__(self, priority: int, finish: float, seq: int, deadline: float | None):
+        self.priority = priority
+        self.finish = finish
+        self.seq = seq
+        self.deadline = deadline
+        self.event = threading.Event()
+        self.expired = False
+        self.closed = False
+
+    def __lt__(self, other: "_Ticket") -> bool:
+        return (self.priority, self.finish, self.seq) < \
+            (other.priority, other.finish, other.seq)
+
+
+class RequestScheduler:
+    """
+    Admit requests under a rate budget by priority class, with weighted fair
+    queuing between callers and deadlines for queued requests
+    """
+
+    def __init__(
+            self,
+            rate_limiter: RateLimiter,
+            weights: dict[str, float] | None = None
+    ):
+        """
+        Args:
+            rate_limiter: rate budget shared by everything using the scheduler
+            weights: relative share of each caller within a priority class,
+                callers not listed get weight 1
+        """
+        self.rate_limiter = rate_limiter
+        self.weights = dict(weights or {})
+        self.dispatched = 0
+        self.expired = 0
+
+        self._queue: list[_Ticket] = []
+        self._finish: dict[str, float] = {}
+        self._virtual_time = 0.0
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._dispatch, name="coinglass-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    @staticmethod
+    @contextmanager
+    def context(
+            priority: int = PRIORITY_NORMAL,
+            caller: str = "default",
+            timeout: float | None = None
+    ) -> Iterator[None]:
+        """
+        Set the request class for calls made in this thread or task
+
+        Args:
+            priority: PRIORITY_LIVE, PRIORITY_NORMAL or PRIORITY_BACKFILL
+            caller: name used for fair queuing between callers
+            timeout: drop a queued request after this many seconds
+        """
+        token = _request_class.set((priority, caller, timeout))
+        try:
+            yield
+        finally:
+            _request_class.reset(token)
+
+    def admit(self) -> None:
+        """
+        Block until the current request class may send a request
+
+        Raises:
+            DeadlineExceededError: if the deadline passed while queued
+            RuntimeError: if the scheduler is or was closed while queued
+        """
+        priority, caller, timeout = _request_class.get()
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Scheduler is closed")
+            # Start-time fair queuing: each caller advances its own virtual clock
+            start = max(self._virtual_time, self._finish.get(caller, 0.0))
+            finish = start + 1 / self.weights.get(caller, 1.0)
+            self._finish[caller] = finish
+            ticket = _Ticket(priority, finish, next(self._seq), deadline)
+            heapq.heappush(self._queue, ticket)
+            self._cond.notify()
+
+        ticket.event.wait()
+        if ticket.closed:
+            raise RuntimeError("Scheduler is closed")
+        if ticket.expired:
+            raise DeadlineExceededError()
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            # Release anything still queued so callers don't hang on shutdown
+            for ticket in self._queue:
+                ticket.closed = True
+                ticket.event.set()
+            self._queue.clear()
+            self._cond.notify()
+        self._thread.join()
+
+    def _drop_expired(self, now: float) -> None:
+        expired = [t for t in self._queue
+                   if t.deadline is not None and t.deadline <= now]
+        if not expired:
+            return
+        self._queue = [t for t in self._queue
+                       if t.deadline is None or t.deadline > now]
+        heapq.heapify(self._queue)
+        for ticket in expired:
+            ticket.expired = True
+            ticket.event.set()
+        self.expired += len(expired)
+
+    def _next_deadline(self) -> float | None:
+        deadlines = [t.deadline for t in self._queue if t.deadline is not None]
+        return min(deadlines) if deadlines else None
+
+    def _dispatch(self) -> None:
+        with self._cond:
+            while not self._closed:
+                now = time.monotonic()
+                self._drop_expired(now)
+
+                if not self._queue:
+                    self._cond.wait()
+                    continue
+
+                if self.rate_limiter.try_acquire():
+                    ticket = heapq.heappop(self._queue)
+                    # A live ticket can finish before the backfill tickets sent
+                    # ahead of it, the virtual clock never goes back
+                    if ticket.finish > self._virtual_time:
+                        self._virtual_time = ticket.finish
+                        # Callers whose clock fell behind start from the virtual
+                        # clock anyway, so forgetting them changes nothing
+                        self._finish = {caller: finish for caller, finish
+                                        in self._finish.items()
+                                        if finish > self._virtual_time}
+                    self.dispatched += 1
+                    ticket.event.set()
+                    continue
+
+                wait = self.rate_limiter.wait_time()
+                deadline = self._next_deadline()
+                if deadline is not None:
+                    wait = min(wait, deadline - now)
+                self._cond.wait(timeout=max(wait, 0.001))
@@ -0,0 +1,258 @@
+import threading
+import warnings
+from collections.abc import Sequence
+from datetime import datetime
+from operator import itemgetter
+
+import numpy as np
+import pandas as pd
+
+from .exceptions import CoinglassSchemaWarning
+
+# Date formats tried, in order, for string time columns parsed with unit=None
+TIME_FORMATS = (
+    "%Y-%m-%d",
+    "%Y/%m/%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y/%m/%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M:%SZ",
+)
+
+
+def _epoch_unit(value: float) -> str:
+    """ Guess the unit of an epoch timestamp from its magnitude """
+    value = abs(value)
+    if value >= 1e17:
+        return "ns"
+    if value >= 1e14:
+        return "us"
+    if value >= 1e11:
+        return "ms"
+    return "s"
+
+
+def time_array(times: Sequence) -> np.ndarray:
+    """
+    Time values as an array pandas parses without a copy: int64 for epochs,
+    object for strings (a list or fixed-width string array is converted again
+    inside pd.to_datetime)
+    """
+    if isinstance(times, np.ndarray):
+        return times
+    if len(times) and isinstance(times[0], str):
+        return np.array(times, dtype=object)
+    return np.asarray(times)
+
+
+def detect_time_format(times: Sequence, unit: str | None) -> tuple[str, str] | None:
+    """
+    Detect how a time column is encoded from its first and last value
+
+    Returns:
+        ("unit", epoch unit) or ("format", strftime format), None if the
+        column needs the pandas auto-resolver
+    """
+    if unit is not None:
+        return "unit", unit
+    if not len(times):
+        return None
+
+    samples = (times[0], times[-1])
+    if all(isinstance(v, (int, float, np.number)) and not isinstance(v, bool)
+           for v in samples):
+        return "unit", _epoch_unit(float(samples[0]))
+    if not all(isinstance(v, str) for v in samples):
+        return None
+    if all(v.isdigit() for v in samples):
+        return "unit", _epoch_unit(float(samples[0]))
+    for fmt in TIME_FORMATS:
+        try:
+            for v in samples:
+                datetime.strptime(v, fmt)
+        except ValueError:
+            continue
+        return "format", fmt
+    return None
+
+
+def value_columns(columns: Sequence[str], time_col: str | None) -> list[str]:
+    """
+    Columns kept next to the time index: the time column, a column named
+    "time" and any "t" column are dropped
+    """
+    excluded = {time_col, "time", "t"} if time_col else set()
+    return [col for col in columns if col not in excluded]
+
+
+def monotonic(df: pd.DataFrame) -> pd.DataFrame:
+    """ Return a frame with an increasing index, reversing newest-first data """
+    index = df.index
+    if len(index) < 2 or index.is_monotonic_increasing:
+        return df
+    if index.is_monotonic_decreasing:
+        return df.iloc[::-1]
+    return df.sort_index(kind="stable")
+
+
+class EndpointSchema:
+    """
+    Learned response schema of an endpoint, used to build frames straight
+    from per-column arrays instead of letting pandas infer dtypes row by row
+    """
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.columns: tuple[str, ...] | None = None
+        self.dtypes: dict[str, np.dtype | None] = {}
+        self.time_col: str | None = None
+        self.time_format: tuple[str, str] | None = None
+        self._time_unit: str | None = None
+        # Frames of one endpoint may be built by several threads at once
+        self._lock = threading.Lock()
+
+    @property
+    def learned(self) -> bool:
+        return self.columns is not None
+
+    def reset(self) -> None:
+        with self._lock:
+            self.columns = None
+            self.dtypes = {}
+            self.time_col = None
+            self.time_format = None
+
+    def parse_times(self, times: Sequence, unit: str | None) -> pd.DatetimeIndex:
+        """
+        Parse a time column with the format detected on the first call,
+        falling back to the pandas auto-resolver if it stops matching
+
+        Args:
+            times: raw values of the time column
+            unit: epoch unit passed by the caller, None to detect it
+        """
+        with self._lock:
+            if self.time_format is None or unit != self._time_unit:
+                self.time_format = detect_time_format(times, unit)
+                self._time_unit = unit
+            time_format = self.time_format
+
+        if time_format is not None:
+            kind, value = time_format
+            try:
+                if kind == "unit":
+                    array = np.asarray(times)
+                    if array.dtype.kind not in "iuf":
+                        array = array.astype("int64")
+                    return pd.DatetimeIndex(pd.to_datetime(array, unit=value))
+                return pd.DatetimeIndex(pd.to_datetime(time_array(times),
+                                                        format=value))
+            except (TypeError, ValueError, OverflowError):
+                with self._lock:
+                    if self.time_format == time_format:
+                        self.time_format = None
+        return pd.DatetimeIndex(pd.to_datetime(times, unit=unit))
+
+    def learn(self, data: list[dict], df: pd.DataFrame, time_col: str | None) -> None:
+        """ Record column order and dtypes of a frame built by the generic path """
+        if not data or not isinstance(data[0], dict):
+            return
+        columns = tuple(data[0])
+        dtypes = {}
+        for col in value_columns(columns, time_col):
+            dtype = df[col].dtype
+            numeric = isinstance(dtype, np.dtype) and dtype.kind in "biuf"
+            dtypes[col] = dtype if numeric else None
+        with self._lock:
+            self.columns, self.dtypes, self.time_col = columns, dtypes, time_col
+
+    def _drift(self, reason: str) -> None:
+        warnings.warn(
+            f"Response schema of '{self.endpoint}' changed ({reason}), relearning",
+            CoinglassSchemaWarning,
+            stacklevel=4
+        )
+        self.reset()
+
+    def build(
+            self,
+            data: list[dict],
+            time_col: str | None,
+            unit: str | None
+    ) -> pd.DataFrame | None:
+        """
+        Build a frame from the learned schema
+
+        Returns:
+            pandas DataFrame, or None if the schema is not learned yet or the
+            response no longer matches it
+        """
+        with self._lock:
+            learned_columns, dtypes = self.columns, dict(self.dtypes)
+            learned_time_col = self.time_col
+        if learned_columns is None or not data or not isinstance(data[0], dict) \
+                or time_col != learned_time_col:
+            return None
+
+        # Cheap drift check on the first and last row
+        if tuple(data[0]) != learned_columns or tuple(data[-1]) != learned_columns:
+            self._drift("columns differ")
+            return None
+
+        n = len(data)
+        columns: dict[str, np.ndarray | list] = {}
+        try:
+            for col, dtype in dtypes.items():
+                values = map(itemgetter(col), data)
+                if dtype is None:
+                    columns[col] = list(values)
+                elif dtype.kind == "f":
+                    columns[col] = np.fromiter(values, dtype, count=n)
+                else:
+                    array = np.asarray(list(values))
+                    if array.dtype.kind != dtype.kind:
+                        array = pd.to_numeric(array)
+                    if dtype.kind in "iu" and array.dtype.kind == "f":
+                        # A price of 30000 followed by 30000.5 widens the
+                        # column, it is not a schema change
+                        with self._lock:
+                            if self.dtypes.get(col) is dtype:
+                                self.dtypes[col] = array.dtype
+                    elif array.dtype.kind != dtype.kind:
+                        raise ValueError(col)
+                    columns[col] = array
+
+            index = None
+            if time_col:
+                times = list(map(itemgetter(time_col), data))
+                index = self.parse_times(times, unit).rename("time")
+        except (KeyError, TypeError, ValueError) as e:
+            self._drift(f"unexpected value in {e}")
+            return None
+
+        df = pd.DataFrame(columns, index=index, copy=False)
+        # Only the unit=None index endpoints come newest-first, the others keep
+        # the order of the response as before
+        return monotonic(df) if time_col and unit is None else df
+
+
+class SchemaCache:
+    """ Per-endpoint store of learned response schemas """
+
+    def __init__(self):
+        self._schemas: dict[str, EndpointSchema] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, endpoint: str) -> EndpointSchema:
+        schema = self._schemas.get(endpoint)
+        if schema is None:
+            with self._lock:
+                schema = self._schemas.setdefault(endpoint, EndpointSchema(endpoint))
+        return schema
+
+    def __contains__(self, endpoint: str) -> bool:
+        return endpoint in self._schemas and self._schemas[endpoint].learned
+
+    def clear(self) -> None:
+        with self._lock:
+            self._schemas.clear()
@@ -0,0 +1,119 @@
+import queue
+import threading
+import weakref
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def _new_session(pool_maxsize: int) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class SessionPool:
+    """ Fixed pool of sessions checked out by one thread at a time """
+
+    def __init__(self, size: int = 10):
+        """
+        Args:
+            size: number of sessions, which also bounds concurrent connections
+                (default: 10)
+        """
+        self.size = size
+        self._idle: queue.LifoQueue[requests.Session] = queue.LifoQueue()
+        self._sessions: list[requests.Session] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def session(self) -> Iterator[requests.Session]:
+        try:
+            session = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                created = len(self._sessions) < self.size
+                if created:
+                    session = _new_session(pool_maxsize=1)
+                    self._sessions.append(session)
+            if not created:
+                session = self._idle.get()
+        try:
+            yield session
+        finally:
+            self._idle.put(session)
+
+    @property
+    def created(self) -> int:
+        """ Number of sessions opened so far """
+        return len(self._sessions)
+
+    def close(self) -> None:
+        with self._lock:
+            for session in self._sessions:
+                session.close()
+
+
+class _Holder:
+    """ Thread-local slot, collected together with its thread's locals """
+
+    def __init__(self, session: requests.Session):
+        self.session = session
+
+
+def _release(
+        sessions: set[requests.Session],
+        lock: threading.RLock,
+        session: requests.Session
+) -> None:
+    with lock:
+        sessions.discard(session)
+    session.close()
+
+
+class ThreadLocalSessions:
+    """ One session per thread, all drawing from one connection budget """
+
+    def __init__(self, max_connections: int = 10):
+        """
+        Args:
+            max_connections: maximum number of requests in flight across all
+                threads (default: 10)
+        """
+        self.max_connections = max_connections
+        self.created = 0
+        self._budget = threading.BoundedSemaphore(max_connections)
+        self._local = threading.local()
+        self._sessions: set[requests.Session] = set()
+        # Reentrant, a finalizer may run while this thread holds the lock
+        self._lock = threading.RLock()
+
+    @contextmanager
+    def session(self) -> Iterator[requests.Session]:
+        holder = getattr(self._local, "holder", None)
+        if holder is None:
+            holder = self._local.holder = _Holder(_new_session(pool_maxsize=1))
+            with self._lock:
+                self._sessions.add(holder.session)
+                self.created += 1
+            # The thread's locals are dropped when it exits, the session of a
+            # short-lived worker is closed then instead of kept until close()
+            weakref.finalize(holder, _release, self._sessions, self._lock,
+                             holder.session)
+
+        with self._budget:
+            yield holder.session
+
+    @property
+    def open(self) -> int:
+        """ Number of sessions held by live threads """
+        return len(self._sessions)
+
+    def close(self) -> None:
+        with self._lock:
+            for session in list(self._sessions):
+                session.close()
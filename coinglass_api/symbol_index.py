@@ -0,0 +1,123 @@
+import threading
+import time
+
+from .api import CoinglassAPI
+
+PERPETUAL = "perpetual"
+FUTURES = "futures"
+_SOURCES = {PERPETUAL: "perpetual_market", FUTURES: "futures_market"}
+
+
+class _SymbolEntry:
+    __slots__ = ("built", "markets", "pairs")
+
+    def __init__(self, markets: dict[str, dict[str, list[str]]]):
+        self.built = time.monotonic()
+        # kind -> exchange -> pairs
+        self.markets = markets
+        self.pairs = {(kind, ex, pair) for kind, exchanges in markets.items()
+                      for ex, pairs in exchanges.items() for pair in pairs}
+
+
+class SymbolIndex:
+    """
+    Map symbol -> exchange -> pairs from the market endpoints, so batch jobs
+    can expand e.g. all BTC perpetuals into valid (exchange, pair) requests
+    """
+
+    def __init__(self, cg: CoinglassAPI, ttl: float = 3600.0):
+        """
+        Args:
+            cg: client used to load the markets
+            ttl: seconds before a symbol's markets are loaded again (default: 3600)
+        """
+        self.cg = cg
+        self.ttl = ttl
+        self._entries: dict[str, _SymbolEntry] = {}
+        self._symbols: tuple[float, list[str]] | None = None
+        self._lock = threading.Lock()
+
+    def _expired(self, built: float) -> bool:
+        return time.monotonic() - built > self.ttl
+
+    def symbols(self) -> list[str]:
+        """ Symbols listed by futures_coins_markets """
+        with self._lock:
+            if self._symbols is None or self._expired(self._symbols[0]):
+                df = self.cg.futures_coins_markets()
+                symbols = df["symbol"].drop_duplicates().tolist()
+                self._symbols = (time.monotonic(), symbols)
+            return list(self._symbols[1])
+
+    def _entry(self, symbol: str) -> _SymbolEntry:
+        entry = self._entries.get(symbol)
+        if entry is not None and not self._expired(entry.built):
+            return entry
+
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry is not None and not self._expired(entry.built):
+                return entry
+
+            markets = {}
+            for kind, method in _SOURCES.items():
+                df = getattr(self.cg, method)(symbol=symbol)
+                exchanges: dict[str, list[str]] = {}
+                for ex, pair in zip(df["exchangeName"], df["originalSymbol"],
+                                    strict=True):
+                    exchanges.setdefault(ex, [])
+                    if pair not in exchanges[ex]:
+                        exchanges[ex].append(pair)
+                markets[kind] = exchanges
+
+            # Exchanges seen in the markets are valid parameters from now on
+            known = set(self.cg.get_exchanges())
+            for ex in {ex for exchanges in markets.values() for ex in exchanges}:
+                if ex not in known:
+                    self.cg.add_exchange(ex)
+
+            entry = self._entries[symbol] = _SymbolEntry(markets)
+            return entry
+
+    def exchanges(self, symbol: str, kind: str = PERPETUAL) -> list[str]:
+        """ Exchanges listing the symbol """
+        return list(self._entry(symbol).markets.get(kind, {}))
+
+    def pairs(self, symbol: str, exchange: str, kind: str = PERPETUAL) -> list[str]:
+        """ Pairs of the symbol on an exchange, e.g. BTCUSDT on Binance """
+        return list(self._entry(symbol).markets.get(kind, {}).get(exchange, []))
+
+    def is_valid(self, symbol: str, exchange: str, pair: str,
+                 kind: str = PERPETUAL) -> bool:
+        return (kind, exchange, pair) in self._entry(symbol).pairs
+
+    def expand(
+            self,
+            symbol: str,
+            kind: str = PERPETUAL,
+            exchanges: list[str] | None = None
+    ) -> list[dict[str, str]]:
+        """
+        All (exchange, pair) combinations of a symbol as keyword arguments
+
+        Args:
+            symbol: coin, e.g. BTC
+            kind: perpetual or futures (default: perpetual)
+            exchanges: only include these exchanges (default: all)
+
+        Returns:
+            list of {"ex": ..., "pair": ...}, e.g. to call
+            funding_ohlc(**kwargs, interval="h1")
+        """
+        markets = self._entry(symbol).markets.get(kind, {})
+        return [{"ex": ex, "pair": pair} for ex, pairs in markets.items()
+                if exchanges is None or ex in exchanges for pair in pairs]
+
+    def refresh(self, symbol: str | None = None) -> None:
+        """ Drop cached markets of one symbol, or of all symbols """
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+                self._symbols = None
+            else:
+                self._entries.pop(symbol, None)
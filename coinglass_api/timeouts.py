@@ -0,0 +1,86 @@
+import threading
+
+from .latency import LatencyTracker, LogHistogram
+
+
+class TimeoutPolicy:
+    """
+    Per-endpoint connect and read timeouts learned from latency and payload
+    size percentiles, so stalled small requests fail fast
+    """
+
+    def __init__(
+            self,
+            percentile: float = 99.0,
+            multiplier: float = 3.0,
+            min_timeout: float = 0.25,
+            max_timeout: float = 30.0,
+            connect_timeout: float | None = None,
+            bytes_per_second: float = 1_000_000,
+            min_samples: int = 20,
+            retries: int = 1
+    ):
+        """
+        Args:
+            percentile: latency percentile the timeout is based on (default: 99)
+            multiplier: headroom on the learned percentile (default: 3)
+            min_timeout: lower bound in seconds (default: 0.25)
+            max_timeout: ceiling in seconds, also used until enough samples
+                exist (default: 30)
+            connect_timeout: fixed connect timeout in seconds (default: learned
+                from the median latency of all endpoints)
+            bytes_per_second: slowest transfer rate allowed for, adds time for
+                endpoints with large payloads (default: 1 MB/s)
+            min_samples: samples needed before an endpoint's timeout is learned
+                (default: 20)
+            retries: retries of a request that timed out (default: 1)
+        """
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.connect_timeout = connect_timeout
+        self.bytes_per_second = bytes_per_second
+        self.min_samples = min_samples
+        self.retries = retries
+        # A client using this policy records into and hedges from this tracker
+        self.latency = LatencyTracker()
+        self._sizes: dict[str, LogHistogram] = {}
+        self._lock = threading.Lock()
+
+    def _clamp(self, seconds: float) -> float:
+        return min(self.max_timeout, max(self.min_timeout, seconds))
+
+    def record(self, endpoint: str, seconds: float, size: int) -> None:
+        """ Record a completed request's latency and payload size in bytes """
+        self.latency.record(endpoint, seconds)
+        with self._lock:
+            sizes = self._sizes.get(endpoint)
+            if sizes is None:
+                sizes = self._sizes[endpoint] = LogHistogram(
+                    16, 1e10, relative_accuracy=0.05)
+            sizes.add(size)
+
+    def record_timeout(self, endpoint: str, seconds: float) -> None:
+        """ Count a timed out request as slow, so timeouts widen if it persists """
+        if self.latency.count(endpoint):
+            self.latency.record(endpoint, seconds)
+
+    def timeout(self, endpoint: str) -> tuple[float, float]:
+        """ (connect, read) timeout in seconds for a request to an endpoint """
+        if self.connect_timeout is not None:
+            connect = self.connect_timeout
+        elif self.latency.count() >= self.min_samples:
+            connect = self._clamp(self.multiplier * self.latency.percentile(None, 50))
+        else:
+            connect = self.max_timeout
+
+        latency = self.latency.percentile(endpoint, self.percentile)
+        with self._lock:
+            sizes = self._sizes.get(endpoint)
+            size = None if sizes is None else sizes.percentile(self.percentile)
+        if (latency is None or size is None
+                or self.latency.count(endpoint) < self.min_samples):
+            return connect, self.max_timeout
+        read = self.multiplier * latency + size / self.bytes_per_second
+        return connect, self._clamp(read)
@@ -0,0 +1,59 @@
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from coinglass_api import HistoryArchive
+
+KEY = ("funding_ohlc", "Binance", "BTCUSDT", "m1")
+
+
+class TestHistoryArchive(TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.archive = HistoryArchive(self.tmp.name)
+        index = pd.date_range("2023-01-01", periods=1000, freq="min", name="time")
+        self.df = pd.DataFrame({"o": np.arange(1000.0), "c": np.arange(1000.0) + 0.5,
+                                "exchangeName": "Binance"}, index=index)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_append_and_slice(self) -> None:
+        self.assertEqual(self.archive.append(KEY, self.df.iloc[:600]), 600)
+        # Overlapping rows are skipped
+        self.assertEqual(self.archive.append(KEY, self.df.iloc[500:]), 400)
+        self.assertEqual(self.archive.rows(KEY), 1000)
+        self.assertEqual(list(self.archive.series()), [KEY])
+
+        out = self.archive.read(KEY, start="2023-01-01 01:00", end="2023-01-01 02:00")
+        expected = self.df.loc["2023-01-01 01:00":"2023-01-01 02:00", ["o", "c"]]
+        expected.index = expected.index.as_unit("ns")
+        pd.testing.assert_frame_equal(out, expected, check_freq=False)
+
+    def test_zero_copy_arrays(self) -> None:
+        self.archive.append(KEY, self.df)
+        arrays = self.archive.read_arrays(KEY, start="2023-01-01 10:00", columns=["c"])
+        self.assertIsInstance(arrays["c"], np.memmap)
+        self.assertEqual(arrays["c"][0], 600.5)
+        self.assertEqual(arrays["time"][0], np.datetime64("2023-01-01T10:00"))
+
+    def test_unsorted_input(self) -> None:
+        shuffled = self.df.iloc[::-1]
+        self.archive.append(KEY, shuffled)
+        out = self.archive.read(KEY)
+        self.assertTrue(out.index.is_monotonic_increasing)
+        np.testing.assert_array_equal(out["o"], self.df["o"])
+
+    def test_key_parts_are_escaped(self) -> None:
+        symbol_key = ("liquidation_symbol", None, "BTC", "h1")
+        literal_key = ("liquidation_symbol", "%", "BTC", "h1")
+        self.archive.append(symbol_key, self.df.iloc[:10])
+        self.archive.append(literal_key, self.df.iloc[:20])
+        self.assertEqual(self.archive.rows(symbol_key), 10)
+        self.assertEqual(self.archive.rows(literal_key), 20)
+
+        for part in ("..", ".", "", "BTC/USDT", "..\\BTC"):
+            with self.assertRaises(ValueError):
+                self.archive.append(("funding_ohlc", "Binance", part, "m1"), self.df)
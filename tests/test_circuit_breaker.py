@@ -0,0 +1,110 @@
+import time
+from unittest import TestCase
+
+import requests
+
+from coinglass_api import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CoinglassAPI,
+    CoinglassRequestError,
+    CoinglassStaleDataWarning,
+)
+
+
+class _Response:
+    def __init__(self, payload: dict):
+        self._payload = payload
+
+    def json(self) -> dict:
+        return self._payload
+
+
+class _FlakySession:
+    def __init__(self):
+        self.healthy = True
+        self.malformed = False
+        self.calls = 0
+
+    def request(self, **kwargs) -> _Response:
+        self.calls += 1
+        if not self.healthy:
+            raise requests.ConnectionError("upstream down")
+        if self.malformed:
+            # Neither success nor the status of an API error
+            return _Response({"error": "gateway"})
+        data = [{"exchangeName": "Binance", "rate": 0.01}]
+        return _Response({"success": True, "data": {"BTC": data}})
+
+    def close(self) -> None:
+        pass
+
+
+class TestCircuitBreaker(TestCase):
+    def setUp(self) -> None:
+        self.cg = CoinglassAPI(
+            coinglass_secret="secret",
+            circuit_breaker=CircuitBreaker(failure_threshold=2, recovery_timeout=0.1)
+        )
+        self.session = self.cg._session = _FlakySession()
+
+    def tearDown(self) -> None:
+        self.cg.close()
+
+    def test_serves_stale_while_open(self) -> None:
+        fresh = self.cg.perpetual_market(symbol="BTC")
+        self.session.healthy = False
+
+        with self.assertRaises(requests.ConnectionError):
+            self.cg.perpetual_market(symbol="BTC")
+
+        # Second failure opens the circuit and falls back to the cached result
+        with self.assertWarns(CoinglassStaleDataWarning):
+            stale = self.cg.perpetual_market(symbol="BTC")
+        self.assertTrue(stale.equals(fresh))
+
+        calls = self.session.calls
+        with self.assertWarns(CoinglassStaleDataWarning):
+            self.cg.perpetual_market(symbol="BTC")
+        self.assertEqual(self.session.calls, calls)
+
+    def test_fails_fast_without_cache(self) -> None:
+        self.session.healthy = False
+        for _ in range(2):
+            with self.assertRaises(requests.ConnectionError):
+                self.cg.perpetual_market(symbol="ETH")
+
+        with self.assertRaises(CircuitOpenError):
+            self.cg.perpetual_market(symbol="ETH")
+        self.assertIsInstance(CircuitOpenError("x"), CoinglassRequestError)
+
+    def test_probe_recovers(self) -> None:
+        self.session.healthy = False
+        for _ in range(2):
+            with self.assertRaises(requests.ConnectionError):
+                self.cg.perpetual_market(symbol="BTC")
+        self.assertEqual(self.cg._circuit_breaker.state("perpetual_market"), "open")
+
+        time.sleep(0.15)
+        self.session.healthy = True
+        self.cg.perpetual_market(symbol="BTC")
+        self.assertEqual(self.cg._circuit_breaker.state("perpetual_market"), "closed")
+
+    def test_unexpected_error_releases_probe(self) -> None:
+        self.session.healthy = False
+        for _ in range(2):
+            with self.assertRaises(requests.ConnectionError):
+                self.cg.perpetual_market(symbol="BTC")
+
+        time.sleep(0.15)
+        self.session.healthy = True
+        self.session.malformed = True
+        with self.assertRaises(KeyError):
+            self.cg.perpetual_market(symbol="BTC")
+        self.assertEqual(self.cg._circuit_breaker.state("perpetual_market"), "open")
+
+        # The failed probe reopened the circuit, the next one goes through
+        time.sleep(0.15)
+        self.session.malformed = False
+        self.cg.perpetual_market(symbol="BTC")
+        self.assertEqual(self.cg._circuit_breaker.state("perpetual_market"), "closed")
@@ -0,0 +1,81 @@
+import json
+import os
+import tempfile
+from contextlib import redirect_stderr
+from io import StringIO
+from unittest import TestCase
+
+import pandas as pd
+
+from coinglass_api import CoinglassAPI, SymbolIndex
+from coinglass_api.cli import main, plan_jobs
+from coinglass_api.mock_server import MockCoinglassServer
+
+
+class TestCli(TestCase):
+    def test_plan_jobs(self) -> None:
+        jobs = list(plan_jobs(["funding_ohlc", "perpetual_market"],
+                              {"ex": ["Binance", "OKX"], "pair": ["BTCUSDT"],
+                               "interval": ["h1", "h4"], "symbol": ["BTC"],
+                               "limit": 10}))
+        self.assertEqual(len(jobs), 5)
+        self.assertIn(("perpetual_market", {"symbol": "BTC"}), jobs)
+        # Only endpoint methods returning frames can be exported
+        for method in ("not_a_method", "close", "prefetch", "get_exchanges",
+                       "funding_usd_history", "liquidation_map"):
+            with self.assertRaises(ValueError):
+                list(plan_jobs([method], {"symbol": ["BTC"]}))
+
+    def test_plan_listed_pairs(self) -> None:
+        options = {"ex": ["Binance", "dYdX"], "pair": ["BTCUSDT", "BTC-USD"],
+                   "interval": ["h1"], "symbol": ["BTC"]}
+        with MockCoinglassServer() as server:
+            cg = CoinglassAPI(coinglass_secret="mock", base_url=server.url)
+            jobs = list(plan_jobs(["funding_ohlc"], options, SymbolIndex(cg)))
+            # Without symbols the pairs cannot be matched to the exchanges
+            with self.assertRaises(ValueError):
+                list(plan_jobs(["funding_ohlc"], {**options, "symbol": []},
+                               SymbolIndex(cg)))
+            cg.close()
+
+        self.assertEqual(jobs, [
+            ("funding_ohlc", {"ex": "Binance", "pair": "BTCUSDT", "interval": "h1"}),
+            ("funding_ohlc", {"ex": "dYdX", "pair": "BTC-USD", "interval": "h1"}),
+        ])
+
+    def test_rejects_non_frame_method(self) -> None:
+        stderr = StringIO()
+        with tempfile.TemporaryDirectory() as out, redirect_stderr(stderr), \
+                self.assertRaises(SystemExit):
+            main(["export", "--method", "close", "--secret", "mock",
+                  "--format", "csv", "--out", out])
+        self.assertIn("'close' is not an endpoint method", stderr.getvalue())
+
+    def test_export_and_resume(self) -> None:
+        with MockCoinglassServer() as server, tempfile.TemporaryDirectory() as out:
+            argv = ["export", "--method", "funding_ohlc", "liquidation_symbol",
+                    "--ex", "Binance", "dYdX", "--pair", "BTCUSDT", "BTC-USD",
+                    "--symbol", "BTC", "--interval", "h1", "h4", "--limit", "20",
+                    "--format", "csv", "--out", out, "--secret", "mock",
+                    "--base-url", server.url, "--requests-per-minute", "6000"]
+            with redirect_stderr(StringIO()):
+                self.assertEqual(main(argv), 0)
+            # Two market requests to match pairs to exchanges, then the jobs
+            self.assertEqual(server.requests, 2 + 6)
+
+            manifest_path = os.path.join(out, "manifest.json")
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            self.assertTrue(all(job["status"] == "done"
+                                for job in manifest["jobs"].values()))
+            name, job = next(iter(manifest["jobs"].items()))
+            df = pd.read_csv(os.path.join(out, job["file"]), index_col=0)
+            self.assertEqual(len(df), 20)
+
+            # Simulate an export interrupted before the last job finished
+            manifest["jobs"][name]["status"] = None
+            with open(manifest_path, "w") as f:
+                json.dump(manifest, f)
+            with redirect_stderr(StringIO()):
+                self.assertEqual(main(argv), 0)
+            self.assertEqual(server.requests, 8 + 2 + 1)
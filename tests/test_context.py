@@ -0,0 +1,24 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from coinglass_api import PRIORITY_LIVE, Profiler, RequestScheduler
+from coinglass_api.context import submit_in_context
+from coinglass_api.profiling import _profiler
+from coinglass_api.scheduler import _request_class
+
+
+class TestContext(TestCase):
+    def test_workers_see_caller_context(self) -> None:
+        def current() -> tuple:
+            return _request_class.get(), _profiler.get()
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            # Start the worker outside the context, it must not keep a stale one
+            default = pool.submit(current).result()
+            with Profiler() as profiler, \
+                    RequestScheduler.context(priority=PRIORITY_LIVE, caller="live"):
+                seen = submit_in_context(pool, current).result()
+            plain = pool.submit(current).result()
+
+        self.assertEqual(seen, ((PRIORITY_LIVE, "live", None), profiler))
+        self.assertEqual(plain, default)
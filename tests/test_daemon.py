@@ -0,0 +1,83 @@
+import time
+from unittest import TestCase
+
+from coinglass_api import (
+    CoinglassAPI,
+    CoinglassQuotaWarning,
+    RateLimiter,
+    RefreshDaemon,
+)
+from coinglass_api.mock_server import MockCoinglassServer
+
+
+class TestRefreshDaemon(TestCase):
+    def test_bar_close_alignment(self) -> None:
+        cg = CoinglassAPI(coinglass_secret="mock")
+        daemon = RefreshDaemon(cg, delay=2, jitter=0)
+        h4 = daemon.add("funding_ohlc", ex="Binance", pair="BTCUSDT", interval="h4")
+        week = daemon.add("liquidation_symbol", symbol="BTC", interval="1w")
+        # 2023-01-02 is a Monday
+        now = 1_672_621_200.0  # 2023-01-02 01:00 UTC
+        self.assertEqual(h4.next_close(now), 1_672_632_000.0)  # 04:00
+        self.assertEqual(week.next_close(now), 1_673_222_400.0)  # 2023-01-09
+        self.assertEqual(h4.offset, 2)
+        with self.assertRaises(ValueError):
+            daemon.add("perpetual_market", symbol="BTC")
+        for method in ("close", "prefetch", "funding_usd_history"):
+            with self.assertRaises(ValueError):
+                daemon.add(method, every=60)
+        cg.close()
+
+    def test_quota_plan(self) -> None:
+        cg = CoinglassAPI(coinglass_secret="mock", rate_limiter=RateLimiter(30))
+        daemon = RefreshDaemon(cg, jitter=0)
+        for pair in ("BTCUSDT", "ETHUSDT", "SOLUSDT"):
+            daemon.add("funding_ohlc", ex="Binance", pair=pair, interval="m1")
+        plan = daemon.plan()
+        self.assertEqual(plan.quota, 30)
+        self.assertAlmostEqual(plan.requests_per_minute, 3)
+        self.assertTrue(plan.fits)
+        # Jobs sharing a bar close are staggered two seconds apart at 30/min
+        offsets = sorted(job.offset for job in daemon.jobs)
+        self.assertEqual(offsets, [2.0, 4.0, 6.0])
+
+        for i in range(30):
+            daemon.add("funding_ohlc", ex="OKX", pair=f"P{i}", interval="m1")
+        self.assertFalse(daemon.plan().fits)
+        with self.assertWarns(CoinglassQuotaWarning):
+            daemon.start()
+        daemon.stop()
+        cg.close()
+
+    def test_refreshes(self) -> None:
+        with MockCoinglassServer() as server:
+            cg = CoinglassAPI(coinglass_secret="mock", base_url=server.url)
+            seen = []
+            with RefreshDaemon(cg, delay=0, jitter=0) as daemon:
+                job = daemon.add("perpetual_market", every=0.1,
+                                 callback=lambda name, df: seen.append(len(df)),
+                                 symbol="BTC")
+                time.sleep(0.55)
+            self.assertGreaterEqual(job.runs, 3)
+            self.assertEqual(job.errors, 0)
+            self.assertEqual(len(seen), job.runs)
+            cg.close()
+
+    def test_failing_callback_keeps_refreshing(self) -> None:
+        def callback(name: str, df) -> None:
+            raise RuntimeError("consumer failed")
+
+        with MockCoinglassServer() as server:
+            cg = CoinglassAPI(coinglass_secret="mock", base_url=server.url)
+            with self.assertLogs("coinglass_api.daemon") as logs, \
+                    RefreshDaemon(cg, delay=0, jitter=0) as daemon:
+                job = daemon.add("perpetual_market", every=0.1, callback=callback,
+                                 symbol="BTC")
+                time.sleep(0.35)
+                self.assertTrue(daemon._thread.is_alive())
+            self.assertGreaterEqual(job.runs, 2)
+            self.assertEqual(job.errors, job.runs)
+            self.assertIsInstance(job.last_error, RuntimeError)
+            self.assertIsNotNone(job.result)
+            self.assertIn("consumer failed", logs.output[0])
+            cg.close()
@@ -0,0 +1,83 @@
+import os
+import sqlite3
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from coinglass_api import CoinglassAPI, DiskCache
+from coinglass_api.mock_server import MockCoinglassServer
+
+
+class TestDiskCache(TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "responses.sqlite")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_roundtrip_and_ttl(self) -> None:
+        cache = DiskCache(self.path, ttl=None)
+        response = {"success": True, "data": [{"t": i, "v": 1.5} for i in range(1000)]}
+        cache.set("funding?ex=Binance", response)
+        self.assertEqual(cache.get("funding?ex=Binance"), response)
+        self.assertLess(cache.size * 10, len(str(response)))
+
+        # Another instance, e.g. in another process, sees the same entries
+        other = DiskCache(self.path, ttl=60)
+        self.assertEqual(other.get("funding?ex=Binance"), response)
+        self.assertIsNone(other.get("funding?ex=Binance", max_age=-1))
+        cache.close()
+        other.close()
+
+    def test_eviction(self) -> None:
+        cache = DiskCache(self.path, max_bytes=2000, ttl=None, codec="zlib")
+        for i in range(20):
+            cache.set(f"key{i}", {"data": os.urandom(100).hex()})
+        self.assertLessEqual(cache.size, 2000)
+        self.assertIn("key19", cache)
+        self.assertNotIn("key0", cache)
+        with self.assertRaises(ValueError):
+            DiskCache(self.path, codec="brotli")
+        cache.close()
+
+    def test_size_is_not_summed_on_every_write(self) -> None:
+        cache = DiskCache(self.path, ttl=None)
+        statements: list[str] = []
+        cache._connection().set_trace_callback(statements.append)
+        for i in range(50):
+            cache.set(f"key{i}", {"data": i})
+        self.assertEqual(sum("SUM(size)" in sql for sql in statements), 1)
+        cache.close()
+
+    def test_close_reaches_every_thread(self) -> None:
+        cache = DiskCache(self.path, ttl=None)
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            connections = list(pool.map(lambda i: cache.set(f"key{i}", {"i": i})
+                                        or cache._connection(), range(3)))
+            cache.close()
+            for conn in connections:
+                with self.assertRaises(sqlite3.ProgrammingError):
+                    conn.execute("SELECT 1")
+            # Threads open a new connection after close
+            self.assertEqual(list(pool.map(lambda i: cache.get(f"key{i}"), range(3))),
+                             [{"i": 0}, {"i": 1}, {"i": 2}])
+        self.assertEqual((cache.hits, cache.misses), (3, 0))
+        cache.close()
+
+    def test_client(self) -> None:
+        with MockCoinglassServer() as server:
+            cg = CoinglassAPI(coinglass_secret="mock", base_url=server.url,
+                              disk_cache=DiskCache(self.path))
+            first = cg.perpetual_market(symbol="BTC")
+            second = cg.perpetual_market(symbol="BTC")
+            self.assertEqual(server.requests, 1)
+            self.assertTrue(first.equals(second))
+
+            restarted = CoinglassAPI(coinglass_secret="mock", base_url=server.url,
+                                     disk_cache=DiskCache(self.path))
+            restarted.perpetual_market(symbol="BTC")
+            self.assertEqual(server.requests, 1)
+            cg.close()
+            restarted.close()
+        self.assertIsNone(cg._disk_cache._local.conn)
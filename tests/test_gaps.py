@@ -0,0 +1,46 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from coinglass_api import CoinglassAPI, find_gaps, repair_gaps
+from coinglass_api.mock_server import MockCoinglassServer
+
+HOUR = 3_600_000
+START = 1_672_531_200_000  # 2023-01-01
+
+
+class TestGaps(TestCase):
+    def test_find_gaps(self) -> None:
+        index = pd.to_datetime([START + i * HOUR for i in (0, 1, 2, 5, 6, 9)],
+                               unit="ms")
+        self.assertEqual(find_gaps(index, "h1"),
+                         [(START + 3 * HOUR, START + 4 * HOUR),
+                          (START + 7 * HOUR, START + 8 * HOUR)])
+        self.assertEqual(find_gaps(index, "h1", start=START - 2 * HOUR,
+                                   end=START + 10 * HOUR)[::3],
+                         [(START - 2 * HOUR, START - HOUR),
+                          (START + 10 * HOUR, START + 10 * HOUR)])
+        self.assertEqual(find_gaps(index[:3], "h1"), [])
+
+    def test_numpy_integer_times(self) -> None:
+        index = pd.to_datetime([START, START + HOUR], unit="ms")
+        end = np.int64(START + 3 * HOUR)
+        self.assertEqual(find_gaps(index, "h1", start=np.int64(START), end=end),
+                         [(START + 2 * HOUR, START + 3 * HOUR)])
+
+    def test_repair(self) -> None:
+        kwargs = {"ex": "Binance", "pair": "BTCUSDT", "interval": "h1"}
+        with MockCoinglassServer() as server:
+            cg = CoinglassAPI(coinglass_secret="mock", base_url=server.url)
+            full = cg.funding_ohlc(**kwargs, limit=2000, start_time=START,
+                                   end_time=START + 1999 * HOUR)
+            holed = full.drop(full.index[100:110]).drop(full.index[1200:1900])
+            requests = server.requests
+
+            repaired = repair_gaps(cg, "funding_ohlc", holed, page_size=500,
+                                   **kwargs)
+            # One request for the small hole, two pages for the large one
+            self.assertEqual(server.requests - requests, 3)
+            pd.testing.assert_frame_equal(repaired, full, check_freq=False)
+            cg.close()
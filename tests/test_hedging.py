@@ -0,0 +1,120 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from coinglass_api import CoinglassAPI, HedgingPolicy, KeyPool, RateLimiter
+
+
+class _Response:
+    def __init__(self, payload: dict):
+        self._payload = payload
+
+    def json(self) -> dict:
+        return self._payload
+
+
+class _SlowFirstSession:
+    """ First requests stall, every following request answers immediately """
+
+    def __init__(self, stall: float, stalled: int = 1):
+        self.stall = stall
+        self.stalled = stalled
+        self.calls = 0
+        self.secrets: list[str] = []
+        self._lock = threading.Lock()
+
+    def request(self, **kwargs) -> _Response:
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+            self.secrets.append(kwargs["headers"]["coinglassSecret"])
+        if call <= self.stalled:
+            time.sleep(self.stall)
+        return _Response({"success": True, "data": call})
+
+    def close(self) -> None:
+        pass
+
+
+class TestHedging(TestCase):
+    def test_hedge_wins_over_stalled_request(self) -> None:
+        cg = CoinglassAPI(
+            coinglass_secret="secret",
+            hedging=HedgingPolicy(initial_delay=0.05)
+        )
+        cg._session = _SlowFirstSession(stall=1.0)
+
+        start = time.perf_counter()
+        response = cg._get("perpetual_market", {"symbol": "BTC"})
+        elapsed = time.perf_counter() - start
+        cg.close()
+
+        self.assertEqual(response["data"], 2)
+        self.assertLess(elapsed, 0.5)
+
+    def test_hedge_respects_rate_budget(self) -> None:
+        limiter = RateLimiter(requests_per_minute=60, burst=1)
+        cg = CoinglassAPI(
+            coinglass_secret="secret",
+            rate_limiter=limiter,
+            hedging=HedgingPolicy(initial_delay=0.05)
+        )
+        cg._session = _SlowFirstSession(stall=0.2)
+
+        response = cg._get("perpetual_market", {"symbol": "BTC"})
+        cg.close()
+
+        # The single token went to the primary request, so no hedge was sent
+        self.assertEqual(response["data"], 1)
+        self.assertEqual(cg._session.calls, 1)
+
+    def test_many_concurrent_callers(self) -> None:
+        cg = CoinglassAPI(
+            coinglass_secret="secret",
+            hedging=HedgingPolicy(initial_delay=0.05)
+        )
+        # Every caller's primary request stalls, their hedges must not queue
+        cg._session = _SlowFirstSession(stall=1.0, stalled=16)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            responses = list(pool.map(
+                lambda _: cg._get("perpetual_market", {"symbol": "BTC"}), range(16)))
+        elapsed = time.perf_counter() - start
+        cg.close()
+
+        self.assertTrue(all(response["data"] > 16 for response in responses))
+        self.assertLess(elapsed, 0.5)
+
+    def test_hedge_is_charged_to_a_key(self) -> None:
+        pool = KeyPool(["key-a", "key-b"], requests_per_minute=600)
+        cg = CoinglassAPI(
+            coinglass_secret=pool,
+            hedging=HedgingPolicy(initial_delay=0.05)
+        )
+        cg._session = _SlowFirstSession(stall=0.3)
+
+        response = cg._get("perpetual_market", {"symbol": "BTC"})
+        cg.close()
+
+        self.assertEqual(response["data"], 2)
+        # The primary and the hedge each took a request from a key's budget
+        self.assertEqual(sum(key["requests"] for key in pool.stats()), 2)
+        self.assertEqual(sorted(cg._session.secrets), ["key-a", "key-b"])
+
+    def test_unhedged_endpoint(self) -> None:
+        cg = CoinglassAPI(
+            coinglass_secret="secret",
+            hedging=HedgingPolicy(endpoints=["funding"], initial_delay=0.01)
+        )
+        cg._session = _SlowFirstSession(stall=0.1)
+        response = cg._get("perpetual_market", {"symbol": "BTC"})
+        cg.close()
+        self.assertEqual(response["data"], 1)
+
+    def test_learned_delay(self) -> None:
+        policy = HedgingPolicy(min_samples=2, min_delay=0.01)
+        self.assertEqual(policy.delay(None, 0), policy.initial_delay)
+        self.assertEqual(policy.delay(0.2, 5), 0.2)
+        self.assertEqual(policy.delay(0.001, 5), 0.01)
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import time
+from unittest import TestCase
+
+import pandas as pd
+
+from coinglass_api import CoinglassAPI, JournalReplay, JournalWriter
+from coinglass_api.mock_server import MockCoinglassServer
+
+
+class TestJournal(TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "session.journal")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_record_and_replay(self) -> None:
+        with MockCoinglassServer() as server:
+            writer = JournalWriter(self.path)
+            cg = CoinglassAPI(coinglass_secret="mock", base_url=server.url,
+                              journal=writer)
+            recorded = [cg.funding_ohlc(ex="Binance", pair="BTCUSDT", interval="h1"),
+                        cg.perpetual_market(symbol="BTC"),
+                        cg.funding_ohlc(ex="Binance", pair="BTCUSDT", interval="h1")]
+            cg.close()
+            writer.close()
+        self.assertEqual(writer.records, 3)
+
+        # No server is running, every response comes from the journal
+        replay = JournalReplay(self.path)
+        cg = CoinglassAPI(coinglass_secret="mock", base_url="http://127.0.0.1:9/",
+                          journal=replay)
+        pd.testing.assert_frame_equal(
+            cg.funding_ohlc(ex="Binance", pair="BTCUSDT", interval="h1"), recorded[0])
+        pd.testing.assert_frame_equal(cg.perpetual_market(symbol="BTC"), recorded[1])
+        cg.funding_ohlc(ex="Binance", pair="BTCUSDT", interval="h1")
+        self.assertEqual(len(replay), 0)
+        with self.assertRaises(KeyError):
+            cg.perpetual_market(symbol="BTC")
+        cg.close()
+        replay.close()
+
+    def test_truncated_record_is_skipped(self) -> None:
+        writer = JournalWriter(self.path)
+        for i in range(3):
+            writer.record("funding", {"success": True, "data": [i]}, recorded=i)
+        writer.close()
+        # A crash while writing the last record leaves it cut short
+        with open(self.path, "r+b") as f:
+            f.truncate(os.path.getsize(self.path) - 3)
+
+        replay = JournalReplay(self.path)
+        self.assertEqual(len(replay), 2)
+        self.assertEqual([replay.response("funding")["data"] for _ in range(2)],
+                         [[0], [1]])
+        replay.close()
+
+    def test_paced_and_fast_replay(self) -> None:
+        writer = JournalWriter(self.path)
+        response = {"success": True, "data": {"BTC": [{"price": 1.0}]}}
+        for i in range(20_000):
+            writer.record("perpetual_market?symbol=BTC", response, recorded=i * 0.01)
+        writer.close()
+
+        fast = JournalReplay(self.path)
+        cg = CoinglassAPI(coinglass_secret="mock", journal=fast)
+        start = time.perf_counter()
+        for _ in range(20_000):
+            cg._get("perpetual_market", {"symbol": "BTC"})
+        self.assertLess(time.perf_counter() - start, 2.0)
+        fast.close()
+
+        # 200s of recording at 1000x take about 0.2s, 0.05s here
+        replay = JournalReplay(self.path, speed=1000)
+        start = time.perf_counter()
+        for _ in range(5000):
+            replay.response("perpetual_market?symbol=BTC")
+        self.assertGreater(time.perf_counter() - start, 0.04)
+        self.assertAlmostEqual(replay.time, 49.99)
+        replay.close()
@@ -0,0 +1,49 @@
+from unittest import TestCase
+
+from coinglass_api import CoinglassAPI, KeyPool, NoActiveKeyError
+from coinglass_api.mock_server import MockCoinglassServer
+
+
+class TestKeyPool(TestCase):
+    def test_spreads_requests_over_keys(self) -> None:
+        pool = KeyPool(["key-a", "key-b", "key-c"], requests_per_minute=60)
+        with MockCoinglassServer(requests_per_minute=4) as server:
+            cg = CoinglassAPI(coinglass_secret=pool, base_url=server.url)
+            for _ in range(12):
+                cg.option(symbol="BTC")
+            cg.close()
+
+        self.assertEqual(server.rate_limited, 0)
+        self.assertEqual([key["requests"] for key in pool.stats()], [4, 4, 4])
+
+    def test_rate_limited_key_cools_down(self) -> None:
+        pool = KeyPool(["key-a", "key-b"], requests_per_minute=600)
+        with MockCoinglassServer(requests_per_minute=1) as server:
+            # Spend key-a's server quota behind the pool's back
+            server.respond("option", {"symbol": "BTC"}, "key-a")
+            cg = CoinglassAPI(coinglass_secret=pool, base_url=server.url)
+            df = cg.option(symbol="BTC")
+            cg.close()
+
+        # The 50001 reply put key-a in cooldown and the call moved on to key-b
+        self.assertFalse(df.empty)
+        self.assertEqual(server.rate_limited, 1)
+        key_a, key_b = pool.stats()
+        self.assertEqual((key_a["rate_limited"], key_a["cooling_down"]), (1, True))
+        self.assertEqual((key_b["requests"], key_b["rate_limited"]), (1, 0))
+        self.assertEqual(pool.acquire(), "key-b")
+
+    def test_invalid_key_leaves_rotation(self) -> None:
+        pool = KeyPool(["bad", "good"], requests_per_minute=600)
+        with MockCoinglassServer(valid_keys=["good"]) as server:
+            cg = CoinglassAPI(coinglass_secret=pool, base_url=server.url)
+            for _ in range(3):
+                cg.option(symbol="BTC")
+            cg.close()
+
+        self.assertEqual(pool.active, 1)
+        self.assertFalse(pool.stats()[0]["active"])
+
+        pool.report("good", {"success": False, "code": "30001"})
+        with self.assertRaises(NoActiveKeyError):
+            pool.acquire()
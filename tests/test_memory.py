@@ -0,0 +1,80 @@
+import tracemalloc
+from collections.abc import Callable
+from unittest import TestCase
+
+import pandas as pd
+
+from coinglass_api import CoinglassAPI
+from coinglass_api.schema import EndpointSchema
+
+ROWS = 50_000
+START = 1_600_000_000_000
+
+
+def peak_ratio(build: Callable[[], pd.DataFrame]) -> tuple[pd.DataFrame, float]:
+    """ Peak memory traced while building a frame, relative to the frame's size """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        df = build()
+        peak = tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    return df, peak / df.memory_usage(index=True).sum()
+
+
+def records(columns: int = 10) -> list[dict]:
+    return [{"createTime": START + i * 60_000,
+             **{f"c{j}": float(i + j) for j in range(columns)}} for i in range(ROWS)]
+
+
+def date_list(columns: int = 8) -> dict:
+    flattened = {("dateList", 0): [START + i * 60_000 for i in range(ROWS)]}
+    for j in range(columns):
+        flattened[("dataMap", f"ex{j}")] = [float(i + j) for i in range(ROWS)]
+    return flattened
+
+
+class TestBuilderMemory(TestCase):
+    """
+    The builders used to copy the full frame in rename, drop and set_index,
+    peaking at 2-2.5x the final frame; these bounds catch copies creeping back
+    """
+
+    def test_records(self) -> None:
+        data = records()
+        df, ratio = peak_ratio(lambda: CoinglassAPI._create_dataframe(
+            data, time_col="createTime"))
+        self.assertEqual(df.shape, (ROWS, 10))
+        self.assertEqual(df.index.name, "time")
+        self.assertLess(ratio, 2.0)
+
+    def test_records_with_learned_schema(self) -> None:
+        data = records()
+        schema = EndpointSchema("test")
+        CoinglassAPI._create_dataframe(data, time_col="createTime", schema=schema)
+        self.assertTrue(schema.learned)
+        df, ratio = peak_ratio(lambda: CoinglassAPI._create_dataframe(
+            data, time_col="createTime", schema=schema))
+        self.assertEqual(df.shape, (ROWS, 10))
+        self.assertLess(ratio, 1.6)
+
+    def test_date_list(self) -> None:
+        flattened = date_list()
+        df, ratio = peak_ratio(
+            lambda: CoinglassAPI._create_date_list_dataframe(flattened))
+        self.assertEqual(df.shape, (ROWS, 8))
+        self.assertIsInstance(df.columns, pd.MultiIndex)
+        self.assertNotIn("dateList", df.columns.get_level_values(0))
+        self.assertEqual(df.index[0], pd.Timestamp(START, unit="ms"))
+        self.assertLess(ratio, 1.5)
+
+    def test_date_list_mixed_dtypes(self) -> None:
+        flattened = {("dateList", 0): [START, START + 1000],
+                     ("dataMap", "CME"): [1, 2],
+                     ("priceList", 0): [1.5, 2.5]}
+        df = CoinglassAPI._create_date_list_dataframe(flattened)
+        self.assertEqual(df[("dataMap", "CME")].dtype.kind, "i")
+        self.assertEqual(df[("priceList", 0)].tolist(), [1.5, 2.5])
+        # The response dict is left untouched
+        self.assertIn(("dateList", 0), flattened)
@@ -0,0 +1,44 @@
+from unittest import TestCase
+
+from coinglass_api import CoinglassAPI, CoinglassAPIError, RateLimitExceededError
+from coinglass_api.loadtest import run_load
+from coinglass_api.mock_server import MockCoinglassServer
+
+
+class TestMockServer(TestCase):
+    def test_endpoint_shapes(self) -> None:
+        with MockCoinglassServer() as server:
+            cg = CoinglassAPI(coinglass_secret="mock", base_url=server.url)
+            perp = cg.perpetual_market(symbol="BTC")
+            self.assertIn("fundingRate", perp.columns)
+
+            ohlc = cg.funding_ohlc(
+                ex="Binance", pair="BTCUSDT", interval="h4", limit=50
+            )
+            self.assertEqual(ohlc.shape[0], 50)
+            self.assertTrue(ohlc.index.is_monotonic_increasing)
+
+            grm = cg.golden_ratio_multiplier()
+            self.assertIn("3LowBullHigh", grm.columns)
+            cg.close()
+
+    def test_rate_limit_and_errors(self) -> None:
+        with MockCoinglassServer(requests_per_minute=1) as server:
+            cg = CoinglassAPI(coinglass_secret="mock", base_url=server.url)
+            cg.option(symbol="BTC")
+            with self.assertRaises(RateLimitExceededError):
+                cg.option(symbol="BTC")
+            cg.close()
+
+        with MockCoinglassServer(error_rate=1.0) as server:
+            cg = CoinglassAPI(coinglass_secret="mock", base_url=server.url)
+            with self.assertRaises(CoinglassAPIError):
+                cg.option(symbol="BTC")
+            cg.close()
+
+    def test_run_load(self) -> None:
+        with MockCoinglassServer() as server:
+            result = run_load(server.url, requests=20, concurrency=4, mode="thread")
+        self.assertEqual(result.requests, 20)
+        self.assertEqual(result.errors, 0)
+        self.assertGreater(result.throughput, 0)
@@ -0,0 +1,49 @@
+import time
+from unittest import TestCase
+
+import pandas as pd
+
+from coinglass_api import CoinglassAPI, OnChainIndexes
+from coinglass_api.mock_server import MockCoinglassServer
+from coinglass_api.onchain import INDEX_METHODS, to_daily
+
+
+class TestOnChainIndexes(TestCase):
+    def test_bundle_is_concurrent_and_cached(self) -> None:
+        with MockCoinglassServer(latency=0.2) as server:
+            cg = CoinglassAPI(coinglass_secret="mock", base_url=server.url)
+            indexes = OnChainIndexes(cg)
+            start = time.perf_counter()
+            df = indexes.get()
+            elapsed = time.perf_counter() - start
+
+            self.assertLess(elapsed, 1.0)
+            self.assertEqual(server.requests, len(INDEX_METHODS))
+            self.assertEqual(set(df.columns.levels[0]), set(INDEX_METHODS))
+            self.assertIsInstance(df.index, pd.DatetimeIndex)
+            self.assertTrue(df.index.is_unique and df.index.is_monotonic_increasing)
+            self.assertTrue((df.index == df.index.normalize()).all())
+            # Every frame lands on the same days, log_log_regression included
+            self.assertFalse(df.isna().any().any())
+
+            self.assertGreater(indexes.expires, time.time())
+            indexes.get()
+            self.assertEqual(server.requests, len(INDEX_METHODS))
+            indexes.get(refresh=True)
+            self.assertEqual(server.requests, 2 * len(INDEX_METHODS))
+            cg.close()
+
+    def test_next_close(self) -> None:
+        indexes = OnChainIndexes(CoinglassAPI(coinglass_secret="mock"), close_hour=8)
+        self.assertEqual(indexes.next_close(0), 8 * 3600)
+        self.assertEqual(indexes.next_close(8 * 3600), 86400 + 8 * 3600)
+        with self.assertRaises(ValueError):
+            OnChainIndexes(indexes.cg, methods=("funding_rate",))
+
+    def test_to_daily_keeps_last_row_of_day(self) -> None:
+        df = pd.DataFrame({"v": [1, 2, 3]}, index=pd.to_datetime(
+            ["2024-01-01 08:00", "2024-01-01 20:00", "2024-01-02 08:00"]))
+        daily = to_daily(df)
+        self.assertEqual(daily["v"].tolist(), [2, 3])
+        self.assertEqual(list(daily.index), list(pd.to_datetime(["2024-01-01",
+                                                                 "2024-01-02"])))
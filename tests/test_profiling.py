@@ -0,0 +1,47 @@
+from unittest import TestCase
+
+from coinglass_api import CoinglassAPI, HedgingPolicy, RateLimiter
+from coinglass_api.mock_server import MockCoinglassServer
+from coinglass_api.profiling import PHASES
+
+
+class TestProfiler(TestCase):
+    def test_phases_per_endpoint(self) -> None:
+        with MockCoinglassServer(latency=0.02) as server:
+            cg = CoinglassAPI(coinglass_secret="mock", base_url=server.url,
+                              rate_limiter=RateLimiter(6000))
+            cg.perpetual_market(symbol="BTC")  # not profiled
+
+            with cg.profile(trace_memory=True) as profiler:
+                for _ in range(3):
+                    cg.option_history(symbol="BTC", currency="USD")
+                cg.funding_ohlc(ex="Binance", pair="BTCUSDT", interval="h1")
+            cg.close()
+
+        summary = profiler.summary()
+        self.assertEqual(summary.loc["option_history", "calls"], 3)
+        self.assertEqual(summary.loc["indicator/funding_ohlc", "calls"], 1)
+        self.assertNotIn("perpetual_market", summary.index)
+        self.assertGreaterEqual(summary.loc["option_history", "network"], 0.02)
+        row = profiler.frame().iloc[-1]
+        self.assertGreater(row["build"], 0)
+        self.assertGreater(row["peak_memory"], 0)
+        self.assertLessEqual(sum(row[list(PHASES)]), row["total"] + 1e-9)
+        self.assertIn("option_history", str(profiler))
+
+    def test_decorator_and_hedged_requests(self) -> None:
+        with MockCoinglassServer() as server:
+            cg = CoinglassAPI(coinglass_secret="mock", base_url=server.url,
+                              hedging=HedgingPolicy())
+            profiler = cg.profile()
+
+            @profiler
+            def collect() -> None:
+                cg.perpetual_market(symbol="BTC")
+
+            collect()
+            collect()
+            cg.close()
+
+        self.assertEqual(len(profiler.calls), 2)
+        self.assertTrue(all(call.phases["network"] > 0 for call in profiler.calls))
@@ -0,0 +1,97 @@
+import importlib.util
+import io
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase, mock, skipUnless
+
+import pandas as pd
+import requests
+
+from coinglass_api import CachingProxy, CoinglassAPI, CoinglassAPIError
+from coinglass_api.mock_server import FIXTURES, MockCoinglassServer
+
+QUERY = "indicator/funding_ohlc?ex=Binance&pair=BTCUSDT&interval=h1&limit=10"
+
+
+class TestCachingProxy(TestCase):
+    def test_consumers_share_one_upstream_fetch(self) -> None:
+        with MockCoinglassServer(latency=0.2) as server, \
+                CachingProxy(CoinglassAPI(coinglass_secret="mock",
+                                          base_url=server.url)) as proxy:
+            consumers = [CoinglassAPI(coinglass_secret="", base_url=proxy.url)
+                         for _ in range(10)]
+            with ThreadPoolExecutor(max_workers=10) as pool:
+                frames = list(pool.map(
+                    lambda cg: cg.funding_ohlc(ex="Binance", pair="BTCUSDT",
+                                               interval="h1", limit=10), consumers))
+
+            self.assertEqual(server.requests, 1)
+            self.assertEqual(proxy.requests, 10)
+            self.assertEqual(proxy.upstream, 1)
+            for df in frames:
+                pd.testing.assert_frame_equal(df, frames[0])
+
+            # The frame is built from the cached response
+            response = requests.get(proxy.url + QUERY + "&format=csv")
+            self.assertEqual(response.headers["Content-Type"], "text/csv")
+            df = pd.read_csv(io.BytesIO(response.content), index_col=0)
+            self.assertEqual(len(df), 10)
+            self.assertEqual(list(df.columns), list(frames[0].columns))
+            self.assertEqual(server.requests, 1)
+            for cg in consumers:
+                cg.close()
+
+    def test_errors(self) -> None:
+        with MockCoinglassServer(error_rate=1.0) as server, \
+                CachingProxy(CoinglassAPI(coinglass_secret="mock",
+                                          base_url=server.url)) as proxy:
+            # Upstream errors are relayed as is, so consumers raise as usual
+            consumer = CoinglassAPI(coinglass_secret="", base_url=proxy.url)
+            with self.assertRaises(CoinglassAPIError):
+                consumer.funding_ohlc(ex="Binance", pair="BTCUSDT", interval="h1",
+                                      limit=10)
+            consumer.close()
+            # and not cached
+            self.assertEqual(requests.get(proxy.url + QUERY + "&format=csv")
+                             .status_code, 502)
+            self.assertEqual(server.requests, 2)
+
+            self.assertEqual(requests.get(proxy.url + QUERY + "&format=xml")
+                             .status_code, 406)
+            self.assertEqual(requests.get(proxy.url + "indicator/funding_ohlc"
+                                          "?ex=Binance&unknown=1&format=csv")
+                             .status_code, 400)
+
+    def test_unexpected_errors_are_answered(self) -> None:
+        with MockCoinglassServer() as server, \
+                CachingProxy(CoinglassAPI(coinglass_secret="mock",
+                                          base_url=server.url)) as proxy:
+            # e.g. pyarrow failing to import in the writer
+            with mock.patch("coinglass_api.proxy.dump_frame",
+                            side_effect=ImportError("pyarrow")):
+                response = requests.get(proxy.url + QUERY + "&format=csv")
+            self.assertEqual(response.status_code, 500)
+            self.assertIn("ImportError", response.json()["msg"])
+
+            # A payload the parser does not expect
+            with mock.patch.dict(FIXTURES, {"indicator/funding_ohlc":
+                                            lambda params, rows: {"unexpected": 1}}):
+                response = requests.get(proxy.url + QUERY.replace("limit=10",
+                                                                  "limit=5")
+                                        + "&format=csv")
+            self.assertEqual(response.status_code, 500)
+            self.assertFalse(response.json()["success"])
+
+            response = requests.get(proxy.url + "liqMap?symbol=BTC&interval=h1"
+                                    "&format=csv")
+            self.assertEqual(response.status_code, 400)
+
+    @skipUnless(importlib.util.find_spec("pyarrow"), "arrow output needs pyarrow")
+    def test_arrow(self) -> None:
+        with MockCoinglassServer() as server, \
+                CachingProxy(CoinglassAPI(coinglass_secret="mock",
+                                          base_url=server.url)) as proxy:
+            response = requests.get(
+                proxy.url + QUERY,
+                headers={"Accept": "application/vnd.apache.arrow.file"})
+            df = pd.read_feather(io.BytesIO(response.content))
+            self.assertEqual(len(df), 10)
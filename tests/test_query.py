@@ -0,0 +1,37 @@
+import time
+from unittest import TestCase
+
+from coinglass_api import CoinglassAPI, query
+from coinglass_api.mock_server import MockCoinglassServer
+
+SPECS = {"accounts": "long_short_accounts",
+         "symbol": "long_short_symbol",
+         "top_accounts": "top_long_short_account_ratio",
+         "top_positions": ("top_long_short_position_ratio", {"limit": 50})}
+
+
+class TestQuery(TestCase):
+    def test_concurrent_join(self) -> None:
+        with MockCoinglassServer(latency=0.2) as server:
+            cg = CoinglassAPI(coinglass_secret="mock", base_url=server.url)
+            start = time.perf_counter()
+            df = query(cg, SPECS, ex="Binance", pair="BTCUSDT", symbol="BTC",
+                       interval="h1", limit=100)
+            elapsed = time.perf_counter() - start
+
+            self.assertLess(elapsed, 0.6)
+            self.assertEqual(server.requests, 4)
+            self.assertEqual(list(df.columns.levels[0]), sorted(SPECS))
+            self.assertEqual(len(df), 100)
+            self.assertTrue(df.index.is_monotonic_increasing)
+            # The shorter frame leaves NaN in an outer join, not in an inner one
+            self.assertEqual(df["top_positions"]["longRatio"].isna().sum(), 50)
+
+            inner = query(cg, SPECS, how="inner", ex="Binance", pair="BTCUSDT",
+                          symbol="BTC", interval="h1", limit=100)
+            self.assertEqual(len(inner), 50)
+            # Only endpoint methods returning frames can be queried
+            for method in ("_get", "close", "prefetch", "funding_usd_history"):
+                with self.assertRaises(ValueError):
+                    query(cg, {"x": method})
+            cg.close()
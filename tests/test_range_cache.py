@@ -0,0 +1,80 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from coinglass_api import CoinglassAPI, RangeCache
+from coinglass_api.mock_server import MockCoinglassServer
+from coinglass_api.range_cache import IntervalSet
+
+HOUR = 3_600_000
+START = 1_672_531_200_000  # 2023-01-01
+
+
+class TestIntervalSet(TestCase):
+    def test_add_and_missing(self) -> None:
+        intervals = IntervalSet()
+        intervals.add(10, 20)
+        intervals.add(40, 50)
+        self.assertEqual(intervals.missing(0, 60), [(0, 9), (21, 39), (51, 60)])
+        intervals.add(21, 39)
+        self.assertEqual(list(intervals), [(10, 50)])
+        self.assertTrue(intervals.covers(15, 45))
+        self.assertEqual(intervals.missing(5, 55), [(5, 9), (51, 55)])
+
+
+class TestRangeCache(TestCase):
+    def test_sliding_window(self) -> None:
+        kwargs = {"ex": "Binance", "pair": "BTCUSDT", "interval": "h1"}
+        with MockCoinglassServer() as server:
+            cg = CoinglassAPI(coinglass_secret="mock", base_url=server.url)
+            cache = RangeCache(cg, page_size=500)
+
+            df = cache.get("funding_ohlc", START, START + 30 * 24 * HOUR, **kwargs)
+            self.assertEqual(len(df), 30 * 24 + 1)
+            self.assertEqual(cache.requests, 2)
+
+            # Window moved forward an hour: only the new bar is requested
+            shifted = cache.get("funding_ohlc", START + HOUR,
+                                START + (30 * 24 + 1) * HOUR, **kwargs)
+            self.assertEqual(cache.requests, 3)
+            self.assertEqual(cache.fetched_rows, 30 * 24 + 2)
+            self.assertEqual(cache.coverage("funding_ohlc", **kwargs),
+                             [(START, START + (30 * 24 + 1) * HOUR)])
+
+            direct = cg.funding_ohlc(**kwargs, limit=30 * 24 + 1,
+                                     start_time=START + HOUR,
+                                     end_time=START + (30 * 24 + 1) * HOUR)
+            pd.testing.assert_frame_equal(shifted, direct, check_freq=False)
+
+            # Fully cached windows need no request
+            cache.get("funding_ohlc", START + 5 * HOUR, START + 50 * HOUR, **kwargs)
+            self.assertEqual(cache.requests, 3)
+            cg.close()
+
+    def test_short_page_is_fetched_again(self) -> None:
+        kwargs = {"ex": "Binance", "pair": "BTCUSDT", "interval": "h1"}
+        with MockCoinglassServer() as server:
+            cg = CoinglassAPI(coinglass_secret="mock", base_url=server.url)
+            cache = RangeCache(cg, page_size=500)
+            original = cg.funding_ohlc
+
+            def lagging(**call):
+                # Upstream has only published the first 10 bars of the window
+                return original(**call).iloc[:10]
+
+            cg.funding_ohlc = lagging
+            df = cache.get("funding_ohlc", START, START + 99 * HOUR, **kwargs)
+            self.assertEqual(len(df), 10)
+            self.assertEqual(cache.coverage("funding_ohlc", **kwargs),
+                             [(START, START + 9 * HOUR)])
+
+            cg.funding_ohlc = original
+            df = cache.get("funding_ohlc", START, START + 99 * HOUR, **kwargs)
+            self.assertEqual(len(df), 100)
+            self.assertEqual(cache.requests, 2)
+
+            # Callers get their own frame
+            df.iloc[0, 0] = -1.0
+            again = cache.get("funding_ohlc", START, START + 99 * HOUR, **kwargs)
+            self.assertNotEqual(again.iloc[0, 0], -1.0)
+            cg.close()
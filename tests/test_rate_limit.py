@@ -0,0 +1,46 @@
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from unittest import TestCase
+
+from coinglass_api import RateLimiter, SharedRateLimiter
+
+
+def _drain(directory: str, count: int) -> None:
+    limiter = SharedRateLimiter(requests_per_minute=600, burst=1, key="test",
+                                directory=directory)
+    for _ in range(count):
+        limiter.acquire()
+    limiter.close()
+
+
+class TestRateLimiter(TestCase):
+    def test_token_bucket(self) -> None:
+        limiter = RateLimiter(requests_per_minute=60, burst=2)
+        self.assertTrue(limiter.try_acquire())
+        self.assertTrue(limiter.try_acquire())
+        self.assertFalse(limiter.try_acquire())
+        self.assertFalse(limiter.acquire(timeout=0.1))
+        self.assertGreater(limiter.wait_time(), 0.5)
+
+    def test_shared_between_instances(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            a = SharedRateLimiter(60, burst=1, key="secret", directory=directory)
+            b = SharedRateLimiter(60, burst=1, key="secret", directory=directory)
+            other = SharedRateLimiter(60, burst=1, key="other", directory=directory)
+
+            self.assertTrue(a.try_acquire())
+            self.assertFalse(b.try_acquire())
+            self.assertTrue(other.try_acquire())
+            for limiter in (a, b, other):
+                limiter.close()
+
+    def test_shared_between_processes(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            with ProcessPoolExecutor(max_workers=4) as pool:
+                list(pool.map(_drain, [directory] * 4, [5] * 4))
+            elapsed = time.perf_counter() - start
+
+        # 20 tokens at 10 per second from a burst of 1 takes at least ~1.9s
+        self.assertGreater(elapsed, 1.7)
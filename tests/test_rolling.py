@@ -0,0 +1,39 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from coinglass_api.rolling import RollingStats
+
+
+class TestRollingStats(TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(0)
+        index = pd.date_range("2023-01-01", periods=300, freq="h")
+        self.df = pd.DataFrame(rng.normal(size=(300, 3)).cumsum(axis=0),
+                               index=index, columns=["o", "h", "c"])
+
+    def test_matches_full_recompute(self) -> None:
+        window = 24
+        engine = RollingStats.from_history(self.df.iloc[:200], window=window)
+        engine.update_frame(self.df.iloc[150:])
+
+        expected = self.df.rolling(window)
+        np.testing.assert_allclose(engine.mean, expected.mean().iloc[-1])
+        np.testing.assert_allclose(engine.std, expected.std().iloc[-1])
+        np.testing.assert_allclose(
+            engine.ema, self.df.ewm(span=window, adjust=False).mean().iloc[-1]
+        )
+        np.testing.assert_allclose(engine.delta, self.df.diff().iloc[-1])
+        zscore = (self.df - expected.mean()) / expected.std()
+        np.testing.assert_allclose(engine.zscore, zscore.iloc[-1])
+
+    def test_unfinished_bar_is_amended(self) -> None:
+        engine = RollingStats.from_history(self.df.iloc[:100], window=10)
+        amended = self.df.iloc[[99]] + 5.0
+        stats = engine.update_frame(amended)
+        self.assertEqual(len(stats), 1)
+
+        expected = pd.concat([self.df.iloc[:99], amended]).rolling(10).mean().iloc[-1]
+        np.testing.assert_allclose(engine.mean, expected)
+        self.assertEqual(stats.columns.nlevels, 2)
@@ -0,0 +1,140 @@
+import threading
+import time
+from unittest import TestCase
+
+import requests
+
+from coinglass_api import (
+    PRIORITY_BACKFILL,
+    PRIORITY_LIVE,
+    CoinglassAPI,
+    DeadlineExceededError,
+    RateLimiter,
+    RequestScheduler,
+    TimeoutPolicy,
+)
+from coinglass_api.mock_server import MockCoinglassServer
+
+
+class TestRequestScheduler(TestCase):
+    def setUp(self) -> None:
+        # Empty bucket refilling at 20 requests per second
+        self.limiter = RateLimiter(requests_per_minute=1200, burst=1)
+        self.limiter.try_acquire()
+        self.order: list[str] = []
+        self.lock = threading.Lock()
+
+    def _submit(
+            self,
+            scheduler: RequestScheduler,
+            name: str,
+            priority: int,
+            caller: str = "default",
+            timeout: float | None = None
+    ) -> threading.Thread:
+        def run() -> None:
+            with scheduler.context(priority=priority, caller=caller, timeout=timeout):
+                try:
+                    scheduler.admit()
+                except DeadlineExceededError:
+                    name_ = f"{name}:expired"
+                except RuntimeError:
+                    name_ = f"{name}:closed"
+                else:
+                    name_ = name
+            with self.lock:
+                self.order.append(name_)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        return thread
+
+    def test_live_overtakes_backfill(self) -> None:
+        scheduler = RequestScheduler(RateLimiter(requests_per_minute=60, burst=1))
+        scheduler.rate_limiter.try_acquire()
+        threads = [self._submit(scheduler, f"backfill{i}", PRIORITY_BACKFILL)
+                   for i in range(3)]
+        time.sleep(0.05)
+        threads.append(self._submit(scheduler, "live", PRIORITY_LIVE))
+        time.sleep(1.2)
+        scheduler.close()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.order[0], "live")
+
+    def test_fair_share_between_callers(self) -> None:
+        scheduler = RequestScheduler(self.limiter, weights={"a": 2.0})
+        threads = [self._submit(scheduler, f"{caller}{i}", PRIORITY_BACKFILL, caller)
+                   for caller in ("a", "b") for i in range(6)]
+        for thread in threads:
+            thread.join()
+        scheduler.close()
+
+        first_six = [name[0] for name in self.order[:6]]
+        self.assertEqual(first_six.count("a"), 4)
+
+    def test_expired_requests_are_dropped(self) -> None:
+        scheduler = RequestScheduler(RateLimiter(requests_per_minute=6, burst=1))
+        scheduler.rate_limiter.try_acquire()
+        thread = self._submit(scheduler, "late", PRIORITY_BACKFILL, timeout=0.05)
+        thread.join(timeout=2)
+        scheduler.close()
+
+        self.assertEqual(self.order, ["late:expired"])
+        self.assertEqual(scheduler.expired, 1)
+
+    def test_close_releases_waiters(self) -> None:
+        scheduler = RequestScheduler(RateLimiter(requests_per_minute=6, burst=1))
+        scheduler.rate_limiter.try_acquire()
+        thread = self._submit(scheduler, "queued", PRIORITY_BACKFILL)
+        time.sleep(0.05)
+        scheduler.close()
+        thread.join(timeout=2)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(self.order, ["queued:closed"])
+        with self.assertRaises(RuntimeError):
+            scheduler.admit()
+
+    def test_virtual_time_never_goes_back(self) -> None:
+        scheduler = RequestScheduler(RateLimiter(requests_per_minute=600, burst=1),
+                                     weights={"poller": 0.2})
+        scheduler.rate_limiter.try_acquire()
+        threads = [self._submit(scheduler, f"backfill{i}", PRIORITY_BACKFILL, "bulk")
+                   for i in range(3)]
+        time.sleep(0.02)
+        threads.append(self._submit(scheduler, "live", PRIORITY_LIVE, "poller"))
+        for thread in threads:
+            thread.join()
+        scheduler.close()
+
+        # The live ticket finishes at 5, after the backfill tickets at 1 to 3
+        self.assertEqual(self.order[0], "live")
+        self.assertEqual(scheduler._virtual_time, 5.0)
+        # Every caller's clock is behind the virtual clock, none is kept
+        self.assertEqual(scheduler._finish, {})
+
+    def test_client_uses_scheduler(self) -> None:
+        scheduler = RequestScheduler(RateLimiter(requests_per_minute=6000))
+        with MockCoinglassServer() as server:
+            cg = CoinglassAPI(coinglass_secret="mock", scheduler=scheduler,
+                              base_url=server.url)
+            with scheduler.context(priority=PRIORITY_LIVE, caller="poller"):
+                cg.perpetual_market(symbol="BTC")
+            cg.close()
+        scheduler.close()
+        self.assertEqual(scheduler.dispatched, 1)
+
+    def test_retries_are_admitted_by_the_scheduler(self) -> None:
+        scheduler = RequestScheduler(RateLimiter(requests_per_minute=6000))
+        with MockCoinglassServer(latency=0.5) as server:
+            cg = CoinglassAPI(coinglass_secret="mock", scheduler=scheduler,
+                              base_url=server.url,
+                              timeouts=TimeoutPolicy(min_timeout=0.05,
+                                                     max_timeout=0.1, retries=1))
+            with self.assertRaises(requests.Timeout):
+                cg.liquidation_info(symbol="BTC", time_type="h1")
+            cg.close()
+        scheduler.close()
+        self.assertEqual(scheduler.dispatched, 2)
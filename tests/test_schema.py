@@ -0,0 +1,93 @@
+import warnings
+from collections.abc import Sequence
+from unittest import TestCase, mock
+
+import pandas as pd
+
+from coinglass_api import CoinglassAPI, CoinglassSchemaWarning
+from coinglass_api.mock_server import MockCoinglassServer
+from coinglass_api.schema import EndpointSchema, time_array
+
+
+class TestSchemaCache(TestCase):
+    def test_learned_schema_matches_generic_path(self) -> None:
+        with MockCoinglassServer() as server:
+            cg = CoinglassAPI(coinglass_secret="mock", base_url=server.url)
+            first = cg.funding_ohlc(ex="Binance", pair="BTCUSDT", interval="h1",
+                                    limit=100)
+            self.assertIn("indicator/funding_ohlc", cg._schemas)
+            second = cg.funding_ohlc(ex="Binance", pair="BTCUSDT", interval="h1",
+                                     limit=100)
+            cg.close()
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_drift_relearns(self) -> None:
+        schema = EndpointSchema("test")
+        data = [{"t": 1_600_000_000_000 + i * 60_000, "o": 1.0 * i} for i in range(5)]
+        df = CoinglassAPI._create_dataframe(data, "t", "ms", schema=schema)
+        self.assertTrue(schema.learned)
+        self.assertEqual(df["o"].dtype, "float64")
+
+        drifted = [{**row, "c": 2.0} for row in data]
+        with self.assertWarns(CoinglassSchemaWarning):
+            df = CoinglassAPI._create_dataframe(drifted, "t", "ms", schema=schema)
+        self.assertIn("c", df.columns)
+        self.assertEqual(schema.columns, ("t", "o", "c"))
+
+    def test_time_format_detection(self) -> None:
+        schema = EndpointSchema("test")
+        dates = ["2023/01/03", "2023/01/02", "2023/01/01"]
+        index = schema.parse_times(dates, None)
+        self.assertEqual(schema.time_format, ("format", "%Y/%m/%d"))
+        self.assertEqual(index[0], pd.Timestamp("2023-01-03"))
+
+        self.assertEqual(EndpointSchema("s").parse_times([1_672_531_200], None)[0],
+                         pd.Timestamp("2023-01-01"))
+        self.assertEqual(EndpointSchema("ms").parse_times(["1672531200000"], None)[0],
+                         pd.Timestamp("2023-01-01"))
+
+    def test_newest_first_is_reversed(self) -> None:
+        schema = EndpointSchema("test")
+        data = [{"date": d, "v": float(i)}
+                for i, d in enumerate(["2023-01-03", "2023-01-02", "2023-01-01"])]
+        for _ in range(2):
+            df = CoinglassAPI._create_dataframe(data, "date", None, schema=schema)
+            self.assertTrue(df.index.is_monotonic_increasing)
+            self.assertEqual(df["v"].tolist(), [2.0, 1.0, 0.0])
+
+    def test_index_endpoints(self) -> None:
+        with MockCoinglassServer(rows=2000) as server:
+            cg = CoinglassAPI(coinglass_secret="mock", base_url=server.url)
+            for method in ("bitcoin_bubble_index", "ahr999", "stock_flow"):
+                first, second = getattr(cg, method)(), getattr(cg, method)()
+                self.assertIsInstance(first.index, pd.DatetimeIndex)
+                self.assertTrue(first.index.is_monotonic_increasing)
+                pd.testing.assert_frame_equal(first, second)
+            cg.close()
+
+    def test_int_column_widens_to_float(self) -> None:
+        schema = EndpointSchema("test")
+        data = [{"t": 1_600_000_000_000 + i * 60_000, "p": 30000} for i in range(3)]
+        CoinglassAPI._create_dataframe(data, "t", "ms", schema=schema)
+        self.assertEqual(schema.dtypes["p"].kind, "i")
+
+        widened = [*data[:2], {**data[2], "p": 30000.5}]
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", CoinglassSchemaWarning)
+            df = CoinglassAPI._create_dataframe(widened, "t", "ms", schema=schema)
+        self.assertEqual(df["p"].tolist(), [30000.0, 30000.0, 30000.5])
+        self.assertEqual(schema.dtypes["p"].kind, "f")
+
+    def test_parse_times_survives_reset(self) -> None:
+        schema = EndpointSchema("test")
+        dates = ["2023/01/02", "2023/01/01"]
+        schema.parse_times(dates, None)
+
+        def reset_midway(values: Sequence) -> Sequence:
+            schema.reset()
+            return time_array(values)
+
+        with mock.patch("coinglass_api.schema.time_array", reset_midway):
+            index = schema.parse_times(dates, None)
+        self.assertEqual(index[0], pd.Timestamp("2023-01-02"))
+        self.assertIsNone(schema.time_format)
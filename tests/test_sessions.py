@@ -0,0 +1,65 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from coinglass_api import CoinglassAPI, SessionPool, ThreadLocalSessions
+from coinglass_api.mock_server import MockCoinglassServer
+
+
+class TestSessions(TestCase):
+    def setUp(self) -> None:
+        self.server = MockCoinglassServer(latency=0.005).start()
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def _hammer(self, cg: CoinglassAPI, threads: int, calls: int) -> None:
+        def work(_) -> None:
+            for _ in range(calls):
+                df = cg.funding_ohlc(
+                    ex="Binance", pair="BTCUSDT", interval="h1", limit=20
+                )
+                self.assertEqual(df.shape[0], 20)
+
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(work, range(threads)))
+
+    def test_session_pool(self) -> None:
+        sessions = SessionPool(size=4)
+        cg = CoinglassAPI(coinglass_secret="mock", sessions=sessions,
+                          base_url=self.server.url)
+        self._hammer(cg, threads=16, calls=10)
+        cg.close()
+
+        self.assertLessEqual(sessions.created, 4)
+        self.assertEqual(self.server.requests, 160)
+
+    def test_thread_local_sessions(self) -> None:
+        sessions = ThreadLocalSessions(max_connections=4)
+        cg = CoinglassAPI(coinglass_secret="mock", sessions=sessions,
+                          base_url=self.server.url)
+        self._hammer(cg, threads=8, calls=10)
+        cg.close()
+
+        self.assertEqual(sessions.created, 8)
+        self.assertEqual(self.server.requests, 80)
+
+    def test_short_lived_threads_release_sessions(self) -> None:
+        sessions = ThreadLocalSessions(max_connections=4)
+        cg = CoinglassAPI(coinglass_secret="mock", sessions=sessions,
+                          base_url=self.server.url)
+
+        def work() -> None:
+            cg.funding_ohlc(ex="Binance", pair="BTCUSDT", interval="h1", limit=20)
+
+        for _ in range(5):
+            threads = [threading.Thread(target=work) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        cg.close()
+
+        # Every thread opened a session, only the live ones keep it
+        self.assertEqual(sessions.created, 20)
+        self.assertEqual(sessions.open, 0)
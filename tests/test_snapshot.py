@@ -0,0 +1,101 @@
+import os
+import tempfile
+import time
+from unittest import TestCase
+
+from coinglass_api import CoinglassAPI
+from coinglass_api.cache import ResponseCache
+from coinglass_api.journal import JournalWriter
+from coinglass_api.mock_server import MockCoinglassServer
+
+
+class TestSnapshot(TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache.snapshot")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_save_and_load(self) -> None:
+        cache = ResponseCache()
+        cache.set("funding", {"success": True, "data": [1, 2]}, stored=100.0)
+        cache.set("perpetual_market?symbol=BTC", {"success": True, "data": {}})
+        cache.get("funding")
+        self.assertEqual(cache.save(self.path), 2)
+
+        loaded = ResponseCache()
+        self.assertEqual(loaded.load(self.path), 2)
+        self.assertEqual(loaded.get("funding"),
+                         (100.0, {"success": True, "data": [1, 2]}))
+        self.assertEqual(loaded.hot_keys()[0], "funding")
+        self.assertEqual(ResponseCache().load(self.path + ".missing"), 0)
+
+    def test_loaded_entries_decode_lazily(self) -> None:
+        cache = ResponseCache()
+        cache.set("funding", {"success": True, "data": [1, 2]}, stored=100.0)
+        cache.set("oi", {"success": True, "data": [3]}, stored=200.0)
+        cache.save(self.path)
+
+        loaded = ResponseCache()
+        loaded.load(self.path)
+        self.assertEqual(loaded.stored_times(), {"funding": 100.0, "oi": 200.0})
+        self.assertEqual(len(loaded._pending), 2)
+        loaded.get("funding")[1]["data"].append(3)
+        self.assertEqual(loaded.get("funding")[1]["data"], [1, 2])
+        self.assertEqual(list(loaded._pending), ["oi"])
+
+        # Entries never used are written back without being decoded
+        self.assertEqual(loaded.save(self.path), 2)
+        self.assertEqual(ResponseCache().load(self.path), 2)
+
+    def test_cached_responses_are_copies(self) -> None:
+        with MockCoinglassServer() as server:
+            cg = CoinglassAPI(coinglass_secret="mock", base_url=server.url,
+                              cache_ttl=60)
+            cg.funding_usd_history(symbol="BTC", time_type="h8")["dateList"].clear()
+            history = cg.funding_usd_history(symbol="BTC", time_type="h8")
+            self.assertTrue(history["dateList"])
+            self.assertEqual(server.requests, 1)
+            cg.close()
+
+    def test_prefetch_is_journaled(self) -> None:
+        journal = JournalWriter(os.path.join(self.tmp.name, "journal"))
+        with MockCoinglassServer() as server:
+            cg = CoinglassAPI(coinglass_secret="mock", base_url=server.url,
+                              cache_ttl=0.05, journal=journal)
+            cg.perpetual_market(symbol="BTC")
+            time.sleep(0.1)
+            self.assertEqual(cg.prefetch(), 1)
+            cg.close()
+        self.assertEqual(journal.records, 2)
+        journal.close()
+
+    def test_warm_restart(self) -> None:
+        with MockCoinglassServer() as server:
+            cg = CoinglassAPI(coinglass_secret="mock", base_url=server.url,
+                              cache_ttl=60, snapshot=self.path)
+            cg.funding_rate()
+            cg.perpetual_market(symbol="BTC")
+            cg.perpetual_market(symbol="BTC")
+            self.assertEqual(server.requests, 2)
+            cg.close()
+
+            restarted = CoinglassAPI(coinglass_secret="mock", base_url=server.url,
+                                     cache_ttl=60, snapshot=self.path)
+            restarted.perpetual_market(symbol="BTC")
+            self.assertEqual(restarted.prefetch(), 0)
+            self.assertEqual(server.requests, 2)
+
+            # Only expired responses are fetched again
+            restarted._cache_ttl = 0.05
+            time.sleep(0.1)
+            self.assertEqual(restarted.prefetch(max_requests=1), 1)
+            self.assertEqual(server.requests, 3)
+
+            # Failed refreshes are not counted
+            server.error_rate = 1.0
+            time.sleep(0.1)
+            self.assertEqual(restarted.prefetch(), 0)
+            self.assertEqual(server.requests, 5)
+            restarted.close()
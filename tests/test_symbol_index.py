@@ -0,0 +1,29 @@
+from unittest import TestCase
+
+from coinglass_api import CoinglassAPI, SymbolIndex
+from coinglass_api.mock_server import MockCoinglassServer
+
+
+class TestSymbolIndex(TestCase):
+    def test_lookups(self) -> None:
+        with MockCoinglassServer() as server:
+            cg = CoinglassAPI(coinglass_secret="mock", base_url=server.url)
+            index = SymbolIndex(cg)
+            self.assertEqual(index.symbols(), ["BTC", "ETH", "SOL"])
+
+            self.assertIn("dYdX", index.exchanges("BTC"))
+            self.assertEqual(index.pairs("BTC", "Binance"), ["BTCUSDT"])
+            self.assertEqual(index.pairs("BTC", "dYdX"), ["BTC-USD"])
+            self.assertTrue(index.is_valid("BTC", "dYdX", "BTC-USD"))
+            self.assertFalse(index.is_valid("BTC", "dYdX", "BTCUSDT"))
+            requests = server.requests
+
+            jobs = index.expand("BTC", exchanges=["Binance", "dYdX"])
+            self.assertEqual(jobs, [{"ex": "Binance", "pair": "BTCUSDT"},
+                                    {"ex": "dYdX", "pair": "BTC-USD"}])
+            self.assertEqual(server.requests, requests)
+
+            index.ttl = 0
+            index.pairs("BTC", "Binance")
+            self.assertEqual(server.requests, requests + 2)
+            cg.close()
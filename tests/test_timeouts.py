@@ -0,0 +1,70 @@
+import time
+from unittest import TestCase
+
+import requests
+
+from coinglass_api import CoinglassAPI, KeyPool, TimeoutPolicy
+from coinglass_api.latency import LogHistogram
+from coinglass_api.mock_server import MockCoinglassServer
+
+
+class TestTimeouts(TestCase):
+    def test_histogram_percentiles(self) -> None:
+        histogram = LogHistogram(1e-4, 600.0)
+        for i in range(1, 1001):
+            histogram.add(i / 1000)
+        self.assertAlmostEqual(histogram.percentile(50), 0.5, delta=0.5 * 0.02)
+        self.assertAlmostEqual(histogram.percentile(99), 0.99, delta=0.99 * 0.02)
+        self.assertIsNone(LogHistogram(1, 10).percentile(50))
+
+    def test_learned_timeouts(self) -> None:
+        policy = TimeoutPolicy(min_timeout=0.1, max_timeout=10, min_samples=5)
+        self.assertEqual(policy.timeout("liquidation_info"), (10, 10))
+        for _ in range(10):
+            policy.record("liquidation_info", 0.05, 500)
+            policy.record("liquidation_map", 2.0, 5_000_000)
+        connect, read = policy.timeout("liquidation_info")
+        self.assertAlmostEqual(read, 0.15, delta=0.01)
+        self.assertLess(connect, 10)
+        # Large payloads get time to transfer on top, up to the ceiling
+        self.assertEqual(policy.timeout("liquidation_map")[1], 10)
+
+    def test_stalled_request_fails_fast(self) -> None:
+        with MockCoinglassServer(latency=0.01) as server:
+            cg = CoinglassAPI(coinglass_secret="mock", base_url=server.url,
+                              timeouts=TimeoutPolicy(min_timeout=0.1, retries=1))
+            for _ in range(25):
+                cg.liquidation_info(symbol="BTC", time_type="h1")
+
+            server.latency = 2.0
+            start = time.perf_counter()
+            with self.assertRaises(requests.Timeout):
+                cg.liquidation_info(symbol="BTC", time_type="h1")
+            # 0.1s plus one retry at 0.2s instead of 30s
+            self.assertLess(time.perf_counter() - start, 1.0)
+            self.assertEqual(server.requests, 27)
+            cg.close()
+
+    def test_one_sketch_feeds_hedging_and_timeouts(self) -> None:
+        policy = TimeoutPolicy()
+        with MockCoinglassServer() as server:
+            cg = CoinglassAPI(coinglass_secret="mock", base_url=server.url,
+                              timeouts=policy)
+            for _ in range(5):
+                cg.liquidation_info(symbol="BTC", time_type="h1")
+            cg.close()
+
+        self.assertIs(cg._latency, policy.latency)
+        self.assertEqual(policy.latency.count("liquidation_info"), 5)
+
+    def test_retry_is_charged_to_the_key(self) -> None:
+        pool = KeyPool(["key-a"], requests_per_minute=600)
+        with MockCoinglassServer(latency=0.5) as server:
+            cg = CoinglassAPI(coinglass_secret=pool, base_url=server.url,
+                              timeouts=TimeoutPolicy(min_timeout=0.05,
+                                                     max_timeout=0.1, retries=1))
+            with self.assertRaises(requests.Timeout):
+                cg.liquidation_info(symbol="BTC", time_type="h1")
+            cg.close()
+
+        self.assertEqual(pool.stats()[0]["requests"], 2)